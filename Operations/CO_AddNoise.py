@@ -1,11 +1,10 @@
 import numpy as np
-from Operations.CO_HistogramAMI import CO_HistogramAMI
+from Operations.CO_HistogramAMI import _histogram_ami_bins, _histogram_ami_codes, _ami_from_codes
 from Operations.CO_FirstCrossing import CO_FirstCrossing
-from Operations.IN_AutoMutualInfo import IN_AutoMutualInfo
+from Operations.IN_AutoMutualInfo import _batch_auto_mutual_info
 from Operations.CO_AutoCorr import CO_AutoCorr
 from PeripheryFunctions.BF_SignChange import BF_SignChange
 from PeripheryFunctions.BF_iszscored import BF_iszscored
-from scipy.optimize import curve_fit
 import warnings
 
 def CO_AddNoise(y, tau = 1, amiMethod = 'even', extraParam = None, randomSeed = None):
@@ -24,6 +23,7 @@ def CO_AddNoise(y, tau = 1, amiMethod = 'even', extraParam = None, randomSeed =
     Returns:
     dict: Statistics on the resulting set of automutual information estimates
     """
+    from scipy.optimize import curve_fit
 
     if not BF_iszscored(y):
         warnings.warn("Input time series should be z-scored")
@@ -42,19 +42,19 @@ def CO_AddNoise(y, tau = 1, amiMethod = 'even', extraParam = None, randomSeed =
     numRepeats = len(noiseRange)
 
     # Compute the automutual information across a range of noise levels
-    amis = np.zeros(numRepeats)
+    # (all noise levels are estimated together, as rows of a noisy matrix)
+    Y = np.asarray(y, dtype=float) + noiseRange[:, np.newaxis]*noise
     if amiMethod in ['std1', 'std2', 'quantiles', 'even']:
         # histogram-based methods using my naive implementation in CO_Histogram
-        for i in range(numRepeats):
-            amis[i] = CO_HistogramAMI(y + noiseRange[i]*noise, tau, amiMethod, extraParam)
-            if np.isnan(amis[i]):
-                raise ValueError('Error computing AMI: Time series too short (?)')
-    if amiMethod in ['gaussian','kernel','kraskov1','kraskov2']:
-        for i in range(numRepeats):
-            amis[i] = IN_AutoMutualInfo(y + noiseRange[i]*noise, tau, amiMethod, extraParam)
-            if np.isnan(amis[i]):
-                raise ValueError('Error computing AMI: Time series too short (?)')
-    
+        numBins = 10 if extraParam is None else extraParam
+        amis = _histogram_ami_noise(Y, tau, amiMethod, numBins)
+    elif amiMethod in ['gaussian','kernel','kraskov1','kraskov2']:
+        amis = _batch_auto_mutual_info(Y, tau, amiMethod, extraParam)
+    else:
+        raise ValueError(f"Unknown AMI method '{amiMethod}'")
+    if np.any(np.isnan(amis)):
+        raise ValueError('Error computing AMI: Time series too short (?)')
+
     # Output statistics
     out = {}
     # Proportion decreases
@@ -82,7 +82,7 @@ def CO_AddNoise(y, tau = 1, amiMethod = 'even', extraParam = None, randomSeed =
 
     # Fit exponential decay
     expFunc = lambda x, a, b : a * np.exp(b * x)
-    popt, pcov = curve_fit(expFunc, noiseRange, amis, p0=[amis[0], -1])
+    popt, pcov = curve_fit(expFunc, noiseRange, amis, p0=expFit_p0(noiseRange, amis))
     out['fitexpa'], out['fitexpb'] = popt
     residuals = amis - expFunc(noiseRange, *popt)
     ss_res = np.sum(residuals**2)
@@ -107,3 +107,29 @@ def firstUnder_fn(x, m, p):
     """
     first_i = next((m_val for m_val, p_val in zip(m, p) if p_val < x), m[-1])
     return first_i
+
+def expFit_p0(x, p):
+    """
+    Initial parameters [a, b] for fitting p = a*exp(b*x), from a log-linear
+    least-squares fit to the positive values of p (falls back to [p[0], -1]).
+    """
+    pos = p > 0
+    if np.sum(pos) < 2:
+        return [p[0], -1]
+    b, loga = np.polyfit(x[pos], np.log(p[pos]), 1)
+    return [np.exp(loga), b]
+
+def _histogram_ami_noise(Y, tau, amiMethod, numBins):
+    """
+    Histogram automutual information at lag tau of each row of Y (one row per noise level),
+    from a single digitization and a single joint-histogram bincount.
+    """
+    edges = [_histogram_ami_bins(yNoisy, amiMethod, numBins) for yNoisy in Y]
+    maxEdges = max(len(b) for b in edges)
+    # std1/std2 bins can gain edges on some rows only: pad with +inf
+    B = np.full((len(Y), maxEdges), np.inf)
+    for i, b in enumerate(edges):
+        B[i, :len(b)] = b
+    codes = _histogram_ami_codes(Y, B)
+
+    return _ami_from_codes(codes, tau, maxEdges - 1)
@@ -1,11 +1,10 @@
 import numpy as np
-from scipy.optimize import curve_fit
 from Operations.CO_AutoCorr import CO_AutoCorr
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 from PeripheryFunctions.BF_SignChange import BF_SignChange
 import warnings
 
-def CO_AutoCorrShape(y, stopWhen = 'posDrown'):
+def CO_AutoCorrShape(y, stopWhen = 'posDrown', acf = None):
     """
     CO_AutoCorrShape: How the autocorrelation function changes with the time lag.
 
@@ -19,20 +18,21 @@ def CO_AutoCorrShape(y, stopWhen = 'posDrown'):
     stopWhen : str or int, optional
         The criterion for the maximum lag to measure the ACF up to.
         Default is 'posDrown'.
+    acf : array_like, optional
+        The full autocorrelation function of y, e.g., from CO_AutoCorr(y, [], 'Fourier').
+        Used by the 'posDrown', 'drown' and 'doubleDrown' criteria instead of recomputing it.
 
     Returns:
     --------
     dict
         A dictionary containing various metrics about the autocorrelation function.
     """
+    from scipy.optimize import curve_fit
     N = len(y)
 
     # Only look up to when two consecutive values are under the significance threshold
     th = 2 / np.sqrt(N)  # significance threshold
 
-    # Calculate the autocorrelation function, up to a maximum lag, length of time series (hopefully it's cropped by then)
-    acf = []
-
     # At what lag does the acf drop to zero, Ndrown (by my definition)?
     if isinstance(stopWhen, int):
         taus = list(range(0, stopWhen+1))
@@ -40,49 +40,55 @@ def CO_AutoCorrShape(y, stopWhen = 'posDrown'):
         Ndrown = stopWhen
         
     elif stopWhen in ['posDrown', 'drown', 'doubleDrown']:
-        # Compute ACF up to a given threshold:
+        # Calculate the full autocorrelation function once, then crop it at the stopping lag
+        # (the ACF at lag i-1 is acfFull[i-1], for i = 1, ..., N)
+        if acf is None:
+            acf = CO_AutoCorr(y, [], 'Fourier')
+        acfFull = np.asarray(acf)
         Ndrown = 0 # the point at which ACF ~ 0
         if stopWhen == 'posDrown':
             # stop when ACF drops below threshold, th
-            for i in range(1, N+1):
-                acf_val = CO_AutoCorr(y, i-1, 'Fourier')[0]
-                if np.isnan(acf_val):
+            below = np.flatnonzero(acfFull < th)
+            if len(below) == 0:
+                # never drops below threshold (e.g., NaNs): keep the whole function
+                if np.any(np.isnan(acfFull)):
+                    warnings.warn("Weird time series (constant?)")
+                acf = acfFull
+            else:
+                i = below[0] + 1
+                if np.any(np.isnan(acfFull[:i])):
                     warnings.warn("Weird time series (constant?)")
-                    out = np.nan
-                if acf_val < th:
-                    # Ensure ACF is all positive
-                    if acf_val > 0:
-                        Ndrown = i
-                        acf.append(acf_val)
-                    else:
-                        # stop at the previous point if not positive
-                        Ndrown = i-1
-                    # ACF has dropped below threshold, break the for loop...
-                    break
-                # hasn't dropped below thresh, append to list 
-                acf.append(acf_val)
+                # Ensure ACF is all positive
+                if acfFull[i-1] > 0:
+                    Ndrown = i
+                else:
+                    # stop at the previous point if not positive
+                    Ndrown = i-1
+                acf = acfFull[:Ndrown]
             # This should yield the initial, positive portion of the ACF.
             assert all(np.array(acf) > 0)
         elif stopWhen == 'drown':
             # Stop when ACF is very close to 0 (within threshold, th = 2/sqrt(N))
-            for i in range(1, N+1):
-                acf_val = CO_AutoCorr(y, i-1, 'Fourier')[0] # acf vector indicies are not lags
-                # if positive and less than thresh
-                if i > 0 and abs(acf_val) < th:
-                    Ndrown = i
-                    acf.append(acf_val)
-                    break
-                acf.append(acf_val)
+            below = np.flatnonzero(np.abs(acfFull) < th)
+            if len(below) == 0:
+                acf = acfFull
+            else:
+                Ndrown = below[0] + 1
+                acf = acfFull[:Ndrown]
         elif stopWhen == 'doubleDrown':
             # Stop at 2*tau, where tau is the lag where ACF ~ 0 (within 1/sqrt(N) threshold)
-            for i in range(1, N+1):
-                acf_val = CO_AutoCorr(y, i-1, 'Fourier')[0]
-                if Ndrown > 0 and i == Ndrown * 2:
-                    acf.append(acf_val)
-                    break
-                elif i > 1 and abs(acf_val) < th:
-                    Ndrown = i
-                acf.append(acf_val)
+            # Ndrown is updated at every i > 1 with the ACF under the threshold, and the
+            # search stops at the first i = 2*Ndrown, i.e., at 2*b for the first such b
+            # with no later value under the threshold before 2*b
+            below = np.flatnonzero(np.abs(acfFull[1:]) < th) + 2
+            nextBelow = np.append(below[1:], N + 1)
+            stops = np.flatnonzero((2*below <= nextBelow) & (2*below <= N))
+            if len(stops) == 0:
+                Ndrown = below[-1] if len(below) else 0
+                acf = acfFull
+            else:
+                Ndrown = below[stops[0]]
+                acf = acfFull[:2*Ndrown]
     else:
         raise ValueError(f"Unknown ACF decay criterion: '{stopWhen}'")
 
@@ -92,7 +98,7 @@ def CO_AutoCorrShape(y, stopWhen = 'posDrown'):
     # Check for good behavior
     if np.any(np.isnan(acf)):
         # This is an anomalous time series (e.g., all constant, or conatining NaNs)
-        out = np.NaN
+        out = np.nan
     
     out = {}
     out['Nac'] = Ndrown
@@ -145,8 +151,11 @@ def CO_AutoCorrShape(y, stopWhen = 'posDrown'):
         # Fit exponential decay to (absolute) ACF:
         # (kind of only makes sense for the first positive period)
         expFunc = lambda x, b : np.exp(-b * x)
+        # initial decay rate from a linear fit to log(acf) through the origin
+        lags = np.arange(Nac)
+        b0 = -np.sum(lags * np.log(acf)) / np.sum(lags**2)
         try:
-            popt, _ = curve_fit(expFunc, np.arange(Nac), acf, p0=0.5)
+            popt, _ = curve_fit(expFunc, lags, acf, p0=b0)
             fitSuccess = True
         except:
             fitSuccess = False
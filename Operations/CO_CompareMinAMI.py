@@ -1,9 +1,8 @@
 import numpy as np
-from Operations.CO_HistogramAMI import CO_HistogramAMI
-from scipy import stats
+from Operations.CO_HistogramAMI import _histogram_ami_bins, _histogram_ami_codes, _ami_lags_from_codes
 from PeripheryFunctions.BF_SignChange import BF_SignChange
 
-def CO_CompareMinAMI(y, binMethod, numBins = 10):
+def CO_CompareMinAMI(y, binMethod, numBins = 10, lagChunkSize = 16):
     """
     Variability in first minimum of automutual information.
 
@@ -15,11 +14,14 @@ def CO_CompareMinAMI(y, binMethod, numBins = 10):
     y (array-like): The input time series
     binMethod (str): The method for estimating mutual information (input to CO_HistogramAMI)
     numBins (int or array-like): The number of bins for the AMI estimation to compare over
+    lagChunkSize (int): The number of time lags to evaluate together while searching
+                        for the first minimum (does not affect the result)
 
     Returns:
     dict: A dictionary containing various statistics on the set of first minimums 
           of the automutual information function
     """
+    from scipy import stats
     N = len(y)
     # Range of time lags to consider
     tauRange = np.arange(0, int(np.ceil(N/2))+1)
@@ -33,12 +35,20 @@ def CO_CompareMinAMI(y, binMethod, numBins = 10):
     amiMins = np.zeros(numBinsRange)
 
     # Calculate automutual information
+    y = np.asarray(y, dtype=float)
     for i in range(numBinsRange):  # vary over number of bins in histogram
+        # discretize the series once for this number of bins
+        b = _histogram_ami_bins(y, binMethod, numBins[i])
+        codes = _histogram_ami_codes(y[np.newaxis, :], b[np.newaxis, :])[0]
         amis = np.zeros(numTaus)
-        for j in range(numTaus):  # vary over time lags, tau
-            amis[j] = CO_HistogramAMI(y, tauRange[j], binMethod, numBins[i])
-            if (j > 1) and ((amis[j] - amis[j-1]) * (amis[j-1] - amis[j-2]) < 0):
-                amiMins[i] = tauRange[j-1]
+        for start in range(0, numTaus, lagChunkSize):  # vary over time lags, tau, a chunk at a time
+            stop = min(start + lagChunkSize, numTaus)
+            amis[start:stop] = _ami_lags_from_codes(codes, tauRange[start:stop], len(b) - 1)
+            # look for the first turning point in the AMIs computed so far
+            d = np.diff(amis[:stop])
+            turns = np.flatnonzero(d[1:] * d[:-1] < 0)
+            if len(turns) > 0:
+                amiMins[i] = tauRange[turns[0] + 1]
                 break
         if amiMins[i] == 0:
             amiMins[i] = tauRange[-1]
@@ -1,6 +1,9 @@
 import numpy as np
 from Operations.CO_AutoCorr import CO_AutoCorr
 
+# maximum number of elements in a block of stacked angle series
+_maxBlockSize = 2**22
+
 def CO_Embed2_AngleTau(y, maxTau):
     """
     Angle autocorrelation in a 2-dimensional embedding space
@@ -19,26 +22,20 @@ def CO_Embed2_AngleTau(y, maxTau):
     dict: A dictionary containing various statistics
     """
     tauRange = np.arange(1, maxTau + 1)
-    numTau = len(tauRange)
-
-    # Ensure y is a column vector
-    y = np.atleast_2d(y)
-    if y.shape[0] < y.shape[1]:
-        y = y.T
 
-    stats_store = np.zeros((3, numTau))
+    # Ensure y is a flat vector
+    y = np.asarray(y, dtype=float).ravel()
+    N = len(y)
 
-    for i, tau in enumerate(tauRange):
-        m = np.column_stack((y[:-tau], y[tau:]))
-        theta = np.diff(m[:, 1]) / np.diff(m[:, 0])
-        theta = np.arctan(theta)  # measured as deviation from the horizontal
+    if N - 1 - maxTau <= 0:
+        raise ValueError(f'Time series (N={N}) too short for embedding')
 
-        if len(theta) == 0:
-            raise ValueError(f'Time series (N={len(y)}) too short for embedding')
-
-        stats_store[0, i] = CO_AutoCorr(theta, 1, 'Fourier')[0]
-        stats_store[1, i] = CO_AutoCorr(theta, 2, 'Fourier')[0]
-        stats_store[2, i] = CO_AutoCorr(theta, 3, 'Fourier')[0]
+    # Autocorrelations of the angles at lags 1, 2 and 3 for all tau, computed for
+    # blocks of tau at a time (to bound the memory used by the stacked angle series)
+    dy = np.diff(y)
+    tausPerBlock = max(1, _maxBlockSize // N)
+    stats_store = np.hstack([_angle_acfs(dy, tauRange[i:i+tausPerBlock])
+                             for i in range(0, maxTau, tausPerBlock)])
     
     # Compute output statistics
     out = {
@@ -60,3 +57,29 @@ def CO_Embed2_AngleTau(y, maxTau):
     out['diff_thetaac12'] = np.sum(np.abs(stats_store[1, :] - stats_store[0, :]))
 
     return out
+
+def _angle_acfs(dy, taus):
+    """
+    Autocorrelations at lags 1, 2 and 3 (rows) of the embedding angles at each
+    tau (columns), given the increments dy of the time series.
+    """
+    # Angles between successive points of the embedding (y[i], y[i+tau]), for every tau,
+    # as rows: theta[i] = arctan(dy[i+tau]/dy[i]). Rows have len(dy) - tau angles
+    # each, and are padded (masked) to a common length.
+    L = len(dy) - taus # number of angles at each tau
+    cols = np.arange(np.max(L))
+    valid = cols < L[:, np.newaxis]
+    dyPadded = np.concatenate((dy, np.ones(np.max(taus))))
+    theta = np.arctan(dyPadded[taus[:, np.newaxis] + cols] / dyPadded[cols])  # measured as deviation from the horizontal
+
+    # Direct dot products of the (zero-padded) demeaned rows, which equal the
+    # Fourier estimates of CO_AutoCorr at these few lags
+    thetaMean = np.sum(np.where(valid, theta, 0), axis=1, keepdims=True) / L[:, np.newaxis]
+    z = np.where(valid, theta - thetaMean, 0)
+    z2 = np.sum(z**2, axis=1)
+    acfs = np.zeros((3, len(taus)))
+    for k in range(1, 4):
+        acfs[k-1, :] = np.sum(z[:, :-k] * z[:, k:], axis=1) / z2
+        acfs[k-1, L <= k] = np.nan # lag beyond the length of the angle series
+
+    return acfs
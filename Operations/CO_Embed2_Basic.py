@@ -1,4 +1,5 @@
 import numpy as np
+from Utils.kernels import kernel
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 
 def CO_Embed2_Basic(y, tau=1):
@@ -11,78 +12,144 @@ def CO_Embed2_Basic(y, tau=1):
     -----------
     y : array_like
         The input time series.
-    tau : int or str, optional
+    tau : int, str or list, optional
         The time lag (can be set to 'tau' to set the time lag to the first zero
-        crossing of the autocorrelation function).
+        crossing of the autocorrelation function). The statistics for a list of
+        time lags are all counted in a single pass.
 
     Returns:
     --------
     out : dict
-        Dictionary containing various point density statistics.
+        Dictionary containing various point density statistics
+        (a list of dicts, one per time lag, if tau is a list).
     """
 
-    if tau == 'tau':
+    y = np.asarray(y, dtype=float)
+    isMultiple = isinstance(tau, list)
+    taus = tau if isMultiple else [tau]
+    if 'tau' in taus:
         # Make tau the first zero crossing of the autocorrelation function
-        tau = CO_FirstCrossing(y, 'ac', 0, 'discrete')
-
-    xt = y[:-tau]  # part of the time series
-    xtp = y[tau:]  # time-lagged time series
-    N = len(y) - tau  # Length of each time series subsegment
-
-    out = {}
-
-    # Points in a thick bottom-left -- top-right diagonal
-    out['updiag01'] = np.sum(np.abs(xtp - xt) < 0.1) / N
-    out['updiag05'] = np.sum(np.abs(xtp - xt) < 0.5) / N
-
-    # Points in a thick bottom-right -- top-left diagonal
-    out['downdiag01'] = np.sum(np.abs(xtp + xt) < 0.1) / N
-    out['downdiag05'] = np.sum(np.abs(xtp + xt) < 0.5) / N
-
-    # Ratio of these
-    out['ratdiag01'] = out['updiag01'] / out['downdiag01']
-    out['ratdiag05'] = out['updiag05'] / out['downdiag05']
-
-    # In a thick parabola concave up
-    out['parabup01'] = np.sum(np.abs(xtp - xt**2) < 0.1) / N
-    out['parabup05'] = np.sum(np.abs(xtp - xt**2) < 0.5) / N
-
-    # In a thick parabola concave down
-    out['parabdown01'] = np.sum(np.abs(xtp + xt**2) < 0.1) / N
-    out['parabdown05'] = np.sum(np.abs(xtp + xt**2) < 0.5) / N
-
-    # In a thick parabola concave up, shifted up 1
-    out['parabup01_1'] = np.sum(np.abs(xtp - (xt**2 + 1)) < 0.1) / N
-    out['parabup05_1'] = np.sum(np.abs(xtp - (xt**2 + 1)) < 0.5) / N
-
-    # In a thick parabola concave down, shifted up 1
-    out['parabdown01_1'] = np.sum(np.abs(xtp + (xt**2 - 1)) < 0.1) / N
-    out['parabdown05_1'] = np.sum(np.abs(xtp + (xt**2 - 1)) < 0.5) / N
-
-    # In a thick parabola concave up, shifted down 1
-    out['parabup01_n1'] = np.sum(np.abs(xtp - (xt**2 - 1)) < 0.1) / N
-    out['parabup05_n1'] = np.sum(np.abs(xtp - (xt**2 - 1)) < 0.5) / N
-
-    # In a thick parabola concave down, shifted down 1
-    out['parabdown01_n1'] = np.sum(np.abs(xtp + (xt**2 + 1)) < 0.1) / N
-    out['parabdown05_n1'] = np.sum(np.abs(xtp + (xt**2 + 1)) < 0.5) / N
-
-    # RINGS (points within a radius range)
-    out['ring1_01'] = np.sum(np.abs(xtp**2 + xt**2 - 1) < 0.1) / N
-    out['ring1_02'] = np.sum(np.abs(xtp**2 + xt**2 - 1) < 0.2) / N
-    out['ring1_05'] = np.sum(np.abs(xtp**2 + xt**2 - 1) < 0.5) / N
-
-    # CIRCLES (points inside a given circular boundary)
-    out['incircle_01'] = np.sum(xtp**2 + xt**2 < 0.1) / N
-    out['incircle_02'] = np.sum(xtp**2 + xt**2 < 0.2) / N
-    out['incircle_05'] = np.sum(xtp**2 + xt**2 < 0.5) / N
-    out['incircle_1'] = np.sum(xtp**2 + xt**2 < 1) / N
-    out['incircle_2'] = np.sum(xtp**2 + xt**2 < 2) / N
-    out['incircle_3'] = np.sum(xtp**2 + xt**2 < 3) / N
-    
-    incircle_values = [out['incircle_01'], out['incircle_02'], out['incircle_05'],
-                       out['incircle_1'], out['incircle_2'], out['incircle_3']]
-    out['medianincircle'] = np.median(incircle_values)
-    out['stdincircle'] = np.std(incircle_values, ddof=1)
-    
-    return out
+        firstZero = CO_FirstCrossing(y, 'ac', 0, 'discrete')
+        taus = [firstZero if t == 'tau' else t for t in taus]
+
+    # Counts of points near each shape, at every threshold and time lag, from one pass
+    counts = _embed2_counts(np.ascontiguousarray(y), np.array(taus, dtype=np.int64))
+
+    outs = []
+    for t, c in zip(taus, counts):
+        N = len(y) - t  # Length of each time series subsegment
+        out = {}
+
+        # Points in a thick bottom-left -- top-right diagonal
+        out['updiag01'] = c[0] / N
+        out['updiag05'] = c[1] / N
+
+        # Points in a thick bottom-right -- top-left diagonal
+        out['downdiag01'] = c[2] / N
+        out['downdiag05'] = c[3] / N
+
+        # Ratio of these
+        out['ratdiag01'] = out['updiag01'] / out['downdiag01']
+        out['ratdiag05'] = out['updiag05'] / out['downdiag05']
+
+        # In a thick parabola concave up
+        out['parabup01'] = c[4] / N
+        out['parabup05'] = c[5] / N
+
+        # In a thick parabola concave down
+        out['parabdown01'] = c[6] / N
+        out['parabdown05'] = c[7] / N
+
+        # In a thick parabola concave up, shifted up 1
+        out['parabup01_1'] = c[8] / N
+        out['parabup05_1'] = c[9] / N
+
+        # In a thick parabola concave down, shifted up 1
+        out['parabdown01_1'] = c[10] / N
+        out['parabdown05_1'] = c[11] / N
+
+        # In a thick parabola concave up, shifted down 1
+        out['parabup01_n1'] = c[12] / N
+        out['parabup05_n1'] = c[13] / N
+
+        # In a thick parabola concave down, shifted down 1
+        out['parabdown01_n1'] = c[14] / N
+        out['parabdown05_n1'] = c[15] / N
+
+        # RINGS (points within a radius range)
+        out['ring1_01'] = c[16] / N
+        out['ring1_02'] = c[17] / N
+        out['ring1_05'] = c[18] / N
+
+        # CIRCLES (points inside a given circular boundary)
+        out['incircle_01'] = c[19] / N
+        out['incircle_02'] = c[20] / N
+        out['incircle_05'] = c[21] / N
+        out['incircle_1'] = c[22] / N
+        out['incircle_2'] = c[23] / N
+        out['incircle_3'] = c[24] / N
+
+        incircle_values = [out['incircle_01'], out['incircle_02'], out['incircle_05'],
+                           out['incircle_1'], out['incircle_2'], out['incircle_3']]
+        out['medianincircle'] = np.median(incircle_values)
+        out['stdincircle'] = np.std(incircle_values, ddof=1)
+        outs.append(out)
+
+    if isMultiple:
+        return outs
+    return outs[0]
+
+@kernel('int64[:, ::1](float64[::1], int64[::1])')
+def _embed2_counts(y, taus):
+    """
+    Numbers of points (y[i], y[i+tau]) of the 2-d embedding, for each tau, within
+    each threshold of the shapes in CO_Embed2_Basic (in the order of its outputs).
+    Each shape's residual is evaluated once per point.
+    """
+    counts = np.zeros((len(taus), 25), dtype=np.int64)
+    for k in range(len(taus)):
+        tau = taus[k]
+        for i in range(len(y) - tau):
+            xt = y[i]  # part of the time series
+            xtp = y[i + tau]  # time-lagged time series
+            xt2 = xt**2
+
+            r = np.abs(xtp - xt) # diagonals
+            counts[k, 0] += r < 0.1
+            counts[k, 1] += r < 0.5
+            r = np.abs(xtp + xt)
+            counts[k, 2] += r < 0.1
+            counts[k, 3] += r < 0.5
+
+            r = np.abs(xtp - xt2) # parabolas
+            counts[k, 4] += r < 0.1
+            counts[k, 5] += r < 0.5
+            r = np.abs(xtp + xt2)
+            counts[k, 6] += r < 0.1
+            counts[k, 7] += r < 0.5
+            r = np.abs(xtp - (xt2 + 1))
+            counts[k, 8] += r < 0.1
+            counts[k, 9] += r < 0.5
+            r = np.abs(xtp + (xt2 - 1))
+            counts[k, 10] += r < 0.1
+            counts[k, 11] += r < 0.5
+            r = np.abs(xtp - (xt2 - 1))
+            counts[k, 12] += r < 0.1
+            counts[k, 13] += r < 0.5
+            r = np.abs(xtp + (xt2 + 1))
+            counts[k, 14] += r < 0.1
+            counts[k, 15] += r < 0.5
+
+            radius2 = xtp**2 + xt2 # rings and circles
+            r = np.abs(radius2 - 1)
+            counts[k, 16] += r < 0.1
+            counts[k, 17] += r < 0.2
+            counts[k, 18] += r < 0.5
+            counts[k, 19] += radius2 < 0.1
+            counts[k, 20] += radius2 < 0.2
+            counts[k, 21] += radius2 < 0.5
+            counts[k, 22] += radius2 < 1
+            counts[k, 23] += radius2 < 2
+            counts[k, 24] += radius2 < 3
+
+    return counts
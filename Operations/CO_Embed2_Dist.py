@@ -1,4 +1,3 @@
-from scipy.stats import expon
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 from Operations.CO_AutoCorr import CO_AutoCorr
 from numpy import histogram_bin_edges
@@ -23,6 +22,7 @@ def CO_Embed2_Dist(y, tau = None):
     Returns:
     dict: A dictionary containing various statistics of the embedding.
     """
+    from scipy.stats import expon
 
     N = len(y) # time-series length
 
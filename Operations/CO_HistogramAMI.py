@@ -1,5 +1,7 @@
 import numpy as np
 from Operations.CO_FirstCrossing import CO_FirstCrossing
+from PeripheryFunctions.BF_Histogram import _sorted_quantile
+from PeripheryFunctions.BF_SortedValues import BF_SortedValues
 
 def CO_HistogramAMI(y, tau = 1, meth = 'even', numBins = 10):
     """
@@ -21,9 +23,33 @@ def CO_HistogramAMI(y, tau = 1, meth = 'even', numBins = 10):
     # Use first zero crossing of the ACF as the time lag
     if isinstance(tau, str) and tau in ['ac', 'tau']:
         tau = CO_FirstCrossing(y, 'ac', 0, 'discrete')
-    
+
+    y = np.asarray(y, dtype=float)
+
     # Bins for the data
     # same for both -- assume same distribution (true for stationary processes, or small lags)
+    b = _histogram_ami_bins(y, meth, numBins)
+
+    # Form the time-delay vectors y1 and y2
+    if not isinstance(tau, (list, np.ndarray)):
+        # if only single time delay as integer, make into a one element list
+        tau = [tau]
+
+    # Discretize the series once, then form the joint distribution at every lag from the bin codes
+    codes = _histogram_ami_codes(y[np.newaxis, :], b[np.newaxis, :])[0]
+    amis = _ami_lags_from_codes(codes, tau, len(b) - 1)
+
+    if len(tau) == 1:
+        return amis[0]
+    else:
+        return {f'ami{i+1}': ami for i, ami in enumerate(amis)}
+
+def _histogram_ami_bins(y, meth, numBins):
+    """
+    Bin edges used to estimate the automutual information of y with the
+    given binning method. Bins can be added (e.g., with std1 and std2), so
+    the number of bins is len(b) - 1.
+    """
     if meth == 'even':
         b = np.linspace(np.min(y), np.max(y), numBins + 1)
         # Add increment buffer to ensure all points are included
@@ -43,43 +69,84 @@ def CO_HistogramAMI(y, tau = 1, meth = 'even', numBins = 10):
         if np.max(y) > 2:
             b = np.concatenate((b, [np.max(y) + 0.1]))
     elif meth == 'quantiles': # use quantiles with ~equal number in each bin
-        b = np.quantile(y, np.linspace(0, 1, numBins + 1), method='hazen')
+        b = _sorted_quantile(BF_SortedValues(y), np.linspace(0, 1, numBins + 1), method='hazen')
         b[0] -= 0.1
         b[-1] += 0.1
     else:
         raise ValueError(f"Unknown method '{meth}'")
-    
-    # Sometimes bins can be added (e.g., with std1 and std2), so need to redefine numBins
-    numBins = len(b) - 1
 
-    # Form the time-delay vectors y1 and y2
-    if not isinstance(tau, (list, np.ndarray)):
-        # if only single time delay as integer, make into a one element list
-        tau = [tau]
+    return b
+
+def _histogram_ami_codes(Y, B):
+    """
+    Bin index of every value in each row of Y, using the edges in the matching
+    row of B (rows of B may be padded with +inf). Follows np.histogram conventions:
+    bins are half-open except the last, which includes its right edge. Values
+    outside the edges are coded -1.
+    """
+    numRows, N = Y.shape
+    numEdges = np.sum(np.isfinite(B), axis=1)
+    # Complex numbers order lexicographically, so (row, value) keys let a single
+    # searchsorted digitize every row against its own edges
+    rows = np.arange(numRows)
+    edgeKeys = (rows[:, np.newaxis] + 1j*np.where(np.isfinite(B), B, 0))[np.isfinite(B)]
+    valueKeys = rows[:, np.newaxis] + 1j*Y
+    codes = np.searchsorted(edgeKeys, valueKeys.ravel(), side='right').reshape(numRows, N)
+    codes -= np.concatenate(([0], np.cumsum(numEdges)[:-1]))[:, np.newaxis] + 1
+    # the rightmost edge is included in the last bin
+    lastEdge = B[rows, numEdges - 1][:, np.newaxis]
+    codes[Y == lastEdge] -= 1
+    codes[(codes < 0) | (codes >= (numEdges - 1)[:, np.newaxis])] = -1
+
+    return codes
 
-    amis = np.zeros(len(tau))
-
-    for i, t in enumerate(tau):
-        if t == 0:
-            # for tau = 0, y1 and y2 are identical to y
-            y1 = y2 = y
-        else:
-            y1 = y[:-t]
-            y2 = y[t:]
-        # Joint distribution of y1 and y2
-        pij, _, _ = np.histogram2d(y1, y2, bins=(b, b))
-        pij = pij[:numBins, :numBins]  # joint
-        pij = pij / np.sum(pij)  # normalize
-        pi = np.sum(pij, axis=1)  # marginal
-        pj = np.sum(pij, axis=0)  # other marginal
-
-        pii = np.tile(pi, (numBins, 1)).T
-        pjj = np.tile(pj, (numBins, 1))
+def _ami_from_codes(codes, tau, numBins):
+    """
+    Histogram automutual information at lag tau of each row of a matrix of
+    bin codes (from _histogram_ami_codes), with up to numBins bins per row.
+    """
+    numRows, N = codes.shape
+    # for tau = 0, y1 and y2 are identical to y
+    c1 = codes[:, :max(N - tau, 0)]
+    c2 = codes[:, tau:]
+    keep = (c1 >= 0) & (c2 >= 0)
+    # Joint distribution of y1 and y2 for every row from one (row-offset) bincount
+    offsets = (np.arange(numRows) * numBins**2)[:, np.newaxis]
+    flat = (offsets + c1*numBins + c2)[keep]
+    pij = np.bincount(flat, minlength=numRows*numBins**2).reshape(numRows, numBins, numBins)
+
+    return _ami_from_joint(pij)
+
+def _ami_lags_from_codes(codes, taus, numBins):
+    """
+    Histogram automutual information of a single vector of bin codes (from
+    _histogram_ami_codes) at each of the time lags in taus.
+    """
+    N = len(codes)
+    taus = np.asarray(taus, dtype=int)
+    # Lagged copies codes[tau:] as rows, padded with the out-of-range code -1
+    padded = np.concatenate((codes, np.full(np.max(taus, initial=0), -1)))
+    c1 = codes[np.newaxis, :]
+    c2 = padded[taus[:, np.newaxis] + np.arange(N)]
+    keep = (c1 >= 0) & (c2 >= 0)
+    # Joint distributions at every lag from one (lag-offset) bincount over
+    # the pairs codes[:-tau]*numBins + codes[tau:]
+    offsets = (np.arange(len(taus)) * numBins**2)[:, np.newaxis]
+    flat = (offsets + c1*numBins + c2)[keep]
+    pij = np.bincount(flat, minlength=len(taus)*numBins**2).reshape(len(taus), numBins, numBins)
+
+    return _ami_from_joint(pij)
+
+def _ami_from_joint(pij):
+    """
+    Automutual information from a stack of joint histograms (counts), one per row.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pij = pij / np.sum(pij, axis=(1, 2), keepdims=True)  # normalize
+        pi = np.sum(pij, axis=2, keepdims=True)  # marginal
+        pj = np.sum(pij, axis=1, keepdims=True)  # other marginal
 
         r = pij > 0  # Defining the range in this way, we set log(0) = 0
-        amis[i] = np.sum(pij[r] * np.log(pij[r] / pii[r] / pjj[r]))
+        terms = np.where(r, pij * np.log(pij / pi / pj), 0)
 
-    if len(tau) == 1:
-        return amis[0]
-    else:
-        return {f'ami{i+1}': ami for i, ami in enumerate(amis)}
+    return np.sum(terms, axis=(1, 2))
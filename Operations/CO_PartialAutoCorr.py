@@ -1,40 +1,126 @@
 import numpy as np
-from statsmodels.tsa.stattools import pacf
+from Operations.CO_AutoCorr import CO_AutoCorr
 
-def CO_PartialAutoCorr(y, max_tau=10, what_method='ols'):
+def CO_PartialAutoCorr(y, max_tau=10, what_method='ols', acf=None):
     """
     Compute the partial autocorrelation of an input time series.
 
     Parameters:
     ----------
-    y (array-like): A scalar time series column vector.
+    y (array-like): A scalar time series column vector, or a 2D array with one time series per row.
     max_tau (int): The maximum time-delay. Returns for lags up to this maximum.
-    what_method (str): The method used to compute: 'ols' or 'yw' (Yule-Walker).
+    what_method (str): The method used to compute: 'ols' or 'yule_walker' (Yule-Walker).
+    acf (array-like, optional): The full autocorrelation function of y, e.g., from
+                                CO_AutoCorr(y, [], 'Fourier') (one row per time series).
+                                Used by 'yule_walker' instead of recomputing it.
 
     Returns:
     ----------
-    out (dict): The partial autocorrelations across the set of time lags.
+    out (dict): The partial autocorrelations across the set of time lags
+                (a list of dicts, one per time series, if y is 2D).
 
     Raises:
     ----------
     ValueError: If max_tau is negative or what_method is invalid.
     """
-    y = np.array(y)
-    N = len(y)  # time-series length
+    y = np.array(y, dtype=float)
+    isBatch = y.ndim == 2
+    Y = np.atleast_2d(y)
+    N = Y.shape[1]  # time-series length
 
     if max_tau <= 0:
         raise ValueError('Negative or zero time lags not applicable')
+    if max_tau > N // 2:
+        raise ValueError(f"Can only compute partial correlations for lags up to 50% of the sample size ({N // 2}).")
 
-    method_map = {'ols': 'ols', 'yule_walker': 'yw'}
-    if what_method not in method_map:
+    if what_method == 'ols':
+        # Regression of each time series on a constant and its lags
+        pacf_values = np.array([_pacf_ols(ySeries, max_tau) for ySeries in Y])
+    elif what_method in ['yule_walker', 'yw']:
+        # Yule-Walker via Levinson-Durbin recursion on the autocorrelation function
+        if acf is None:
+            acf = np.array([CO_AutoCorr(ySeries, [], 'Fourier') for ySeries in Y])
+        acf = np.atleast_2d(acf)[:, :max_tau + 1]
+        # sample-size adjusted autocovariances (normalization does not affect the recursion)
+        acf = acf * N / (N - np.arange(max_tau + 1))
+        pacf_values = _levinson_durbin(acf, max_tau)
+    else:
         raise ValueError(f"Invalid method: {what_method}. Use 'ols' or 'yule_walker'.")
 
-    # Compute partial autocorrelation
-    pacf_values = pacf(y, nlags=max_tau, method=method_map[what_method])
-
     # Create output dictionary
-    out = {}
-    for i in range(1, max_tau + 1):
-        out[f'pac_{i}'] = pacf_values[i]
+    outs = []
+    for pacfSeries in pacf_values:
+        out = {}
+        for i in range(1, max_tau + 1):
+            out[f'pac_{i}'] = pacfSeries[i]
+        outs.append(out)
+
+    if isBatch:
+        return outs
+    else:
+        return outs[0]
+
+def _levinson_durbin(acf, maxOrder):
+    """
+    Partial autocorrelations at lags 0, ..., maxOrder from the Levinson-Durbin
+    recursion on each row of acf (autocorrelations, or autocovariances, from lag 0).
+    """
+    rho = acf / acf[:, [0]]
+    numRows = rho.shape[0]
+    pacf = np.ones((numRows, maxOrder + 1))
+    phi = np.zeros((numRows, maxOrder + 1)) # AR coefficients of the current order
+    v = np.ones(numRows) # prediction error variance (relative to lag 0)
+
+    for k in range(1, maxOrder + 1):
+        # reflection coefficient for order k
+        a = (rho[:, k] - np.sum(phi[:, 1:k] * rho[:, k-1:0:-1], axis=1)) / v
+        phi[:, 1:k] = phi[:, 1:k] - a[:, np.newaxis] * phi[:, k-1:0:-1]
+        phi[:, k] = a
+        v = v * (1 - a**2)
+        pacf[:, k] = a
+
+    return pacf
+
+def _pacf_ols(y, maxTau):
+    """
+    Partial autocorrelations at lags 0, ..., maxTau from OLS regressions of y[t]
+    on a constant and y[t-1], ..., y[t-k], using the samples t = k, ..., N-1 (as
+    statsmodels' pacf with method='ols').
+
+    A single QR factorization of the largest regression is updated incrementally:
+    dropping the last lag column keeps R upper triangular, and the extra sample
+    available at each lower order is added with Givens rotations.
+    """
+    N = len(y)
+    pacf = np.ones(maxTau + 1)
+
+    def design(k):
+        # design matrix [1, y[t-1], ..., y[t-k]] for t = k, ..., N-1
+        lags = np.lib.stride_tricks.sliding_window_view(y[:N-1], k)[:, ::-1]
+        return np.column_stack((np.ones(N - k), lags))
+
+    # orders with fewer samples than regressors have no unique fit: use the minimum-norm solution
+    kFit = maxTau
+    while N - kFit < kFit + 1:
+        pacf[kFit] = np.linalg.lstsq(design(kFit), y[kFit:], rcond=None)[0][-1]
+        kFit -= 1
+
+    Q, R = np.linalg.qr(design(kFit))
+    z = Q.T @ y[kFit:]
+    pacf[kFit] = z[kFit] / R[kFit, kFit]
+
+    for k in range(kFit - 1, 0, -1):
+        R = R[:k+1, :k+1].copy()
+        z = z[:k+1].copy()
+        # add the sample t = k: regressors [1, y[k-1], ..., y[0]], response y[k]
+        row = np.concatenate(([1.0], y[k-1::-1]))
+        target = y[k]
+        for i in range(k + 1):
+            r = np.hypot(R[i, i], row[i])
+            c, s = R[i, i] / r, row[i] / r
+            R[i, i:], row[i:] = c*R[i, i:] + s*row[i:], -s*R[i, i:] + c*row[i:]
+            z[i], target = c*z[i] + s*target, -s*z[i] + c*target
+        # the last coefficient from back-substitution
+        pacf[k] = z[k] / R[k, k]
 
-    return out
+    return pacf
@@ -1,9 +1,8 @@
 import numpy as np
-from scipy import stats
-from scipy.stats import skew, kurtosis
 from PeripheryFunctions.BF_zscore import BF_zscore as zscore
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 from Operations.CO_AutoCorr import CO_AutoCorr
+from PeripheryFunctions.BF_Buffer import BF_Buffer
 
 
 def CO_StickAngles(y):
@@ -25,6 +24,8 @@ def CO_StickAngles(y):
     out : dict
         A dictionary containing various statistics on the obtained sequence of angles.
     """
+    from scipy import stats
+    from scipy.stats import skew, kurtosis
 
     # Split the time series into positive and negative parts
     ix = [np.where(y >= 0)[0], np.where(y < 0)[0]]
@@ -63,7 +64,7 @@ def CO_StickAngles(y):
         ksy2 = kde2(ksx)
         out['pnsumabsdiff'] = np.sum(np.abs(ksy1-ksy2))
     else:
-        out['pnsumabsdiff'] = np.NaN
+        out['pnsumabsdiff'] = np.nan
     
     # how symmetric is the distribution of angles?
     if len(angles[0]) > 0:
@@ -74,8 +75,8 @@ def CO_StickAngles(y):
         out['symks_p'] = np.sum(np.abs(ksy1[:100] - ksy1[101:][::-1]))
         out['ratmean_p'] = np.mean(angles[0][angles[0] > 0])/np.mean(angles[0][angles[0] < 0])
     else:
-        out['symks_p'] = np.NaN
-        out['ratmean_p'] = np.NaN
+        out['symks_p'] = np.nan
+        out['ratmean_p'] = np.nan
     
     if len(angles[1]) > 0:
         maxdev = np.max(np.abs(angles[1]))
@@ -84,8 +85,8 @@ def CO_StickAngles(y):
         out['symks_n'] = np.sum(np.abs(ksy2[:100] - ksy2[101:][::-1]))
         out['ratmean_n'] = np.mean(angles[1][angles[1] > 0])/np.mean(angles[1][angles[1] < 0])
     else:
-        out['symks_n'] = np.NaN
-        out['ratmean_n'] = np.NaN
+        out['symks_n'] = np.nan
+        out['ratmean_n'] = np.nan
     
     # z-score
     zangles = []
@@ -106,10 +107,10 @@ def CO_StickAngles(y):
         # StatAv5
         out['statav5_p_m'], out['statav5_p_s'] = SUB_statav(zangles[0], 5)
     else:
-        out['statav2_p_m'], out['statav2_p_s'] = np.NaN, np.NaN
-        out['statav3_p_m'], out['statav3_p_s'] = np.NaN, np.NaN
-        out['statav4_p_m'], out['statav4_p_s'] = np.NaN, np.NaN
-        out['statav5_p_m'], out['statav5_p_s'] = np.NaN, np.NaN
+        out['statav2_p_m'], out['statav2_p_s'] = np.nan, np.nan
+        out['statav3_p_m'], out['statav3_p_s'] = np.nan, np.nan
+        out['statav4_p_m'], out['statav4_p_s'] = np.nan, np.nan
+        out['statav5_p_m'], out['statav5_p_s'] = np.nan, np.nan
     
     # there are negative angles
     if len(zangles[1]) > 0:
@@ -122,10 +123,10 @@ def CO_StickAngles(y):
         # StatAv5
         out['statav5_n_m'], out['statav5_n_s'] = SUB_statav(zangles[1], 5)
     else:
-        out['statav2_n_m'], out['statav2_n_s'] = np.NaN, np.NaN
-        out['statav3_n_m'], out['statav3_n_s'] = np.NaN, np.NaN
-        out['statav4_n_m'], out['statav4_n_s'] = np.NaN, np.NaN
-        out['statav5_n_m'], out['statav5_n_s'] = np.NaN, np.NaN
+        out['statav2_n_m'], out['statav2_n_s'] = np.nan, np.nan
+        out['statav3_n_m'], out['statav3_n_s'] = np.nan, np.nan
+        out['statav4_n_m'], out['statav4_n_s'] = np.nan, np.nan
+        out['statav5_n_m'], out['statav5_n_s'] = np.nan, np.nan
     
     # All angles
     
@@ -144,9 +145,9 @@ def CO_StickAngles(y):
         out['ac1_p'] = CO_AutoCorr(zangles[0], 1, 'Fourier')[0]
         out['ac2_p'] = CO_AutoCorr(zangles[0], 2, 'Fourier')[0]
     else:
-        out['tau_p'] = np.NaN
-        out['ac1_p'] = np.NaN
-        out['ac2_p'] = np.NaN
+        out['tau_p'] = np.nan
+        out['ac1_p'] = np.nan
+        out['ac2_p'] = np.nan
     
     out['tau_all'] = CO_FirstCrossing(zallAngles, 'ac', 0, 'continuous')
     out['ac1_all'] = CO_AutoCorr(zallAngles, 1, 'Fourier')[0]
@@ -165,7 +166,7 @@ def CO_StickAngles(y):
         out['kurtosis_p'] = kurtosis(angles[0], fisher=False)
     else:
         out['q1_p'], out['q10_p'], out['q90_p'], out['q99_p'], \
-            out['skewness_p'], out['kurtosis_p'] = np.NaN, np.Nan, np.NaN,  np.NaN, np.NaN, np.NaN
+            out['skewness_p'], out['kurtosis_p'] = np.nan, np.nan, np.nan,  np.nan, np.nan, np.nan
     
     if len(zangles[1]) > 0:
         out['q1_n'] = np.quantile(zangles[1], 0.01, method='hazen')
@@ -176,7 +177,7 @@ def CO_StickAngles(y):
         out['kurtosis_n'] = kurtosis(angles[1], fisher=False)
     else:
         out['q1_n'], out['q10_n'], out['q90_n'], out['q99_n'], \
-            out['skewness_n'], out['kurtosis_n'] = np.NaN, np.NaN, np.NaN,  np.NaN, np.NaN, np.NaN
+            out['skewness_n'], out['kurtosis_n'] = np.nan, np.nan, np.nan,  np.nan, np.nan, np.nan
     
     F_quantz = lambda x : np.quantile(zallAngles, x, method='hazen')
     out['q1_all'] = F_quantz(0.01)
@@ -193,9 +194,10 @@ def CO_StickAngles(y):
 def SUB_statav(x, n):
     NN = len(x)
     if NN < 2 * n: # not long enough
-        statavmean = np.NaN
-        statavstd = np.NaN
-    x_buff = _buffer(x, int(np.floor(NN/n)))
+        statavmean = np.nan
+        statavstd = np.nan
+    # (there are at least n complete windows, so any partial final window is dropped)
+    x_buff = BF_Buffer(x, int(np.floor(NN/n))).T
     if x_buff.shape[1] > n:
         # remove final pt
         x_buff = x_buff[:, :n]
@@ -204,63 +206,3 @@ def SUB_statav(x, n):
     statavstd = np.std(np.std(x_buff, axis=0), ddof=1, axis=0)/np.std(x, ddof=1, axis=0)
 
     return statavmean, statavstd
-
-def _buffer(X, n, p=0, opt=None):
-    '''Mimic MATLAB routine to generate buffer array
-
-    MATLAB docs here: https://se.mathworks.com/help/signal/ref/buffer.html.
-    Taken from: https://stackoverflow.com/questions/38453249/does-numpy-have-a-function-equivalent-to-matlabs-buffer 
-
-    Parameters
-    ----------
-    x: ndarray
-        Signal array
-    n: int
-        Number of data segments
-    p: int
-        Number of values to overlap
-    opt: str
-        Initial condition options. default sets the first `p` values to zero,
-        while 'nodelay' begins filling the buffer immediately.
-
-    Returns
-    -------
-    result : (n,n) ndarray
-        Buffer array created from X
-    '''
-    import numpy as np
-
-    if opt not in [None, 'nodelay']:
-        raise ValueError('{} not implemented'.format(opt))
-
-    i = 0
-    first_iter = True
-    while i < len(X):
-        if first_iter:
-            if opt == 'nodelay':
-                # No zeros at array start
-                result = X[:n]
-                i = n
-            else:
-                # Start with `p` zeros
-                result = np.hstack([np.zeros(p), X[:n-p]])
-                i = n-p
-            # Make 2D array and pivot
-            result = np.expand_dims(result, axis=0).T
-            first_iter = False
-            continue
-
-        # Create next column, add `p` results from last col if given
-        col = X[i:i+(n-p)]
-        if p != 0:
-            col = np.hstack([result[:,-1][-p:], col])
-        i += n-p
-
-        # Append zeros if last row and not length `n`
-        if len(col) < n:
-            col = np.hstack([col, np.zeros(n-len(col))])
-
-        # Combine result with next row
-        result = np.hstack([result, np.expand_dims(col, axis=0).T])
-
-    return result
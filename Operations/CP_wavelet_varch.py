@@ -1,5 +1,4 @@
 import numpy as np
-import pywt
 
 def CP_wavelet_varchg(y, wName = 'db3', level = 3, maxnchpts = 5, minDelay = 0.01):
     """
@@ -26,6 +25,7 @@ def CP_wavelet_varchg(y, wName = 'db3', level = 3, maxnchpts = 5, minDelay = 0.0
     int
         The optimal number of change points.
     """
+    import pywt
     N = len(y) # length of the time-series
 
     if level == 'max':
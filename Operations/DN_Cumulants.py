@@ -1,5 +1,3 @@
-from scipy import stats
-
 def DN_Cumulants(y, cumWhatMay = 'skew1'):
     """
     Distributional moments of the input data.
@@ -19,6 +17,7 @@ def DN_Cumulants(y, cumWhatMay = 'skew1'):
     --------
     float : the higher order moment.
     """
+    from scipy import stats
     if cumWhatMay == 'skew1':
         out = stats.skew(y)
     elif cumWhatMay == 'skew2':
@@ -1,5 +1,3 @@
-from scipy import stats
-
 def DN_Fit_mle(y, fitWhat = 'gaussian'):
     """
     Maximum likelihood distribution fit to data.
@@ -17,6 +15,7 @@ def DN_Fit_mle(y, fitWhat = 'gaussian'):
     --------
     dict: distirbution-specific paramters from the fit
     """
+    from scipy import stats
 
     out = {}
     if fitWhat == 'gaussian':
@@ -2,6 +2,8 @@ import numpy as np
 import warnings
 from PeripheryFunctions.BF_iszscored import BF_iszscored
 from PeripheryFunctions.BF_SimpleBinner import BF_SimpleBinner
+from PeripheryFunctions.BF_Histogram import BF_Histogram
+from PeripheryFunctions.BF_SortedValues import BF_SortedValues
 
 def DN_HistogramAsymmetry(y, numBins = 10, doSimple = True):
     """
@@ -27,15 +29,19 @@ def DN_HistogramAsymmetry(y, numBins = 10, doSimple = True):
         warnings.warn("DN_HistogramAsymmetry assumes a z-scored (or standardised) input")
     
     # compute the histogram seperately from positive and negative values in the data
-    yPos = y[y > 0] # filter out the positive vals
-    yNeg = y[y < 0]
+    # (after a single sort, the negative and positive values are contiguous and sorted)
+    y = np.asarray(y, dtype=float)
+    ySorted = BF_SortedValues(y)
+    ySorted = ySorted[:len(ySorted) - np.count_nonzero(np.isnan(y))] # (nans are sorted to the end)
+    yPos = ySorted[np.searchsorted(ySorted, 0, side='right'):] # filter out the positive vals
+    yNeg = ySorted[:np.searchsorted(ySorted, 0, side='left')]
 
     if doSimple:
-        countsPos, binEdgesPos = BF_SimpleBinner(yPos, numBins)
-        countsNeg, binEdgesNeg = BF_SimpleBinner(yNeg, numBins)
+        countsPos, binEdgesPos = BF_SimpleBinner(yPos, numBins, isSorted=True)
+        countsNeg, binEdgesNeg = BF_SimpleBinner(yNeg, numBins, isSorted=True)
     else:
-        countsPos, binEdgesPos = np.histogram(yPos, numBins)
-        countsNeg, binEdgesNeg = np.histogram(yNeg, numBins)
+        countsPos, binEdgesPos = BF_Histogram(yPos, numBins, isSorted=True)
+        countsNeg, binEdgesNeg = BF_Histogram(yNeg, numBins, isSorted=True)
     
     # normalise by the total counts
     NnonZero = np.sum(y!=0)
@@ -48,7 +54,7 @@ def DN_HistogramAsymmetry(y, numBins = 10, doSimple = True):
 
     # Histogram counts and overall density differences
     out = {}
-    out['densityDiff'] = np.sum(y > 0) - np.sum(y < 0)  # measure of asymmetry about the mean
+    out['densityDiff'] = len(yPos) - len(yNeg)  # measure of asymmetry about the mean
     out['modeProbPos'] = np.max(pPos)
     out['modeProbNeg'] = np.max(pNeg)
     out['modeDiff'] = out['modeProbPos'] - out['modeProbNeg']
@@ -1,5 +1,6 @@
 import numpy as np
-from PeripheryFunctions.BF_SimpleBinner import BF_SimpleBinner
+from PeripheryFunctions.BF_Histogram import BF_Histogram
+from PeripheryFunctions.BF_SortedValues import BF_SortedValues
 
 def DN_HistogramMode(y, numBins = 10, doSimple = True):
     """
@@ -11,35 +12,47 @@ def DN_HistogramMode(y, numBins = 10, doSimple = True):
     -----------
     y : array-like
         the input data vector
-    numBins : int, optional
-        the number of bins to use in the histogram
+    numBins : int, str or list, optional
+        the number of bins to use in the histogram, or the name of a numpy
+        binning rule (e.g., 'auto'). The histograms for a list of settings
+        are all counted from a single sort of the data.
     doSimple : bool, optional
         whether to use a simple binning method (linearly spaced bins)
 
     Returns:
     --------
     out : float
-        the mode of the data vector using histograms with numBins bins. 
+        the mode of the data vector using histograms with numBins bins
+        (a list with one value per setting if numBins is a list).
     """
+    y = np.asarray(y, dtype=float)
+    ySorted = BF_SortedValues(y)
 
-    if isinstance(numBins, int):
-        if doSimple:
-            N, binEdges = BF_SimpleBinner(y, numBins)
+    settings = numBins if isinstance(numBins, list) else [numBins]
+    binSettings = []
+    for numBinsSetting in settings:
+        if isinstance(numBinsSetting, (int, np.integer)):
+            if doSimple:
+                # linearly spaced bins through the range of the data (as in BF_SimpleBinner)
+                binSettings.append(np.linspace(ySorted[0], ySorted[-1], numBinsSetting + 1))
+            else:
+                # this gives a different result to MATLAB for the same number of bins 
+                # better to use the simple binner (as set by default)
+                binSettings.append(numBinsSetting)
+        elif isinstance(numBinsSetting, str):
+            # NOTE: auto doesn't yield the same number of bins as MATLAB's auto, despite both using the same binning algs. 
+            binSettings.append(np.histogram_bin_edges(y, bins=numBinsSetting))
         else:
-            # this gives a different result to MATLAB for the same number of bins 
-            # better to use the simple binner (as set by default)
-            N, binEdges = np.histogram(y, bins=numBins)
-    elif isinstance(numBins, str):
-        # NOTE: auto doesn't yield the same number of bins as MATLAB's auto, despite both using the same binning algs. 
-        bin_edges = np.histogram_bin_edges(y, bins=numBins)
-        N, binEdges = np.histogram(y, bins=bin_edges)
-    else:
-        raise ValueError("Unknown format for numBins")
+            raise ValueError("Unknown format for numBins")
 
-    # compute bin centers from bin edges
-    binCenters = np.mean([binEdges[:-1], binEdges[1:]], axis=0)
+    outs = []
+    for N, binEdges in BF_Histogram(ySorted, binSettings, isSorted=True):
+        # compute bin centers from bin edges
+        binCenters = np.mean([binEdges[:-1], binEdges[1:]], axis=0)
 
-    # mean position of maximums (if multiple)
-    out = np.mean(binCenters[N == np.max(N)])
+        # mean position of maximums (if multiple)
+        outs.append(np.mean(binCenters[N == np.max(N)]))
 
-    return out
+    if isinstance(numBins, list):
+        return outs
+    return outs[0]
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy import stats
 
 def DN_Mean(y, mean_type='arithmetic'):
     """
@@ -25,6 +24,7 @@ def DN_Mean(y, mean_type='arithmetic'):
     Notes:
     Harmonic mean only defined for positive values.
     """
+    from scipy import stats
     y = np.array(y)
     N = len(y)
 
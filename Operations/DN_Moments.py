@@ -1,4 +1,3 @@
-from scipy.stats import moment
 import numpy as np
 
 def DN_Moments(y, theMom):
@@ -13,6 +12,7 @@ def DN_Moments(y, theMom):
     Returns:
     out (float): theMom moment of the distribution of the input time series. 
     """
+    from scipy.stats import moment
     out = moment(y, theMom) / np.std(y, ddof=1) # normalized
 
     return out
@@ -1,5 +1,4 @@
 import numpy as np
-from scipy import stats
 from PeripheryFunctions.BF_iszscored import BF_iszscored
 from Operations.CO_AutoCorr import CO_AutoCorr
 from Operations.CO_FirstCrossing import CO_FirstCrossing
@@ -26,6 +25,7 @@ def DN_RemovePoints(y, removeHow = 'absfar', p = 0.1, removeOrSaturate = 'remove
     Returns:
     dict: Statistics including the change in autocorrelation, time scales, mean, spread, and skewness.
     """
+    from scipy import stats
     N = len(y) # time series length
 
     # check that the input time series has been z-scored
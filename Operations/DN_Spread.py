@@ -1,5 +1,4 @@
 import numpy as np
-from scipy import stats
 
 def DN_Spread(y, spreadMeasure='std'):
     """
@@ -7,6 +6,7 @@ def DN_Spread(y, spreadMeasure='std'):
     Returns the spread of the raw data vector, as the standard deviation,
     inter-quartile range, mean absolute deviation, or median absolute deviation.
     """
+    from scipy import stats
     if spreadMeasure == 'std':
         out = np.std(y, ddof=1)
     elif spreadMeasure == 'iqr':
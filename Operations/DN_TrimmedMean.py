@@ -1,4 +1,5 @@
 import numpy as np 
+from PeripheryFunctions.BF_SortedValues import BF_SortedValues
 
 def DN_TrimmedMean(y, n=0):
     """
@@ -16,7 +17,7 @@ def DN_TrimmedMean(y, n=0):
     n *= 0.01
     N = len(y)
     trim = int(np.round(N * n / 2))
-    y = np.sort(y)
+    y = BF_SortedValues(y)
 
     out = np.mean(y[trim:N-trim])
 
@@ -1,10 +1,10 @@
 import numpy as np
-from scipy.optimize import curve_fit
 
 def DT_IsSeasonal(y):
     """
     A simple test of seasonality.
     """
+    from scipy.optimize import curve_fit
 
     N = len(y) # length of the time series
     # IMPORTANT: need to start at index 1 if want fitting to give
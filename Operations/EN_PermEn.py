@@ -1,11 +1,10 @@
-import antropy as ant
-from antropy.utils import _embed, _xlogx
 from math import factorial
 import numpy as np
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 
 def _perm_entropy_all(x, order=3, delay=1, normalize=False, return_normedCounts=False):
     # compute all relevant perm entropy stats
+    from antropy.utils import _embed, _xlogx
     if isinstance(delay, (list, np.ndarray, range)):
         return np.mean([_perm_entropy_all(x, order=order, delay=d, normalize=normalize) for d in delay])
     x = np.array(x)
@@ -50,6 +49,7 @@ def EN_PermEn(y, m = 2, tau = 1):
         different implementations
     --------
     """
+    import antropy as ant
     if tau == 'ac':
         tau = CO_FirstCrossing(y, 'ac', 0, 'discrete')
     elif not isinstance(tau, int):
@@ -1,5 +1,6 @@
 import numpy as np
 import warnings
+from Utils.kernels import kernel
 from PeripheryFunctions.BF_iszscored import BF_iszscored
 
 def EX_MovingThreshold(y, a = 1, b = 0.1):
@@ -18,40 +19,46 @@ def EX_MovingThreshold(y, a = 1, b = 0.1):
 
     Parameters:
     y (array-like): The input (z-scored) time series
-    a (float): The barrier jump parameter (in extreme event)
-    b (float): The barrier decay proportion (in absence of extreme event)
+    a (float or array-like): The barrier jump parameter (in extreme event)
+    b (float or array-like): The barrier decay proportion (in absence of extreme event)
+        If a and/or b are array-like, every (a, b) pair is simulated together.
 
     Returns:
     dict: A dictionary containing various statistics about the barrier and kicks
+          (a list of such dictionaries, one per (a, b) pair, if a or b is array-like)
     """
 
     # Check that the time series is z-scored (just a warning)
     if not BF_iszscored(y):
         warnings.warn("The input time series should be z-scored!")
-    
-    if b < 0 or b > 1:
+
+    isBatch = np.ndim(a) > 0 or np.ndim(b) > 0
+    a, b = np.broadcast_arrays(np.atleast_1d(np.asarray(a, dtype=float)),
+                                np.atleast_1d(np.asarray(b, dtype=float)))
+
+    if np.any(b < 0) or np.any(b > 1):
         raise ValueError('The decay proportion, b, should be between 0 and 1')
-    
+
     N = len(y)
-    y = np.abs(y)  # extreme events defined in terms of absolute deviation from mean
-    q = np.zeros(N) # the barrier
-    kicks = np.zeros(N)
+    y = np.abs(np.asarray(y, dtype=float))  # extreme events defined in terms of absolute deviation from mean
 
     # Treat the barrier as knowing nothing about the time series, until it encounters it
     # (except for the std! -- starts at 1)
 
-    # Initial condition of barrier q:
     # The barrier will get smarter about the distribution but will decay to simulate 'forgetfulness' in the original model(!)
+    Q, Kicks = _moving_threshold(y, np.ascontiguousarray(a), np.ascontiguousarray(b))
 
-    q[0] = 1  # begin at sigma
+    outs = [_barrier_stats(Q[k], Kicks[k], y, N) for k in range(len(a))]
 
-    for i in range(1, N):
-        if y[i] > q[i-1]:  # Extreme event -- time series value more extreme than the barrier
-            q[i] = (1 + a) * y[i]  # increase barrier above the new observation by a factor a
-            kicks[i] = q[i] - q[i-1]  # The size of the increase
-        else:
-            q[i] = (1 - b) * q[i-1]  # Decrease barrier by proportion b
+    if isBatch:
+        return outs
+    else:
+        return outs[0]
 
+def _barrier_stats(q, kicks, y, N):
+    """
+    Statistics of a single barrier trajectory, q, and its kicks.
+    """
     # Basic statistics on the barrier dynamics, q
     out = {
         'meanq': np.mean(q),
@@ -70,6 +77,27 @@ def EX_MovingThreshold(y, a = 1, b = 0.1):
     out['stdkicks'] = np.std(Ikicks, ddof=1)
     out['meankickf'] = np.mean(Ikicks)
     out['mediankicksf'] = np.median(Ikicks)
-    
 
     return out
+
+@kernel('UniTuple(float64[:, ::1], 2)(float64[::1], float64[::1], float64[::1])')
+def _moving_threshold(y, a, b):
+    """
+    Barrier, q, and kick sizes for each (a, b) pair, given the absolute time series y.
+    Returns two (numSets, N) arrays.
+    """
+    N = len(y)
+    numSets = len(a)
+    Q = np.zeros((numSets, N)) # the barrier
+    Kicks = np.zeros((numSets, N))
+
+    for k in range(numSets):
+        Q[k, 0] = 1  # Initial condition of barrier q: begin at sigma
+        for i in range(1, N):
+            if y[i] > Q[k, i-1]:  # Extreme event -- time series value more extreme than the barrier
+                Q[k, i] = (1 + a[k]) * y[i]  # increase barrier above the new observation by a factor a
+                Kicks[k, i] = Q[k, i] - Q[k, i-1]  # The size of the increase
+            else:
+                Q[k, i] = (1 - b[k]) * Q[k, i-1]  # Decrease barrier by proportion b
+
+    return Q, Kicks
@@ -1,7 +1,6 @@
 import numpy as np 
 from Operations.SB_CoarseGrain import SB_CoarseGrain
 from PeripheryFunctions.BF_ResetSeed import BF_ResetSeed
-import scipy as sc
 import math
 
 def FC_Surprise(y, whatPrior='dist', memory=0.2, numGroups=3, coarseGrainMethod='quantile', 
@@ -39,8 +38,9 @@ def FC_Surprise(y, whatPrior='dist', memory=0.2, numGroups=3, coarseGrainMethod=
         'quantile': an equiprobable alphabet by the value of each time-series datapoint,
         'updown': an equiprobable alphabet by the value of incremental changes in the time-series values,
         'embed2quadrants': 4-letter alphabet of the quadrant each data point resides in a two-dimensional embedding space.
-    num_iters : int, optional
-        The number of iterations to repeat the procedure for.
+    num_iters : int or None, optional
+        The number of randomly-selected time points to repeat the procedure for.
+        If None, every time point after the initial memory is used.
     random_seed : int or None, optional
         Seed for the random number generator
 
@@ -51,6 +51,7 @@ def FC_Surprise(y, whatPrior='dist', memory=0.2, numGroups=3, coarseGrainMethod=
         minimum, maximum, mean, median, lower and upper quartiles, and
         standard deviation.
     """
+    import scipy as sc
 
     if (memory > 0) and (memory < 1): #specify memory as a proportion of the time series length
         memory = int(np.round(memory*len(y)))
@@ -59,60 +60,60 @@ def FC_Surprise(y, whatPrior='dist', memory=0.2, numGroups=3, coarseGrainMethod=
     yth = SB_CoarseGrain(y, coarseGrainMethod, numGroups) # a coarse-grained time series using the numbers 1:numgroups
     N = int(len(yth))
 
-    #select random samples to test
-    np.random.seed(randomSeed) # set seed for reproducibility
-    rs = np.random.permutation(int(N-memory)) + memory # can't do beginning of time series, up to memory
-    rs = np.sort(rs[0:min(numIters,(len(rs)-1))])
-    rs = np.array([rs]) # made into two dimensional array to match matlab and work with testing code directly below
+    if whatPrior not in ['dist', 'T1', 'T2']:
+        raise ValueError(f"Unknown method: {whatPrior}")
+
+    if numIters is None:
+        # test every time point after the initial memory
+        rs = np.arange(memory, N)
+        numIters = len(rs)
+    else:
+        #select random samples to test
+        np.random.seed(randomSeed) # set seed for reproducibility
+        rs = np.random.permutation(int(N-memory)) + memory # can't do beginning of time series, up to memory
+        rs = np.sort(rs[0:min(numIters,(len(rs)-1))])
 
     # COMPUTE EMPIRICAL PROBABILITIES FROM TIME SERIES
+    # (for all sampled time points at once, from counts of symbols, and of
+    # transitions between symbols, within each memory window)
+    # The memory window of time point rs is yth[rs-memory-1:rs-1], and the point to predict is yth[rs-1]
+    store = np.zeros(numIters)
+    lo = rs - memory - 1 # first index in memory
+    if whatPrior == 'dist':
+        # uses the distribution up to memory to inform the next point
+        hi = rs - 2 # last index in memory
+        target = yth[rs-1]
+        counts = _window_counts(yth, target, np.maximum(lo, 0), hi)
+        # (a memory starting at index -1 wraps around to the last point)
+        counts += (lo < 0) & (yth[-1] == target)
+        p = counts/memory
+    elif whatPrior == 'T1':
+        # uses one-point correlations in memory to inform the next point
+        # estimate transition probabilites from data in memory:
+        # find where in memory this has been observed before, and what followed it
+        numSymbols = np.max(yth) + 1
+        transitions = yth[:-1]*numSymbols + yth[1:]
+        hi = rs - 3 # last start of a transition within memory
+        inmem = _window_counts(yth, yth[rs-2], lo, hi)
+        matches = _window_counts(transitions, yth[rs-2]*numSymbols + yth[rs-1], lo, hi)
+        with np.errstate(invalid='ignore'):
+            p = np.where(inmem > 0, matches/inmem, 0)
+    else:
+        # uses two point correlations in memory to inform the next point
+        # (as in HCTSA: the occurrences in memory of the preceding pair of symbols
+        # are found among the occurrences of the last symbol, and the point to
+        # predict is compared with memory at the rank of each such occurrence)
+        p = _two_point_prior(yth, rs, lo)
+
+    if whatPrior != 'dist':
+        # a memory starting at index -1 is empty
+        p[lo < 0] = 0
+    store[:len(rs)] = p
 
-    store = np.zeros([numIters, 1])
-    for i in range(0, rs.size): # rs.size
-        if whatPrior == 'dist':
-            # uses the distribution up to memory to inform the next point
-            p = np.sum(yth[np.arange(rs[0, i]-memory-1, rs[0, i]-1)] == yth[rs[0, i]-1])/memory # had to be careful with indexing, arange() works like matlab's : operator
-            store[i] = p
-        elif whatPrior == 'T1':
-            # uses one-point correlations in memory to inform the next point
-            # estimate transition probabilites from data in memory
-            # find where in memory this has been observbed before, and preceded it
-            memoryData = yth[rs[0, i] - memory - 1:rs[0, i]-1] # every outputted value should be one less than in matlab
-            # previous data observed in memory here
-            inmem = np.nonzero(memoryData[0:memoryData.size - 1] == yth[rs[0, i]-2])
-            inmem = inmem[0] # nonzero outputs a tuple of two arrays for some reason, the second one of all zeros
-            if inmem.size == 0:
-                p = 0
-            else:
-                p = np.mean(memoryData[inmem + 1] == yth[rs[0, i]-1])
-            store[i] = p
-
-        elif whatPrior == 'T2':
-            # uses two point correlations in memory to inform the next point
-            memoryData = yth[rs[0, i] - memory - 1:rs[0, i]-1] # every outputted value should be one less than in matlab
-            inmem1 = np.nonzero(memoryData[1:memoryData.size - 1] == yth[rs[0, i]-2])
-            inmem1 = inmem1[0]
-            inmem2 = np.nonzero(memoryData[inmem1] == yth[rs[0, i]-3])
-            inmem2 = inmem2[0]
-
-            if inmem2.size == 0:
-                p = 0
-            else:
-                p = np.sum(memoryData[inmem2+2] == yth[rs[0, i]-1])/len(inmem2)
-
-            store[i] = p
-
-        else:
-            print("Error: unknown method: " + whatPrior)
-            return
-    
     # INFORMATION GAINED FROM NEXT OBSERVATION IS log(1/p) = -log(p)
     store[store == 0] = 1 # so that we set log[0] == 0
 
     out = {} # dictionary for outputs
-    for i in range(0, len(store)):
-        if store[i] == 0:
-            store[i] = 1
 
     store = -(np.log(store))
     #minimum amount of information you can gain in this way
@@ -139,3 +140,48 @@ def FC_Surprise(y, whatPrior='dist', memory=0.2, numGroups=3, coarseGrainMethod=
         out['tstat'] = abs((out['mean']-1)/(out['std']/math.sqrt(numIters)))
 
     return out 
+
+def _window_counts(codes, query, lo, hi):
+    """
+    Number of times query[i] occurs in codes[lo[i]:hi[i]+1], for every i.
+
+    Occurrences are counted from the positions of each code, sorted by
+    (code, position), so each window count is a difference of two
+    searchsorted ranks.
+    """
+    N = len(codes)
+    keys = np.sort(codes.astype(np.int64)*N + np.arange(N))
+    lo = np.maximum(lo, 0)
+    hi = np.minimum(hi, N - 1)
+    counts = np.searchsorted(keys, query*N + hi, side='right') - np.searchsorted(keys, query*N + lo, side='left')
+    return np.maximum(counts, 0)
+
+def _two_point_prior(yth, rs, lo):
+    """
+    The 'T2' prior of every sampled time point rs, with memory yth[lo:rs-1].
+
+    With memory M of length L, the occurrences of the last symbol a = yth[rs-2]
+    in M[1:L-1] are taken in order; the k-th of them, at M[j+1], counts if it
+    follows the symbol before it, M[j] == yth[rs-3], and matches if, also,
+    M[k+2] == yth[rs-1]. The prior is the fraction of counted occurrences that
+    match. The occurrences of all time points are handled at once, per symbol.
+    """
+    a, b, c = yth[rs-2], yth[rs-3], yth[rs-1]
+    p = np.zeros(len(rs))
+    valid = lo >= 0 # a memory starting at index -1 is empty
+    for symbol in np.unique(a[valid]):
+        sel = np.nonzero(valid & (a == symbol))[0]
+        positions = np.nonzero(yth == symbol)[0]
+        # the occurrences of the symbol in M[1:L-1], i.e., at yth[lo+1], ..., yth[rs-3]
+        start = np.searchsorted(positions, lo[sel] + 1)
+        n = np.searchsorted(positions, rs[sel] - 3, side='right') - start
+        n = np.maximum(n, 0)
+        # (time point, rank) of each occurrence
+        owner = np.repeat(np.arange(len(sel)), n)
+        rank = np.arange(np.sum(n)) - np.repeat(np.cumsum(n) - n, n)
+        counted = yth[positions[start[owner] + rank] - 1] == b[sel][owner]
+        matched = counted & (yth[lo[sel][owner] + rank + 2] == c[sel][owner])
+        numCounted = np.bincount(owner, weights=counted, minlength=len(sel))
+        numMatched = np.bincount(owner, weights=matched, minlength=len(sel))
+        p[sel] = np.where(numCounted > 0, numMatched/np.maximum(numCounted, 1), 0)
+    return p
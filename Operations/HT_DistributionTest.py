@@ -1,6 +1,4 @@
 import numpy as np
-from scipy import stats
-from scipy.stats import norm, genextreme, uniform, beta, rayleigh, expon, gamma, lognorm, weibull_min
 
 def HT_DistributionTest(x, theTest, theDistn, numBins):
     """
@@ -31,6 +29,8 @@ def HT_DistributionTest(x, theTest, theDistn, numBins):
     float: p-value of the hypothesis test
 
     """
+    from scipy import stats
+    from scipy.stats import norm, genextreme, uniform, beta, rayleigh, expon, gamma, lognorm, weibull_min
 
     # First fit the distribution:
     if theDistn == 'norm':
@@ -1,6 +1,4 @@
 import numpy as np
-import jpype as jp
-from scipy import stats
 from Operations.IN_Initialize_MI import IN_Initialize_MI
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 
@@ -28,6 +26,8 @@ def IN_AutoMutualInfo(y, timeDelay=1, estMethod='kernel', extraParam=None):
     out : float or dict
         Automutual information value(s)
     """
+    import jpype as jp
+    from scipy import stats
 
     if isinstance(timeDelay, str) and timeDelay in ['ac', 'tau']:
         timeDelay = CO_FirstCrossing(y, corr_fun='ac', threshold=0, what_out='discrete')
@@ -81,3 +81,38 @@ def IN_AutoMutualInfo(y, timeDelay=1, estMethod='kernel', extraParam=None):
     else:
         # return a dict for multiple time delays
         return {f"ami{delay}": ami for delay, ami in zip(timeDelay, amis)}
+
+def _batch_auto_mutual_info(Y, timeDelay, estMethod='kernel', extraParam=None):
+    """
+    Automutual information at a single time delay for each row of Y.
+
+    The 'gaussian' estimate is computed for all rows at once; the JIDT
+    estimators share a single calculator object across the rows.
+    """
+    Y = np.asarray(Y, dtype=float)
+    numRows, N = Y.shape
+    minSamples = 5
+    amis = np.full(numRows, np.nan)
+    if timeDelay > N - minSamples:
+        # time series too short
+        return amis
+
+    Y1 = Y[:, :-timeDelay]
+    Y2 = Y[:, timeDelay:]
+
+    if estMethod == 'gaussian':
+        # Pearson correlation of each pair of rows
+        Y1 = Y1 - np.mean(Y1, axis=1, keepdims=True)
+        Y2 = Y2 - np.mean(Y2, axis=1, keepdims=True)
+        r = np.sum(Y1*Y2, axis=1) / np.sqrt(np.sum(Y1**2, axis=1) * np.sum(Y2**2, axis=1))
+        r = np.clip(r, -1, 1)
+        amis = -0.5*np.log(1 - r**2)
+    else:
+        import jpype as jp
+        miCalc = IN_Initialize_MI(estMethod, extraParam=extraParam, addNoise=False) # NO ADDED NOISE!
+        for k in range(numRows):
+            miCalc.initialise(1, 1)
+            miCalc.setObservations(jp.JArray(jp.JDouble)(Y1[k]), jp.JArray(jp.JDouble)(Y2[k]))
+            amis[k] = miCalc.computeAverageLocalOfObservations()
+
+    return amis
@@ -2,7 +2,6 @@ from PeripheryFunctions.BF_SignChange import BF_SignChange
 from Operations.CO_AutoCorr import CO_AutoCorr
 from Operations.IN_AutoMutualInfo import IN_AutoMutualInfo
 import numpy as np
-from scipy import stats
 
 def IN_AutoMutualInfoStats(y, maxTau=None, estMethod='kernel', extraParam=None):
     """
@@ -19,6 +18,7 @@ def IN_AutoMutualInfoStats(y, maxTau=None, estMethod='kernel', extraParam=None):
     --------
     out (dict) : a dictionary containing statistics on the AMIs and their pattern across the range of specified time delays.
     """
+    from scipy import stats
 
     N = len(y) # length of the time series
     
@@ -1,4 +1,3 @@
-import jpype as jp
 import os
 import logging
 import warnings
@@ -25,6 +24,7 @@ def IN_Initialize_MI(estMethod, extraParam=None, addNoise=False):
     miCalc : object
         An initialized mutual information calculator object based on the specified estimation method.
     """
+    import jpype as jp
 
     # Check to see whether a jpype JVM has been started.
     if not jp.isJVMStarted():
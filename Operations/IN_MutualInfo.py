@@ -1,5 +1,4 @@
 from Operations.IN_Initialize_MI import IN_Initialize_MI
-import jpype as jp
 
 def IN_MutualInfo(y1, y2, estMethod = 'kernel', extraParam = None):
     """
@@ -27,6 +26,7 @@ def IN_MutualInfo(y1, y2, estMethod = 'kernel', extraParam = None):
     float
         The estimated mutual information between the two input time series.
     """
+    import jpype as jp
     # Initialize miCalc object (don't add noise!):
     miCalc = IN_Initialize_MI(estMethod=estMethod, extraParam=extraParam, addNoise=False)
     # Set observations to two time series:
@@ -1,11 +1,12 @@
 import numpy as np
 import math
-from scipy.fft import fft
-from scipy import signal
+from Operations.MD_pNN import MD_pNN
 
 def MD_hrv_classic(y):
     """
     """
+    from scipy.fft import fft
+    from scipy import signal
 
     # Standard defaults
     diffy = np.diff(y)
@@ -16,16 +17,9 @@ def MD_hrv_classic(y):
     # ------------------------------------------------------------------------------
     # pNNx: recommendation as per Mietus et. al. 2002, "The pNNx files: ...", Heart
     # strange to do this for a z-scored time series...
-    Dy = np.abs(diffy)
-    PNNxfn = lambda x : np.mean(Dy > x/1000)
-
-    out = {}
-
-    out['pnn5'] = PNNxfn(5) # 0.0055*sigma
-    out['pnn10'] = PNNxfn(10) # 0.01*sigma
-    out['pnn20'] = PNNxfn(20) # 0.02*sigma
-    out['pnn30'] = PNNxfn(30) # 0.03*sigma
-    out['pnn40'] = PNNxfn(40) # 0.04*sigma
+    # (from a single sort of the successive differences; MD_pNN takes the
+    # thresholds in milliseconds, i.e., |diff(y)| > x/1000)
+    out = MD_pNN(y, pnns=[5, 10, 20, 30, 40]) # pnn5 ~ 0.0055*sigma, pnn10 ~ 0.01*sigma, ..., pnn40 ~ 0.04*sigma
 
     # ------------------------------------------------------------------------------
     # Calculate PSD
@@ -1,6 +1,6 @@
 import numpy as np
 
-def MD_pNN(x):
+def MD_pNN(x, pnns = None):
     """
     MD_pNN: pNNx measures of heart rate variability.
 
@@ -13,24 +13,42 @@ def MD_pNN(x):
 
     Parameters:
     -----------
-    x (array-like): Input time series.
+    x (array-like): Input time series, or a 2D array of equal-length time series (one per row).
+    pnns (array-like, optional): The thresholds x (in milliseconds) of the pNNx measures
+                                 (default: 5, 10, 20, ..., 100).
 
     Returns:
     --------
-    dict: A dictionary containing the pNNx measures.
+    dict: A dictionary containing the pNNx measures (a list of dicts, one per time series, if x is 2D).
     """
+    x = np.asarray(x, dtype=float)
+    isBatch = x.ndim == 2
+    X = np.atleast_2d(x)
+    numSeries, N = X.shape
 
-    diffx = np.diff(x)
-    N = len(x)
+    if pnns is None:
+        pnns = np.array([5, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100])
+    pnns = np.asarray(pnns)
 
     # Calculate pNNx percentage
-
-    Dx = np.abs(diffx) * 1000 # assume milliseconds as for RR intervals
-    pnns = np.array([5, 10, 20, 30, 40, 50, 60, 70, 80, 90, 100])
-
-    out = {} # dict used for output in place of MATLAB struct
-
-    for x in pnns:
-        out["pnn" + str(x) ] = sum(Dx > x) / (N-1)
-
-    return out
+    Dx = np.abs(np.diff(X, axis=1)) * 1000 # assume milliseconds as for RR intervals
+
+    # Sort the successive differences once, then count those exceeding every threshold
+    # with a single searchsorted. Complex numbers order lexicographically, so (row, value)
+    # keys let one search count within each row.
+    rows = np.arange(numSeries)[:, np.newaxis]
+    sortedKeys = (rows + 1j*np.sort(Dx, axis=1)).ravel()
+    numBelow = np.searchsorted(sortedKeys, (rows + 1j*pnns).ravel(), side='right').reshape(numSeries, len(pnns))
+    numExceeding = (rows + 1)*(N - 1) - numBelow
+
+    outs = []
+    for counts in numExceeding:
+        out = {} # dict used for output in place of MATLAB struct
+        for pnn, count in zip(pnns, counts):
+            out["pnn" + str(pnn)] = count / (N-1)
+        outs.append(out)
+
+    if isBatch:
+        return outs
+    else:
+        return outs[0]
@@ -1,4 +1,5 @@
 import numpy as np
+from PeripheryFunctions.BF_RunLengths import BF_RunLengths
 
 def MD_polvar(x, d = 1, D = 6):
     """
@@ -39,22 +40,15 @@ def MD_polvar(x, d = 1, D = 6):
 
     # binary representation of time series based on consecutive changes being greater than d/1000...
     xsym = dx >= d # consec. diffs exceed some threshold, d
-    zseq = np.zeros(D)
-    oseq = np.ones(D)
 
     # search for D consecutive zeros/ones
-    i = 1
-    pc = 0
-
-    # seqcnt = 0
-    while i <= (N-D):
-        xseq = xsym[i:(i+D)]
-        if (np.sum(xseq == zseq) == D) or (np.sum(xseq == oseq) == D):
-            pc += 1
-            i += D
-        else:
-            i += 1
-    
+    # Scanning from i = 1, a word at i that is all zeros or all ones is counted and
+    # skipped, otherwise the scan moves on by one. A counted word lies within a run
+    # of identical symbols and the scan enters every run at its start, so each run
+    # of length L contributes floor(L/D) words.
+    _, runLengths = BF_RunLengths(xsym[1:])
+    pc = int(np.sum(runLengths // D))
+
     p = pc / N
 
-    return p 
+    return p
@@ -1,4 +1,5 @@
 import numpy as np
+from PeripheryFunctions.BF_Histogram import BF_Histogram
 
 def MD_rawHRVmeas(x):
     """
@@ -28,12 +29,12 @@ def MD_rawHRVmeas(x):
     out = {}
 
     # triangular histogram index
-    hist_counts10, _ = np.histogram(x, 10)
+    # (the three histograms are counted from a single sort of x)
+    # MATLAB histcounts returns wrong number of bins for sqrt rule. This should be the correct num of bins...
+    histograms = BF_Histogram(x, [10, 20, int(np.ceil(np.sqrt(N)))])
+    hist_counts10, hist_counts20, hist_counts_sqrt = [counts for counts, _ in histograms]
     out['tri10'] = N/np.max(hist_counts10)
-    hist_counts20, _ = np.histogram(x, 20)
     out['tri20'] = N/np.max(hist_counts20)
-    # MATLAB histcounts returns wrong number of bins for sqrt rule. This should be the correct num of bins...
-    hist_counts_sqrt, _ = np.histogram(x, bins=int(np.ceil(np.sqrt(N))))
     out['trisqrt'] = N/np.max(hist_counts_sqrt)
 
     # Poincare plot measures
@@ -1,4 +1,5 @@
 import numpy as np
+from Utils.kernels import kernel
 from Operations.CO_AutoCorr import CO_AutoCorr
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 
@@ -14,51 +15,54 @@ def PH_ForcePotential(y, whatPotential = 'dblwell', params = None):
                           'dblwell' (a double well potential function) or
                           'sine' (a sinusoidal potential function).
     params (list): The parameters for simulation, should be in the form:
-                   [alpha, kappa, deltat]
+                   [alpha, kappa, deltat]. A list of such parameter lists
+                   simulates every parameter set together in a single pass.
 
     Returns:
     dict: Statistics summarizing the trajectory of the simulated particle.
+          If a list of parameter sets is given, a list with one output per set.
     """
+    if whatPotential not in ['dblwell', 'sine']:
+        raise ValueError(f"Unknown potential function {whatPotential}")
+
     if params is None:
         if whatPotential == 'dblwell':
             params = [2, 0.1, 0.1]
-        elif whatPotential == 'sine':
-            params = [1, 1, 1]
         else:
-            ValueError(f"Unknown system {whatPotential}")
-    else:
+            params = [1, 1, 1]
+    elif not isinstance(params, list):
         # check params
-        if not isinstance(params, list):
-            raise ValueError("Expected list of parameters.")
-        else:
-            if len(params) != 3:
-                raise ValueError("Expected 3 parameters.")
-    
+        raise ValueError("Expected list of parameters.")
+
+    # a single parameter set is simulated as a batch of one
+    isBatch = len(params) > 0 and all(isinstance(p, (list, tuple)) for p in params)
+    paramSets = np.array(params if isBatch else [params], dtype=float)
+    if paramSets.ndim != 2 or paramSets.shape[1] != 3:
+        raise ValueError("Expected 3 parameters.")
+
+    y = np.ascontiguousarray(y, dtype=float)
     N = len(y) # length of the time series
 
-    alpha, kappa, deltat = params
+    alphas, kappas, deltats = np.ascontiguousarray(paramSets.T)
 
-    # specify potential function
-    if whatPotential == 'sine':
-        V = lambda x, alpha : -np.cos(x/alpha)
-        F = lambda x, alpha : np.sin(x/alpha)/alpha
-    elif whatPotential == 'dblwell':
-        F = lambda x: -x**3 + alpha**2 * x
-        V = lambda x: x**4 / 4 - alpha**2 * x**2 / 2
-    else:
-        raise ValueError(f"Unknown potential function {whatPotential}")
-    
-    x = np.zeros(N) # position
-    v = np.zeros(N) # velocity
+    # integrate the trajectories for all parameter sets (compiled)
+    X = _simulate_force_potential(y, alphas, kappas, deltats, whatPotential == 'sine')
 
-    for i in range(1, N):
-        x[i] = x[i-1] + v[i-1]*deltat + (F(x[i-1]) + y[i-1] - kappa*v[i-1])*deltat**2
-        v[i] = v[i-1] + (F(x[i-1]) + y[i-1] - kappa*v[i-1])*deltat
+    outs = [_trajectory_stats(X[k], alphas[k], whatPotential, N) for k in range(len(paramSets))]
 
+    if isBatch:
+        return outs
+    else:
+        return outs[0]
+
+def _trajectory_stats(x, alpha, whatPotential, N):
+    """
+    Summary statistics of a single simulated particle trajectory.
+    """
     # check the trajectory didn't blow out
     if np.isnan(x[-1]) or np.abs(x[-1]) > 1E10:
-        return np.NaN
-    
+        return np.nan
+
     # Output some basic features of the trajectory
     out = {}
     out['mean'] = np.mean(x) # mean position
@@ -79,3 +83,32 @@ def PH_ForcePotential(y, whatPotential = 'dblwell', params = None):
         out['pcrossdown'] = np.sum((x[:-1] + alpha) * (x[1:] + alpha) < 0) / (N - 1)
 
     return out
+
+@kernel('float64[:, ::1](float64[::1], float64[::1], float64[::1], float64[::1], boolean)')
+def _simulate_force_potential(y, alphas, kappas, deltats, isSine):
+    """
+    Position of a particle forced by y in the potential well, for each
+    parameter set (alpha, kappa, deltat). Returns a (numSets, N) array.
+    """
+    N = len(y)
+    numSets = len(alphas)
+    X = np.zeros((numSets, N)) # position
+
+    for k in range(numSets):
+        alpha = alphas[k]
+        kappa = kappas[k]
+        deltat = deltats[k]
+        x = 0.0
+        v = 0.0 # velocity
+        for i in range(1, N):
+            # force from the potential, V = -cos(x/alpha) or V = x^4/4 - alpha^2 x^2/2
+            # (float exponents go through pow, as in the uncompiled recurrence)
+            if isSine:
+                F = np.sin(x/alpha)/alpha
+            else:
+                F = -x**3.0 + alpha**2.0 * x
+            acc = F + y[i-1] - kappa*v
+            x, v = x + v*deltat + acc*deltat**2.0, v + acc*deltat
+            X[k, i] = x
+
+    return X
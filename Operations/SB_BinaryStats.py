@@ -1,5 +1,6 @@
 import numpy as np
 from PeripheryFunctions.BF_Binarize import BF_Binarize
+from PeripheryFunctions.BF_RunLengths import BF_RunLengths
 
 def SB_BinaryStats(y, binaryMethod = 'diff'):
     """
@@ -12,22 +13,48 @@ def SB_BinaryStats(y, binaryMethod = 'diff'):
     -----------
     y : array_like
         The input time series.
-    binary_method : str, optional
-        The symbolization rule:
+    binaryMethod : str or list of str, optional
+        The symbolization rule (a list of rules gives the statistics for each):
         'diff': by whether incremental differences of the time series are
                 positive (1), or negative (0),
         'mean': by whether each point is above (1) or below the mean (0)
+        'median': by whether each point is above (1) or below the median (0)
         'iqr': by whether the time series is within the interquartile range
                (1), or not (0).
 
     Returns:
     --------
     dict
-        A dictionary containing various statistics on the binary symbolization.
+        A dictionary containing various statistics on the binary symbolization
+        (a list of dicts, one per rule, if binaryMethod is a list).
     """
     
+    isMultiple = isinstance(binaryMethod, list)
+    methods = binaryMethod if isMultiple else [binaryMethod]
+
     # Binarize the time series
-    yBin = BF_Binarize(y, binarizeHow=binaryMethod)
+    yBins = [BF_Binarize(y, binarizeHow=method) for method in methods]
+
+    # Consecutive strings of ones/zeros, for all binarizations from one run-length encoding
+    # (coding each binarization as 2*i + bit, so that no run spans two binarizations)
+    codes = np.concatenate([2*i + yBin for i, yBin in enumerate(yBins)]).astype(np.int64)
+    runCodes, runLengths = BF_RunLengths(codes)
+
+    # (the runs of each binarization are contiguous)
+    bounds = np.searchsorted(runCodes // 2, np.arange(len(yBins) + 1))
+    outs = []
+    for i, yBin in enumerate(yBins):
+        runs = slice(bounds[i], bounds[i+1])
+        outs.append(_binary_stats(yBin, runCodes[runs] % 2, runLengths[runs]))
+
+    if isMultiple:
+        return outs
+    return outs[0]
+
+def _binary_stats(yBin, runValues, runLengths):
+    """
+    Statistics on a binary symbolization, yBin, with the given runs of 0s and 1s.
+    """
     N = len(yBin)
 
     # Stationarity of binarised time series
@@ -35,11 +62,8 @@ def SB_BinaryStats(y, binaryMethod = 'diff'):
     out['pupstat2'] = np.sum(yBin[N//2:] == 1) / np.sum(yBin[:N//2] == 1)
 
     # Consecutive strings of ones/zeros (normalized by length)
-    diff_y = np.diff(np.where(np.concatenate(([1], yBin, [1])))[0])
-    stretch0 = diff_y[diff_y != 1] - 1
-
-    diff_y = np.diff(np.where(np.concatenate(([0], yBin, [0])) == 0)[0])
-    stretch1 = diff_y[diff_y != 1] - 1
+    stretch0 = runLengths[runValues == 0]
+    stretch1 = runLengths[runValues == 1]
 
     # pstretches
     # Number of different stretches as proportion of the time-series length
@@ -1,5 +1,5 @@
 import numpy as np
-from PeripheryFunctions.BF_SignChange import BF_SignChange
+from PeripheryFunctions.BF_RunLengths import BF_RunLengths
 
 
 def SB_BinaryStretch(x, stretchWhat = 'lseq1'):
@@ -34,17 +34,29 @@ def SB_BinaryStretch(x, stretchWhat = 'lseq1'):
 
     if stretchWhat == 'lseq1':
         # longest stretch of 1s [this code doesn't actualy measure this!]
-        indices = np.where(x == 1)[0]
-        diffs = np.diff(indices) - 1.5
-        sign_changes = BF_SignChange(diffs, 1)
-        out = np.max(np.diff(sign_changes)) / N
+        symbol = 1
     elif stretchWhat == 'lseq0':
         # longest stretch of 0s [this code doesn't actualy measure this!]
-        indices = np.where(x == 0)[0]
-        diffs = np.diff(indices) - 1.5
-        sign_changes = BF_SignChange(diffs, 1)
-        out = np.max(np.diff(sign_changes)) / N
+        symbol = 0
     else:
         raise ValueError(f"Unknown input {stretchWhat}")
-    
+
+    # The original computes sign changes of diff(indices of the symbol) - 1.5: the
+    # gaps between consecutive occurrences are 1 within a run (L - 1 of them for a run
+    # of length L) and > 1 between runs. The measure is the longest stretch of gaps of
+    # the same kind between two sign changes, i.e., excluding the first and last stretch.
+    runValues, runLengths = BF_RunLengths(x)
+    symbolRuns = runLengths[runValues == symbol]
+    gapIsLong = np.zeros(2*len(symbolRuns) - 1 if len(symbolRuns) else 0, dtype=int)
+    gapIsLong[1::2] = 1
+    gapCounts = np.zeros(len(gapIsLong), dtype=int)
+    gapCounts[::2] = symbolRuns - 1 # unit gaps within each run
+    gapCounts[1::2] = 1 # one long gap between consecutive runs
+    gapIsLong, gapCounts = gapIsLong[gapCounts > 0], gapCounts[gapCounts > 0]
+    # stretches of gaps of the same kind
+    _, kindRunLengths = BF_RunLengths(gapIsLong)
+    stretchStarts = np.cumsum(kindRunLengths) - kindRunLengths
+    stretches = np.add.reduceat(gapCounts, stretchStarts) if len(stretchStarts) else gapCounts
+    out = np.max(stretches[1:-1]) / N
+
     return out if out is not None else 0
@@ -1,4 +1,3 @@
-import scipy
 import numpy as np
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 from Operations.SB_CoarseGrain import SB_CoarseGrain
@@ -39,6 +38,7 @@ def SB_TransitionMatrix(y, howtocg = 'quantile', numGroups = 2, tau = 1):
         of the transition matrix, measures of asymmetry, and eigenvalues of the
         transition matrix.
     """
+    import scipy
     # check inputs
     if numGroups < 2:
         raise ValueError("Too few groups for coarse-graining")
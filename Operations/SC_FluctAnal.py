@@ -1,12 +1,12 @@
 import numpy as np
 from Operations.CO_AutoCorr import CO_AutoCorr
+from PeripheryFunctions.BF_Buffer import BF_Buffer
 from warnings import warn
-from scipy.interpolate import CubicSpline
-import statsmodels.api as sm
 
 def SC_FluctAnal(x, q = 2, wtf = 'rsrange', tauStep = 1, k = 1, lag = None, logInc = True):
     """
     """
+    from scipy.interpolate import CubicSpline
 
     N = len(x) # time series length
 
@@ -47,9 +47,11 @@ def SC_FluctAnal(x, q = 2, wtf = 'rsrange', tauStep = 1, k = 1, lag = None, logI
     for i in range(ntau):
         # buffer the time series at the scale tau
         tau = taur[i]
-        y_buff = _buffer(y, tau)
-        if y_buff.shape[1] > int(np.floor(N/tau)): # zero-padded, remove trailing set of pts...
-            y_buff = y_buff[:, :-1]
+        # (a zero-padded trailing window is only kept if the series was decimated)
+        if int(np.ceil(len(y)/tau)) > int(np.floor(N/tau)):
+            y_buff = BF_Buffer(y, tau, tail='drop').T
+        else:
+            y_buff = BF_Buffer(y, tau, tail='pad').T
 
         # analyzed length of time series (with trailing pts removed)
         nn = y_buff.shape[1] * tau
@@ -67,6 +69,7 @@ def SC_FluctAnal(x, q = 2, wtf = 'rsrange', tauStep = 1, k = 1, lag = None, logI
             y_dt = np.percentile(y_buff, 75, method='hazen', axis=0) - np.percentile(y_buff, 25, method='hazen', axis=0)
         elif wtf == 'dfa':
             tt = np.arange(1, tau + 1)[:, np.newaxis]
+            y_buff = y_buff.copy() # (detrended in place below; y_buff is a view of y)
             for j in range(y_buff.shape[1]):
                 p = np.polyfit(tt.ravel(), y_buff[:, j], k)
                 y_buff[:, j] -= np.polyval(p, tt).ravel()
@@ -76,11 +79,12 @@ def SC_FluctAnal(x, q = 2, wtf = 'rsrange', tauStep = 1, k = 1, lag = None, logI
             # Straight line connects end points of each window:
             b = y_buff[0, :]
             m = y_buff[-1, :] - b
-            y_buff -= (np.linspace(0, 1, tau)[:, np.newaxis] * m + b)
+            y_buff = y_buff - (np.linspace(0, 1, tau)[:, np.newaxis] * m + b)
             y_dt = np.ptp(y_buff, axis=0)
         elif wtf == 'rsrangefit':
             # polynomial fit (order k) rather than endpoints fit: (~DFA)
             tt = np.arange(1, tau + 1)[:, np.newaxis]
+            y_buff = y_buff.copy()
             for j in range(y_buff.shape[1]):
                 p = np.polyfit(tt.ravel(), y_buff[:, j], k)
                 y_buff[:, j] -= np.polyval(p, tt).ravel()
@@ -166,6 +170,7 @@ def doRobustLinearFit(out, logtt, logFF, theRange, fieldName):
     Get robust linear fit statistics on scaling range
     Adds fields to the output structure
     """
+    import statsmodels.api as sm
     if len(theRange) < 8 or np.all(np.isnan(logFF[theRange])):
         out[f'{fieldName}linfitint'] = np.nan
         out[f'{fieldName}alpha'] = np.nan
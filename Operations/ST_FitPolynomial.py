@@ -1,4 +1,5 @@
 import numpy as np
+from PeripheryFunctions.BF_PolyTrend import BF_PolyTrend
 
 def ST_FitPolynomial(y, k = 1):
     """
@@ -10,21 +11,25 @@ def ST_FitPolynomial(y, k = 1):
     Parameters:
     -----------
     y : array_like
-        the time series to analyze.
-    k : int, optional
-        the order of the polynomial to fit to y.
+        the time series to analyze, or a 2D array of equal-length time series (one per row).
+    k : int or list of int, optional
+        the order of the polynomial to fit to y. All orders in a list are fitted
+        together, from a single projection of y onto an orthogonal polynomial basis.
 
     Returns:
     --------
     out : float
-        RMS error of the fit
+        RMS error of the fit (a list with one value per order if k is a list,
+        with one value per time series if y is 2D)
     """
-    N = len(y)
-    t = np.arange(1, N + 1)
+    y = np.asarray(y, dtype=float)
+    N = y.shape[-1]
+    orders = np.atleast_1d(k).astype(int)
 
-    # Fit a polynomial to the time series
-    cf = np.polyfit(t, y, k)
-    f = np.polyval(cf, t) # evaluate the fitted poly
-    out = np.mean((y - f)**2) # mean RMS error of fit
+    # Fit polynomials of all orders to the time series (against t = 1, ..., N)
+    rss = BF_PolyTrend(y, np.max(orders))['rss']
+    outs = [rss[..., order] / N for order in orders] # mean RMS error of fit
 
-    return out
+    if np.ndim(k) == 0:
+        return outs[0]
+    return outs
@@ -1,6 +1,7 @@
 import numpy as np
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 from Operations.ST_SimpleStats import ST_SimpleStats
+from PeripheryFunctions.BF_Buffer import BF_Buffer
 
 def ST_LocalExrema(y, howToWindow = 'l', n = None):
     """
@@ -46,10 +47,10 @@ def ST_LocalExrema(y, howToWindow = 'l', n = None):
     
     if (windowLength > N) or (windowLength <= 1):
         # This feature is unsuitable if the window length exceeds ts
-        out = np.NaN
+        out = np.nan
     
     # Buffer the time series
-    y_buff = _buffer(y, windowLength) # no overlap
+    y_buff = BF_Buffer(y, windowLength, tail='pad').T # no overlap
     # each column is a window of samples
     if np.all(y_buff[:, -1] == 0):
         y_buff = y_buff[:, :-1]  # remove last window if zero-padded
@@ -93,63 +94,3 @@ def ST_LocalExrema(y, howToWindow = 'l', n = None):
 
 
     return out
-
-def _buffer(X, n, p=0, opt=None):
-    '''Mimic MATLAB routine to generate buffer array
-
-    MATLAB docs here: https://se.mathworks.com/help/signal/ref/buffer.html.
-    Taken from: https://stackoverflow.com/questions/38453249/does-numpy-have-a-function-equivalent-to-matlabs-buffer 
-
-    Parameters
-    ----------
-    x: ndarray
-        Signal array
-    n: int
-        Number of data segments
-    p: int
-        Number of values to overlap
-    opt: str
-        Initial condition options. default sets the first `p` values to zero,
-        while 'nodelay' begins filling the buffer immediately.
-
-    Returns
-    -------
-    result : (n,n) ndarray
-        Buffer array created from X
-    '''
-    import numpy as np
-
-    if opt not in [None, 'nodelay']:
-        raise ValueError('{} not implemented'.format(opt))
-
-    i = 0
-    first_iter = True
-    while i < len(X):
-        if first_iter:
-            if opt == 'nodelay':
-                # No zeros at array start
-                result = X[:n]
-                i = n
-            else:
-                # Start with `p` zeros
-                result = np.hstack([np.zeros(p), X[:n-p]])
-                i = n-p
-            # Make 2D array and pivot
-            result = np.expand_dims(result, axis=0).T
-            first_iter = False
-            continue
-
-        # Create next column, add `p` results from last col if given
-        col = X[i:i+(n-p)]
-        if p != 0:
-            col = np.hstack([result[:,-1][-p:], col])
-        i += n-p
-
-        # Append zeros if last row and not length `n`
-        if len(col) < n:
-            col = np.hstack([col, np.zeros(n-len(col))])
-
-        # Combine result with next row
-        result = np.hstack([result, np.expand_dims(col, axis=0).T])
-
-    return result
@@ -1,5 +1,6 @@
 import numpy as np
 from Operations.IN_MutualInfo import IN_MutualInfo
+from PeripheryFunctions.BF_Buffer import BF_Buffer
 
 def ST_MomentCorr(x, windowLength = None, wOverlap = None, mom1 = 'mean', mom2 = 'std', whatTransform = 'none'):
     """
@@ -61,7 +62,7 @@ def ST_MomentCorr(x, windowLength = None, wOverlap = None, mom1 = 'mean', mom2 =
         raise ValueError(f"Unknown transformation {whatTransform}")
     
     # create the windows
-    x_buff = _buffer(x, windowLength, wOverlap)
+    x_buff = BF_Buffer(x, windowLength, wOverlap, tail='pad', delay=True).T
     numWindows = (N/(windowLength - wOverlap)) # number of windows
 
     if np.size(x_buff, 1) > numWindows:
@@ -100,63 +101,3 @@ def SUB_CalcMeMoments(x_buff, momType):
         raise ValueError(f"Unknown statistic {momType}")
     
     return moms
-    
-def _buffer(X, n, p=0, opt=None):
-    '''Mimic MATLAB routine to generate buffer array
-
-    MATLAB docs here: https://se.mathworks.com/help/signal/ref/buffer.html.
-    Taken from: https://stackoverflow.com/questions/38453249/does-numpy-have-a-function-equivalent-to-matlabs-buffer 
-
-    Parameters
-    ----------
-    x: ndarray
-        Signal array
-    n: int
-        Number of data segments
-    p: int
-        Number of values to overlap
-    opt: str
-        Initial condition options. default sets the first `p` values to zero,
-        while 'nodelay' begins filling the buffer immediately.
-
-    Returns
-    -------
-    result : (n,n) ndarray
-        Buffer array created from X
-    '''
-    import numpy as np
-
-    if opt not in [None, 'nodelay']:
-        raise ValueError('{} not implemented'.format(opt))
-
-    i = 0
-    first_iter = True
-    while i < len(X):
-        if first_iter:
-            if opt == 'nodelay':
-                # No zeros at array start
-                result = X[:n]
-                i = n
-            else:
-                # Start with `p` zeros
-                result = np.hstack([np.zeros(p), X[:n-p]])
-                i = n-p
-            # Make 2D array and pivot
-            result = np.expand_dims(result, axis=0).T
-            first_iter = False
-            continue
-
-        # Create next column, add `p` results from last col if given
-        col = X[i:i+(n-p)]
-        if p != 0:
-            col = np.hstack([result[:,-1][-p:], col])
-        i += n-p
-
-        # Append zeros if last row and not length `n`
-        if len(col) < n:
-            col = np.hstack([col, np.zeros(n-len(col))])
-
-        # Combine result with next row
-        result = np.hstack([result, np.expand_dims(col, axis=0).T])
-
-    return result
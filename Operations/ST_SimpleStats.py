@@ -1,7 +1,6 @@
 import numpy as np
 from PeripheryFunctions.BF_SignChange import BF_SignChange
 from PeripheryFunctions.BF_zscore import BF_zscore
-from scipy.signal import detrend
 
 def ST_SimpleStats(x, whatStat):
     """
@@ -30,6 +29,7 @@ def ST_SimpleStats(x, whatStat):
     out : float
         the statistic.
     """
+    from scipy.signal import detrend
 
     N = len(x)
 
@@ -2,7 +2,6 @@ import numpy as np
 from Operations.CO_FirstCrossing import CO_FirstCrossing
 from Operations.CO_AutoCorr import CO_AutoCorr
 from Operations.EN_SampEn import EN_SampEn
-from scipy.stats import skew, kurtosis
 
 def SY_DynWin(y, maxNumSegments = 10):
     """
@@ -29,6 +28,7 @@ def SY_DynWin(y, maxNumSegments = 10):
     out : dict
         the standard deviation of this set of 'stationarity' estimates across these window sizes
     """
+    from scipy.stats import skew, kurtosis
     nsegr = np.arange(2, maxNumSegments+1, 1) # range of nseg to sweep across
     nmov = 1 # controls window overlap
     numFeatures = 11 # num of features
@@ -1,9 +1,5 @@
-from statsmodels.tsa.stattools import kpss
 import numpy as np
-import warnings
-from statsmodels.tools.sm_exceptions import InterpolationWarning
-# temporarily turn off warnings for the test statistic being too big or small
-warnings.simplefilter('ignore', InterpolationWarning)
+from PeripheryFunctions.BF_NeweyWest import BF_NeweyWest
 
 def SY_KPSStest(y, lags = 0):
     """
@@ -15,7 +11,8 @@ def SY_KPSStest(y, lags = 0):
     Kwiatkowski, Denis and Phillips, Peter C. B. and Schmidt, Peter and Shin, Yongcheol
     J. Econometrics, 54(1-3) 159 (2002)
     
-    Uses the function kpss from statsmodels. The null
+    Matches the function kpss from statsmodels (regression='ct'), with the
+    trend regression fitted once for all lags. The null
     hypothesis is that a univariate time series is trend stationary, the
     alternative hypothesis is that it is a non-stationary unit-root process.
     
@@ -40,12 +37,7 @@ def SY_KPSStest(y, lags = 0):
     """
     if isinstance(lags, list):
         # evaluate kpss at multiple lags
-        pValue = np.zeros(len(lags))
-        stat = np.zeros(len(lags))
-        for (i, l) in enumerate(lags):
-            s, pv, _, _ = kpss(y, nlags=l, regression='ct')
-            pValue[i] = pv
-            stat[i] = s
+        stat, pValue = _kpss(y, lags)
         out = {}
         # return stats on outputs
         out['maxpValue'] = np.max(pValue)
@@ -56,10 +48,34 @@ def SY_KPSStest(y, lags = 0):
         out['lagminstat'] = lags[np.argmin(stat)]
     else:
         if isinstance(lags, int):
-            stat, pValue, _, _ = kpss(y, nlags=lags, regression='ct')
+            stat, pValue = _kpss(y, [lags])
             # return the statistic and pvalue
-            out = {'stat': stat, 'pValue': pValue}
+            out = {'stat': stat[0], 'pValue': pValue[0]}
         else:
             raise TypeError("Expected either a single lag (as an int) or list of lags.")
     
     return out
+
+def _kpss(y, lags):
+    """
+    KPSS trend-stationarity statistics and (interpolated) p-values at each lag.
+    """
+    y = np.asarray(y, dtype=float)
+    N = len(y)
+    if np.max(lags) >= N:
+        raise ValueError(f"lags ({np.max(lags)}) must be < number of observations ({N})")
+
+    # residuals from the OLS fit of a linear trend (p. 162 of Kwiatkowski et al.)
+    t = np.arange(1, N + 1) - (N + 1)/2
+    yc = y - np.mean(y)
+    resids = yc - ((t @ yc) / (t @ t)) * t
+
+    eta = np.sum(np.cumsum(resids)**2) / N**2 # eq. 11, p. 165
+    stat = eta / BF_NeweyWest(resids, lags) # eq. 10, p. 164
+
+    # p-values interpolated from the critical values (clipped at 0.01 and 0.1)
+    crit = [0.119, 0.146, 0.176, 0.216]
+    pvals = [0.10, 0.05, 0.025, 0.01]
+    pValue = np.interp(stat, crit, pvals)
+
+    return stat, pValue
@@ -3,7 +3,6 @@ from PeripheryFunctions.BF_iszscored import BF_iszscored
 from Operations.CO_AutoCorr import CO_AutoCorr
 from PeripheryFunctions.PN_sampenc import PN_sampenc
 from warnings import warn
-from scipy.stats import skew, kurtosis
 
 def SY_LocalGlobal(y, subsetHow = 'l', n = None, randomSeed = 0):
     """
@@ -31,6 +30,7 @@ def SY_LocalGlobal(y, subsetHow = 'l', n = None, randomSeed = 0):
         A dictionary containing various statistical measures comparing
         the subset to the full time series.
     """
+    from scipy.stats import skew, kurtosis
     # check input time series is z-scored
     if not BF_iszscored(y):
         warn(f"The input time series should be z-scored")
@@ -1,59 +1,96 @@
 import numpy as np
-from arch.unitroot import PhillipsPerron
+from PeripheryFunctions.BF_NeweyWest import BF_NeweyWest
 
 def SY_PPtest(y, lags = range(0, 6)):
     """
-    Gives differing outputs for p-value related features compared to MATLAB, 
+    Phillips-Perron unit root test (no trend components), as in arch.unitroot.PhillipsPerron.
+
+    The test regression is fitted once, and the test statistic and p-value at
+    each lag differ only through the Newey-West long-run variance of its residuals.
+
+    Gives differing outputs for p-value related features compared to MATLAB,
     however, all of the stats and model selection related features align well.
     """
+    # mackinnonp is not exported by arch.unitroot; it is the p-value function
+    # that arch's own unit-root tests use (arch.unitroot.unitroot)
+    from arch.unitroot.unitroot import mackinnonp
     if isinstance(lags, range):
         # evaluate test statistic at each lag
-        models = []
-        for l in lags:
-            pp = PhillipsPerron(y, lags=l, trend='n')
-            models.append(pp)
+        reg = _pp_regression(y)
+        stats = _pp_stat(reg, list(lags))
         # extract output summaries
-        pVals = [models[i].pvalue for i in range(len(models))]
-        stats = [models[i].stat for i in range(len(models))]
-        lls = [models[i].regression.llf for i in range(len(models))]
-        aics = [models[i].regression.aic for i in range(len(models))]
-        bics = [models[i].regression.bic for i in range(len(models))]
-        rmses = np.sqrt([models[i].regression.mse_resid for i in range(len(models))])
-
+        pVals = [mackinnonp(s, regression='n', dist_type='adf-t') for s in stats]
         out = {}
-        # p-value related 
+        # p-value related
         out['maxpValue'] = np.max(pVals)
         out['minpValue'] = np.min(pVals)
         out['meanpValue'] = np.mean(pVals)
         out['stdpValue'] = np.std(pVals, ddof=1)
         out['lagmaxp'] = lags[np.argmax(pVals)]
         out['lagminp'] = lags[np.argmin(pVals)]
-        
+
         # test statistic related
         out['meanstat'] = np.mean(stats)
         out['maxstat'] = np.max(stats)
         out['minstat'] = np.min(stats)
 
-        out['meanloglikelihood'] = np.mean(lls)
-        out['minAIC'] = np.min(aics)
-        out['minBIC'] = np.min(bics)
+        # (the regression, and so its fit statistics, is the same for every lag)
+        out['meanloglikelihood'] = reg['llf']
+        out['minAIC'] = reg['aic']
+        out['minBIC'] = reg['bic']
         # No HQC available in arch
-        
-        out['minrmse'] = np.min(rmses)
-        out['maxrmse'] = np.max(rmses)
+
+        out['minrmse'] = np.sqrt(reg['mse_resid'])
+        out['maxrmse'] = out['minrmse']
 
     elif isinstance(lags, int):
         # evaluate test statistic at a single lag
-        pp = PhillipsPerron(y, lags=lags, trend='n') # no trend components
+        reg = _pp_regression(y) # no trend components
+        stat = _pp_stat(reg, lags)
         out = {}
-        out['pvalue'] = pp.pvalue
-        out['stat'] = pp.stat
-        out['coeff1'] = pp.regression.params.values[0]
-        out['loglikelihood'] = pp.regression.llf
-        out['AIC'] = pp.regression.aic
-        out['BIC'] = pp.regression.bic
-        out['rmse'] = np.sqrt(pp.regression.mse_resid)
+        out['pvalue'] = mackinnonp(stat, regression='n', dist_type='adf-t')
+        out['stat'] = stat
+        out['coeff1'] = reg['rho']
+        out['loglikelihood'] = reg['llf']
+        out['AIC'] = reg['aic']
+        out['BIC'] = reg['bic']
+        out['rmse'] = np.sqrt(reg['mse_resid'])
     else:
         raise TypeError(f"Invalid type: {lags}. Pass in either a range of lags, or a single lag as an int.")
 
     return out
+
+def _pp_regression(y):
+    """
+    OLS fit of y[t] on y[t-1] (no constant), the regression underlying the test.
+    """
+    y = np.asarray(y, dtype=float)
+    x = y[:-1]
+    rho = (x @ y[1:]) / (x @ x)
+    u = y[1:] - rho*x # residuals
+    n = len(u)
+    k = 1 # number of regressors
+    ssr = u @ u
+    llf = -n/2*np.log(2*np.pi) - n/2*np.log(ssr/n) - n/2
+
+    return {'rho': rho, 'resid': u, 'nobs': n, 'sxx': x @ x, 'mse_resid': ssr/(n - k),
+            'llf': llf, 'aic': -2*llf + 2*k, 'bic': -2*llf + np.log(n)*k}
+
+def _pp_stat(reg, lags):
+    """
+    Phillips-Perron Z-tau statistic at each lag, from a fitted _pp_regression.
+    """
+    n, u = reg['nobs'], reg['resid']
+    if n < np.max(lags):
+        raise ValueError(f"The number of observations {n} is less than the number of lags in the "
+                         f"long-run covariance estimator, {np.max(lags)}.")
+    lam2 = BF_NeweyWest(u, lags)
+    lam = np.sqrt(lam2)
+    s2 = reg['mse_resid']
+    s = np.sqrt(s2)
+    gamma0 = s2 * (n - 1) / n
+    sigma = np.sqrt(s2 / reg['sxx']) # standard error of rho
+    if sigma <= 0:
+        raise ValueError("The estimated variance of the coefficient in the Phillips-Perron regression is 0.")
+
+    return np.sqrt(gamma0 / lam2) * ((reg['rho'] - 1) / sigma) - 0.5 * ((lam2 - gamma0) / lam) * (n * sigma / s)
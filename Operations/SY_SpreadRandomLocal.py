@@ -3,7 +3,6 @@ from Operations.CO_FirstCrossing import CO_FirstCrossing
 from Operations.EN_SampEn import EN_SampEn
 from Operations.CO_AutoCorr import CO_AutoCorr
 import warnings
-from scipy import stats
 
 def SY_SpreadRandomLocal(y, l = 100, numSegs = 100, randomSeed = 0):
     """
@@ -35,6 +34,7 @@ def SY_SpreadRandomLocal(y, l = 100, numSegs = 100, randomSeed = 0):
 
     Note: Function is very slow to compute due to reliance on the EN_SampEn function.
     """
+    from scipy import stats
     if isinstance(l, str):
         taug = CO_FirstCrossing(y, 'ac', 0, 'discrete')
         if l == 'ac2':
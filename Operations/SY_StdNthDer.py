@@ -13,19 +13,41 @@ def SY_StdNthDer(y, n = 2):
     -----------
     y : array-like
         the input time series
-    n : int, optional
-        the order of derivative to analyse
+    n : int or list of int, optional
+        the order of derivative to analyse. All orders in a list are computed
+        in a single sweep of successive differences.
 
     Returns:
     --------
     out : float
-        the std of the nth derivative of the time series
+        the std of the nth derivative of the time series (a list with one
+        value per order if n is a list)
     """
+    orders = np.atleast_1d(n).astype(int)
+    stds = _std_nth_ders(y, np.max(orders))
+    outs = [stds[order - 1] for order in orders]
 
+    if np.ndim(n) == 0:
+        return outs[0]
+    return outs
+
+def _std_nth_ders(y, maxOrder):
+    """
+    Standard deviations of the 1st, ..., maxOrder-th derivatives of y.
+
+    Each derivative is the first difference of the previous one (as in
+    np.diff(y, n)), taken in place in a single working buffer.
+    """
     # crude method of taking a derivative that could be improved upon in future...
-    yd = np.diff(y, n=n)
-    if len(yd) == 0:
-        raise ValueError(f"Time series (N = {len(y)}) too short to compute differences at n = {n}")
-    out = np.std(yd, ddof=1)
+    yd = np.array(y, dtype=float)
+    N = len(yd)
+    if N - maxOrder <= 0:
+        raise ValueError(f"Time series (N = {N}) too short to compute differences at n = {maxOrder}")
+
+    stds = np.zeros(maxOrder)
+    for n in range(1, maxOrder + 1):
+        # yd[:N-n] holds the nth derivative after this step
+        np.subtract(yd[1:N-n+1], yd[:N-n], out=yd[:N-n])
+        stds[n-1] = np.std(yd[:N-n], ddof=1)
 
-    return out
+    return stds
@@ -1,6 +1,5 @@
 import numpy as np
-from Operations.SY_StdNthDer import SY_StdNthDer
-from scipy.optimize import curve_fit
+from Operations.SY_StdNthDer import _std_nth_ders
 
 def SY_StdNthDerChange(y, maxd = 10):
     """
@@ -27,18 +26,17 @@ def SY_StdNthDerChange(y, maxd = 10):
 
     Note: Uses degree of freedom adjusted RMSE and R2 to align with MATLAB implementation.
     """
-    ms = np.array([SY_StdNthDer(y, i) for i in range(1, maxd + 1)])
+    # stds of all derivatives in a single sweep of successive differences
+    ms = _std_nth_ders(y, maxd)
     # fit exponential growth/decay
-    # seed the starting point for params a, b
-    p0 = [1, 0.5*np.sign(ms[-1]-ms[0])]
+    x = np.arange(1, maxd + 1)
     expFunc = lambda x, a, b : a * np.exp(b*x)
-    # fit function using nonlinear least squares
-    popt, _ = curve_fit(expFunc, xdata=range(1, maxd+1), ydata=ms, p0=p0, method='lm')
+    popt = _fit_exp(x, ms, expFunc)
     a, b = popt
     out = {}
     out['fexp_a'] = a 
     out['fexp_b'] = b
-    ms_pred = expFunc(range(1, maxd+1), *popt)
+    ms_pred = expFunc(x, *popt)
     res = ms - ms_pred
     ss_res = np.sum(res**2)
     ss_tot = np.sum((ms - np.mean(ms))**2)
@@ -49,3 +47,33 @@ def SY_StdNthDerChange(y, maxd = 10):
     out['fexp_rmse'] = np.sqrt(np.sum(res**2)/(len(ms)-len(popt)))
 
     return out
+
+def _fit_exp(x, ms, expFunc):
+    """
+    Least-squares fit of ms = a*exp(b*x).
+
+    A closed-form estimate from a linear fit to log(ms) (weighted by ms, so
+    that it approximates the least-squares fit on the original scale) is
+    returned if it already satisfies the least-squares optimality conditions;
+    otherwise it seeds nonlinear least squares.
+    """
+    from scipy.optimize import curve_fit
+    if np.all(ms > 0) and np.all(np.isfinite(ms)):
+        b, logA = np.polyfit(x, np.log(ms), 1, w=ms)
+        p0 = [np.exp(logA), b]
+        # accept an (essentially) exact fit, or one at which the gradient of the sum
+        # of squared residuals vanishes (relative to the residuals and the Jacobian)
+        e = np.exp(b*x)
+        res = ms - p0[0]*e
+        jac = np.column_stack((e, p0[0]*x*e))
+        isExact = np.linalg.norm(res) <= 1e-12 * np.linalg.norm(ms)
+        isStationary = np.all(np.abs(jac.T @ res) <= 1e-10 * np.linalg.norm(jac, axis=0) * np.linalg.norm(res))
+        if isExact or isStationary:
+            return np.array(p0)
+    else:
+        # seed the starting point for params a, b
+        p0 = [1, 0.5*np.sign(ms[-1]-ms[0])]
+    # fit function using nonlinear least squares
+    popt, _ = curve_fit(expFunc, xdata=x, ydata=ms, p0=p0, method='lm')
+
+    return popt
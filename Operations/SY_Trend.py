@@ -1,13 +1,13 @@
 import numpy as np
 from PeripheryFunctions.BF_iszscored import BF_iszscored
+from PeripheryFunctions.BF_PolyTrend import BF_PolyTrend
 import warnings
-from scipy.signal import detrend
 
 def SY_Trend(y):
     """
     Quantifies various measures of trend in a time series.
 
-    Linearly detrends the time series using detrend, and returns the ratio of
+    Linearly detrends the time series, and returns the ratio of
     standard deviations before and after the linear detrending. If a strong linear
     trend is present in the time series, this operation should output a low value.
     Also fits a line and gives parameters from that fit, as well as statistics on
@@ -26,26 +26,28 @@ def SY_Trend(y):
     if not BF_iszscored(y):
         warnings.warn('The input time series should be z-scored')
     
+    y = np.asarray(y, dtype=float)
     N = len(y)
 
+    # Linear fits to the time series and its cumulative sum, together
+    # (against t = 1, ..., N: the same xrange as MATLAB with 1 indexing)
+    yC = np.cumsum(y)
+    fits = BF_PolyTrend(np.vstack((y, yC)), 1)
+
     # ratio of std before and after linear detrending
+    # (the detrended series has zero mean, so its variance is rss/(N-1))
     out = {}
-    dt_y = detrend(y)
-    out['stdRatio'] = np.std(dt_y, ddof=1) / np.std(y, ddof=1)
-    
+    out['stdRatio'] = np.sqrt(fits['rss'][0, 1] / (N - 1)) / np.std(y, ddof=1)
+
     # do a linear fit
-    # need to use the same xrange as MATLAB with 1 indexing for correct result
-    coeffs = np.polyfit(range(1, N+1), y, 1)
-    out['gradient'] = coeffs[0]
-    out['intercept'] = coeffs[1]
+    out['gradient'] = fits['gradient'][0]
+    out['intercept'] = fits['intercept'][0]
 
     # Stats on the cumulative sum
-    yC = np.cumsum(y)
     out['meanYC'] = np.mean(yC)
     out['stdYC'] = np.std(yC, ddof=1)
-    coeffs_yC = np.polyfit(range(1, N+1), yC, 1)
-    out['gradientYC'] = coeffs_yC[0]
-    out['interceptYC'] = coeffs_yC[1]
+    out['gradientYC'] = fits['gradient'][1]
+    out['interceptYC'] = fits['intercept'][1]
 
     # Mean cumsum in first and second half of the time series
     out['meanYC12'] = np.mean(yC[:int(np.floor(N/2))])
@@ -0,0 +1,57 @@
+"""
+The operations, loaded lazily: nothing is imported with the package, and each
+operation's module (with the third-party packages it needs) is only imported
+when it is first used.
+
+Operations.DN_Mean is the module Operations/DN_Mean.py, imported on first
+access (as by import Operations.DN_Mean). The functions are in the separate
+namespace Operations.functions, where Operations.functions.DN_Mean imports the
+module on first access and returns its function (also for the modules whose
+function is named differently, e.g., Operations.functions.SSC_MMA).
+"""
+import importlib
+import os
+
+# Modules whose function is named differently
+_functionNames = {
+    'CP_wavelet_varch': 'CP_wavelet_varchg',
+    'EN_ApEn': 'EN_ApEN',
+    'SC_MMA': 'SSC_MMA',
+    'ST_LocalExtrema': 'ST_LocalExrema',
+}
+_moduleNames = {function: module for module, function in _functionNames.items()}
+_directory = os.path.dirname(os.path.abspath(__file__))
+
+def _module_names():
+    return sorted(name[:-3] for name in os.listdir(_directory)
+                  if name.endswith('.py') and not name.startswith('_'))
+
+def _is_module(name):
+    return not name.startswith('_') and os.path.exists(os.path.join(_directory, f'{name}.py'))
+
+def __getattr__(name):
+    if not _is_module(name):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # (importing the submodule binds it to the package, so this is only called once)
+    return importlib.import_module(f'{__name__}.{name}')
+
+def __dir__():
+    return sorted(set(globals()) | set(_module_names()))
+
+class _Functions:
+    """
+    Namespace of the functions of the operations, each imported (with its module)
+    on first access. The functions are looked up in their modules on every access,
+    so that replacing a module's function (e.g., when instrumenting) is seen here.
+    """
+    def __getattr__(self, name):
+        moduleName = _moduleNames.get(name, name)
+        if not _is_module(moduleName):
+            raise AttributeError(f"{__name__}.functions has no attribute {name!r}")
+        module = importlib.import_module(f'{__name__}.{moduleName}')
+        return getattr(module, _functionNames.get(moduleName, moduleName))
+
+    def __dir__(self):
+        return sorted((set(_module_names()) - set(_functionNames)) | set(_moduleNames))
+
+functions = _Functions()
@@ -0,0 +1,69 @@
+import numpy as np
+
+def BF_Buffer(y, windowLength, overlap=0, tail='drop', delay=False):
+    """
+    Windows of a time series, as a strided view rather than a copy.
+
+    With tail='pad' and delay=True, the windows are the same as MATLAB's
+    buffer(y, windowLength, overlap), transposed (one window per row).
+
+    Parameters
+    ----------
+    y : array-like
+        The input time series.
+    windowLength : int
+        The number of samples in each window.
+    overlap : int, optional
+        The number of samples shared by consecutive windows (default 0).
+    tail : str, optional
+        How to handle a final window that runs past the end of the series:
+        'drop': only complete windows are returned (default),
+        'pad': the final window is zero-padded (as in MATLAB's buffer),
+        'split': returns a tuple (windows, remainder), where the remainder
+                 holds the samples not covered by any complete window.
+    delay : bool, optional
+        If True, the series is preceded by `overlap` zeros (the initial
+        condition of MATLAB's buffer). Default False.
+
+    Returns
+    -------
+    windows : ndarray
+        Read-only (numWindows, windowLength) array with one window per row. It is
+        a view of y unless zeros had to be added (tail='pad' or delay=True), in
+        which case it is a view of a single padded copy of y. With tail='split',
+        the remainder is a read-only view too.
+    """
+    y = np.asarray(y)
+    n = int(windowLength)
+    p = int(overlap)
+    step = n - p
+    if n <= 0 or step <= 0:
+        raise ValueError(f"Window length ({n}) must be positive and greater than the overlap ({p})")
+    if tail not in ['drop', 'pad', 'split']:
+        raise ValueError(f"Unknown tail handling '{tail}'")
+
+    if delay and p > 0:
+        y = np.concatenate((np.zeros(p, dtype=y.dtype), y))
+    L = len(y)
+
+    if tail == 'pad':
+        # a window starts at every step that still holds new (not overlapped) samples
+        numWindows = max(1, int(np.ceil((L - p) / step)))
+        paddedLength = (numWindows - 1)*step + n
+        if paddedLength > L:
+            y = np.concatenate((y, np.zeros(paddedLength - L, dtype=y.dtype)))
+    else:
+        numWindows = (L - n)//step + 1 if L >= n else 0
+
+    if numWindows > 0:
+        windows = np.lib.stride_tricks.sliding_window_view(y, n)[::step][:numWindows]
+    else:
+        windows = np.empty((0, n), dtype=y.dtype)
+        windows.flags.writeable = False
+
+    if tail == 'split':
+        # (a read-only view, so that y cannot be modified through it)
+        remainder = y[(numWindows - 1)*step + n:] if numWindows > 0 else y[:]
+        remainder.flags.writeable = False
+        return windows, remainder
+    return windows
@@ -0,0 +1,97 @@
+import numpy as np
+from PeripheryFunctions.BF_SortedValues import BF_SortedValues
+
+def BF_Histogram(y, bins, isSorted = False):
+    """
+    Histograms of a data vector for one or more bin settings, from a single sort.
+
+    Once the data are sorted, the count in every bin of every setting comes from a
+    searchsorted of the bin edges, and the extremes (for equal-width bins) are the
+    first and last sorted values. Counts follow np.histogram: bins are half-open,
+    except the last, which includes its right edge, and values outside the edges
+    are not counted.
+
+    Parameters:
+    -----------
+    y : array-like
+        The data vector.
+    bins : int, numpy.ndarray, or list
+        The bin setting: a number of equal-width bins spanning the range of y (as
+        in np.histogram), or a monotonically increasing array of bin edges. A list
+        of settings (e.g., [10, 20, edges]) gives one histogram per setting.
+    isSorted : bool, optional
+        Whether y is already sorted in ascending order (the sort is then skipped).
+
+    Returns:
+    --------
+    (counts, binEdges) : tuple
+        The counts in each bin and the bin edges (a list of these tuples, one per
+        setting, if bins is a list of settings).
+    """
+    ySorted = np.asarray(y, dtype=float) if isSorted else BF_SortedValues(y)
+
+    isMultiple = isinstance(bins, list)
+    settings = bins if isMultiple else [bins]
+
+    allEdges = [_bin_edges(ySorted, setting) for setting in settings]
+    # one search for the edges of all settings: values >= each edge, except
+    # for the last edge of each setting, which is included in its bin
+    lastEdge = np.cumsum([len(edges) for edges in allEdges]) - 1
+    flatEdges = np.concatenate(allEdges)
+    cumCounts = np.searchsorted(ySorted, flatEdges, side='left')
+    cumCounts[lastEdge] = np.searchsorted(ySorted, flatEdges[lastEdge], side='right')
+    cumCounts = np.split(cumCounts, lastEdge[:-1] + 1)
+
+    histograms = [(np.diff(c), edges) for c, edges in zip(cumCounts, allEdges)]
+    if isMultiple:
+        return histograms
+    return histograms[0]
+
+def _bin_edges(ySorted, bins):
+    """
+    Bin edges for a number of equal-width bins over the range of the sorted data
+    (following np.histogram), or the given edges.
+    """
+    if np.isscalar(bins):
+        numBins = int(bins)
+        if numBins < 1:
+            raise ValueError(f"Number of bins must be positive (got {numBins})")
+        if len(ySorted) == 0:
+            first, last = 0.0, 1.0
+        else:
+            first, last = ySorted[0], ySorted[-1]
+        if not (np.isfinite(first) and np.isfinite(last)):
+            raise ValueError(f"autodetected range of [{first}, {last}] is not finite")
+        if first == last:
+            first, last = first - 0.5, last + 0.5
+        return np.linspace(first, last, numBins + 1)
+
+    edges = np.asarray(bins, dtype=float)
+    if edges.ndim != 1 or len(edges) < 2 or np.any(np.diff(edges) < 0):
+        raise ValueError("Bin edges must be a monotonically increasing array of at least two values")
+    return edges
+
+def _sorted_quantile(ySorted, q, method = 'linear'):
+    """
+    Quantiles of sorted data, directly from its order statistics. Gives the same
+    values as np.quantile(y, q, method=method) for the 'linear' and 'hazen' methods.
+    """
+    n = len(ySorted)
+    q = np.asarray(q, dtype=float)
+    # virtual (fractional) index of each quantile
+    if method == 'linear':
+        virtualIndex = (n - 1) * q
+    elif method == 'hazen':
+        virtualIndex = n * q - 0.5
+    else:
+        raise ValueError(f"Unknown quantile method '{method}'")
+    virtualIndex = np.clip(virtualIndex, 0, n - 1)
+    previous = np.floor(virtualIndex).astype(int)
+    following = np.minimum(previous + 1, n - 1)
+    gamma = virtualIndex - previous
+
+    # linear interpolation between neighbouring order statistics, as numpy does
+    # (from the nearer neighbour, for accuracy)
+    a, b = ySorted[previous], ySorted[following]
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
@@ -1,5 +1,5 @@
 import numpy as np
-
+from PeripheryFunctions.BF_Buffer import BF_Buffer
 
 def BF_MakeBuffer(y, bufferSize):
     """
@@ -16,15 +16,9 @@ def BF_MakeBuffer(y, bufferSize):
     -------
     y_buffer : ndarray
         2D array where each row is a segment of length `bufferSize` 
-        corresponding to consecutive, non-overlapping segments of the input time series.
+        corresponding to consecutive, non-overlapping segments of the input time series
+        (a read-only view of y; any trailing samples that do not fill a segment are dropped).
     """
-    N = len(y)
-
-    numBuffers = int(np.floor(N/bufferSize))
-
-    # may need trimming
-    y_buffer = y[:numBuffers*bufferSize]
-    # then reshape
-    y_buffer = y_buffer.reshape((numBuffers,bufferSize))
+    y_buffer = BF_Buffer(y, bufferSize, tail='drop')
 
     return y_buffer
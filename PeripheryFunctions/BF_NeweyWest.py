@@ -0,0 +1,39 @@
+import numpy as np
+
+def BF_NeweyWest(u, lags):
+    """
+    Newey-West (Bartlett kernel) long-run variance of a residual series at several lags.
+
+    The residual autocovariances are computed once, up to the largest lag, and
+    the estimate at each lag is a weighted sum of them.
+
+    Parameters:
+    -----------
+    u : array-like
+        The residuals (not demeaned).
+    lags : int or array-like
+        The number(s) of lags to include in the estimator.
+
+    Returns:
+    --------
+    lrv : float or numpy.ndarray
+        The long-run variance at each lag (a float if lags is an int).
+    """
+    u = np.asarray(u, dtype=float)
+    n = len(u)
+    lagArray = np.atleast_1d(lags).astype(int)
+    maxLag = np.max(lagArray)
+    if maxLag > n:
+        raise ValueError("lags must be weakly smaller than the number of observations")
+
+    # autocovariances (sums of lagged products) up to the maximum lag
+    gammas = np.array([u @ u] + [u[j:] @ u[:-j] for j in range(1, maxLag + 1)])
+
+    lrv = np.zeros(len(lagArray))
+    for i, L in enumerate(lagArray):
+        weights = 1 - np.arange(1, L + 1) / (L + 1)
+        lrv[i] = (gammas[0] + 2*np.sum(weights * gammas[1:L+1])) / n
+
+    if np.ndim(lags) == 0:
+        return lrv[0]
+    return lrv
@@ -0,0 +1,107 @@
+import numpy as np
+from collections import OrderedDict
+
+# Orthonormal polynomial bases on t = 1, ..., N, keyed by N (most recently used last)
+_bases = OrderedDict()
+# Cap on the total size of the cached bases (bytes); larger bases are not cached
+_maxCachedBytes = 64 * 2**20
+
+def BF_PolyTrend(y, maxOrder):
+    """
+    Least-squares polynomial trends of orders 0, ..., maxOrder in a time series,
+    fitted against t = 1, ..., N.
+
+    Rather than solving a Vandermonde system for each order (as np.polyfit does),
+    the series is projected onto an orthonormal polynomial basis on 1, ..., N,
+    which is built once per length and cached. The fit of order k is the
+    projection onto the first k + 1 basis vectors, so all orders come from a
+    single projection, and stay well conditioned for long series and high orders.
+
+    Parameters:
+    -----------
+    y : array-like
+        The input time series, or a 2D array of equal-length time series (one per row).
+    maxOrder : int
+        The highest polynomial order to fit.
+
+    Returns:
+    --------
+    out : dict
+        'rss': residual sum of squares of the fit at each order 0, ..., maxOrder,
+        'gradient', 'intercept': coefficients of the linear (order 1) fit,
+            y ~ gradient*t + intercept (nan if maxOrder < 1),
+        with one row (or value) per time series if y is 2D.
+    """
+    y = np.asarray(y, dtype=float)
+    Y = np.atleast_2d(y)
+    N = Y.shape[1]
+    maxOrder = int(maxOrder)
+    if maxOrder < 0:
+        raise ValueError(f"Polynomial order must be non-negative (got {maxOrder})")
+    if maxOrder >= N:
+        raise ValueError(f"Time series (N = {N}) too short to fit a polynomial of order {maxOrder}")
+
+    Q = _orthopoly_basis(N, maxOrder)
+    coeffs = Y @ Q # (numSeries, maxOrder + 1)
+
+    # Peel off one basis vector at a time; the residuals are updated directly
+    # (rather than as |y|^2 - sum(coeffs^2)) to avoid cancellation for close fits
+    rss = np.zeros((Y.shape[0], maxOrder + 1))
+    resid = Y.copy()
+    for k in range(maxOrder + 1):
+        resid -= coeffs[:, [k]] * Q[:, k]
+        rss[:, k] = np.sum(resid**2, axis=1)
+
+    if maxOrder >= 1:
+        # linear fit evaluated at t = 1 and t = N
+        fitEnds = coeffs[:, :2] @ Q[[0, -1], :2].T
+        gradient = (fitEnds[:, 1] - fitEnds[:, 0]) / (N - 1)
+        intercept = fitEnds[:, 0] - gradient
+    else:
+        gradient = intercept = np.full(Y.shape[0], np.nan)
+
+    out = {'rss': rss, 'gradient': gradient, 'intercept': intercept}
+    if y.ndim == 1:
+        out = {key: value[0] for key, value in out.items()}
+
+    return out
+
+def _orthopoly_basis(N, maxOrder):
+    """
+    Orthonormal basis (columns) for the polynomials of order up to maxOrder on
+    t = 1, ..., N. Column k spans the polynomials of order k orthogonal to all
+    lower orders, so the basis for a lower order is a slice of a higher one: the
+    basis cached for each length is extended when a higher order is requested.
+    """
+    Q = _bases.pop(N, None)
+    if Q is None or Q.shape[1] < maxOrder + 1:
+        Q = _extend_basis(Q, N, maxOrder)
+    if Q.nbytes <= _maxCachedBytes:
+        _bases[N] = Q
+        while sum(basis.nbytes for basis in _bases.values()) > _maxCachedBytes:
+            _bases.popitem(last=False)
+
+    return Q[:, :maxOrder + 1]
+
+def _extend_basis(Q, N, maxOrder):
+    """
+    Orthonormal basis up to maxOrder on t = 1, ..., N, extending the basis Q of
+    a lower order (None to build it from scratch).
+    """
+    # Legendre polynomials on t mapped to [-1, 1] are already close to
+    # orthogonal, so the QR factorization is well conditioned
+    x = np.linspace(-1, 1, N)
+    V = np.polynomial.legendre.legvander(x, maxOrder)
+    if Q is None:
+        Q, R = np.linalg.qr(V)
+        Q = Q * np.sign(np.diag(R)) # fix signs (positive leading coefficients)
+    else:
+        # orthogonalize the higher orders against the cached basis (twice, so
+        # that they stay orthogonal to working precision)
+        V = V[:, Q.shape[1]:]
+        for _ in range(2):
+            V = V - Q @ (Q.T @ V)
+        Qnew, R = np.linalg.qr(V)
+        Q = np.hstack((Q, Qnew * np.sign(np.diag(R))))
+    Q.flags.writeable = False
+    return Q
@@ -0,0 +1,54 @@
+import numpy as np
+from Utils.kernels import kernel
+
+def BF_RunLengths(x):
+    """
+    Run-length encoding of a data vector (e.g., the output of BF_Binarize).
+
+    Parameters:
+    -----------
+    x : array_like
+        The input vector.
+
+    Returns:
+    --------
+    (values, lengths) : tuple
+        values (numpy.ndarray): The value of each run of identical consecutive elements
+        lengths (numpy.ndarray): The number of elements in each run
+    """
+    x = np.ascontiguousarray(x)
+    if x.ndim != 1:
+        raise ValueError("Run-length encoding needs a one-dimensional input")
+    # the kernel is compiled for boolean, int64 and float64 vectors
+    if x.dtype.kind in 'iu':
+        x = x.astype(np.int64, copy=False)
+    elif x.dtype.kind != 'b':
+        x = x.astype(float, copy=False)
+
+    return _run_length_encode(x)
+
+@kernel('Tuple((boolean[::1], int64[::1]))(boolean[::1])',
+        'UniTuple(int64[::1], 2)(int64[::1])',
+        'Tuple((float64[::1], int64[::1]))(float64[::1])')
+def _run_length_encode(x):
+    """
+    Values and lengths of the runs in x, from a single pass.
+    """
+    N = len(x)
+    values = np.empty(N, dtype=x.dtype)
+    lengths = np.empty(N, dtype=np.int64)
+    if N == 0:
+        return values, lengths
+
+    k = 0 # current run
+    values[0] = x[0]
+    lengths[0] = 1
+    for i in range(1, N):
+        if x[i] == values[k]:
+            lengths[k] += 1
+        else:
+            k += 1
+            values[k] = x[i]
+            lengths[k] = 1
+
+    return values[:k+1], lengths[:k+1]
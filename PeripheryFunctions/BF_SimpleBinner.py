@@ -1,30 +1,33 @@
 import numpy as np
+from PeripheryFunctions.BF_Histogram import BF_Histogram
+from PeripheryFunctions.BF_SortedValues import BF_SortedValues
 
-def BF_SimpleBinner(xData, numBins):
+def BF_SimpleBinner(xData, numBins, isSorted = False):
     """
     Generate a histogram from equally spaced bins.
    
     Parameters:
     xData (array-like): A data vector.
-    numBins (int): The number of bins.
+    numBins (int or list of int): The number of bins. Histograms for a list of bin
+                                  numbers are all counted from one sort of the data.
+    isSorted (bool, optional): Whether xData is already sorted in ascending order.
 
     Returns:
     tuple: (N, binEdges)
         N (numpy.ndarray): The counts
         binEdges (numpy.ndarray): The extremities of the bins.
+    (a list of these tuples, one per number of bins, if numBins is a list)
     """
-    minX = np.min(xData)
-    maxX = np.max(xData)
-    
-    # Linearly spaced bins:
-    binEdges = np.linspace(minX, maxX, numBins + 1)
-    N = np.zeros(numBins, dtype=int)
-    
-    for i in range(numBins):
-        if i < numBins - 1:
-            N[i] = np.sum((xData >= binEdges[i]) & (xData < binEdges[i+1]))
-        else:
-            # the final bin
-            N[i] = np.sum((xData >= binEdges[i]) & (xData <= binEdges[i+1]))
-    
-    return N, binEdges
+    xSorted = np.asarray(xData, dtype=float) if isSorted else BF_SortedValues(xData)
+    if len(xSorted) == 0:
+        raise ValueError("Cannot bin an empty data vector")
+    minX = xSorted[0]
+    maxX = xSorted[-1]
+
+    # Linearly spaced bins (the final bin includes its right edge):
+    binEdges = [np.linspace(minX, maxX, n + 1) for n in np.atleast_1d(numBins)]
+    histograms = BF_Histogram(xSorted, binEdges, isSorted=True)
+
+    if np.ndim(numBins) == 0:
+        return histograms[0]
+    return histograms
@@ -0,0 +1,17 @@
+import numpy as np
+
+def BF_SortedValues(y):
+    """
+    Sorted values of a data vector (in ascending order, NaNs last).
+
+    The operations that need the sorted series (histograms, quantiles, trimmed
+    means) all sort through this function, with the series they were given, so
+    that the planner evaluates the sort once per series (see Utils/planner.py).
+
+    Parameters:
+    y (array-like): The input data vector.
+
+    Returns:
+    numpy.ndarray: The sorted values, as floats.
+    """
+    return np.sort(np.asarray(y, dtype=float))
@@ -1,7 +1,6 @@
 import numpy as np
-from numba import jit
+from Utils.kernels import kernel
 
-@jit(nopython=True)
 def PN_sampenc(y, M = 1, r = None, justM = False):
     """
     Calculate Sample Entropy
@@ -19,7 +18,17 @@ def PN_sampenc(y, M = 1, r = None, justM = False):
         A: Number of matches for m=1,...,M
         B: Number of matches for m=1,...,M excluding last point
     """
-    if r is None:
+    y = np.ascontiguousarray(y, dtype=float)
+    hasR = r is not None
+    return _sampenc(y, int(M), float(r) if hasR else 0.0, hasR, bool(justM))
+
+@kernel('UniTuple(float64[::1], 4)(float64[::1], int64, float64, boolean, boolean)')
+def _sampenc(y, M, r, hasR, justM):
+    """
+    Sample entropy counts and estimates (see PN_sampenc); the default tolerance,
+    0.1*std(y), is used if hasR is False.
+    """
+    if not hasR:
         # need to manually compute std so everything works with numba...
         ddof = 1
         mean_val = np.sum(y) / len(y)
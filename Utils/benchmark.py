@@ -0,0 +1,276 @@
+"""
+Benchmarks of the operations across time-series lengths.
+
+Each operation in the catalogue is run with all of its master operations (its
+standard parameterisations, see catalogue.py) on synthetic series and on the
+bundled series (ts1.txt-ts4.txt, repeated end to end to reach lengths beyond
+their own), at lengths from 100 to 10^6. For each operation, series and length,
+the benchmark records the wall time (the best of a number of repeats) and the
+peak memory allocated (traced in a separate run, through tracemalloc), and, for
+each operation and series, the scaling exponent of the time with the length (the
+slope of log(time) against log(N)).
+
+Lengths at which an operation would take too long are skipped: an operation is
+not run at larger lengths once it has exceeded the time budget, and operations
+of quadratic cost (catalogue cost class 'N2') are capped at maxLengthN2.
+
+Results are written as JSON, so that runs on different commits can be compared:
+
+    python -m Utils.benchmark --out bench_new.json
+    python -m Utils.benchmark --compare bench_old.json bench_new.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+import numpy as np
+from Utils import catalogue
+
+DEFAULT_LENGTHS = [100, 1000, 10000, 100000, 1000000]
+SYNTHETIC_SERIES = ['noise', 'ar1', 'randomwalk', 'sine']
+BUNDLED_SERIES = ['ts1', 'ts2', 'ts3', 'ts4']
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def make_series(name, N, randomSeed = 0):
+    """
+    A benchmark time series of length N:
+        'noise': Gaussian white noise,
+        'ar1': an AR(1) process, x_t = 0.8 x_{t-1} + noise,
+        'randomwalk': cumulative sum of Gaussian white noise,
+        'sine': a sine wave (period 50 samples) with additive noise,
+        'ts1', ..., 'ts4': the bundled series, repeated end to end up to length N.
+    """
+    rng = np.random.default_rng(randomSeed)
+    if name == 'noise':
+        return rng.standard_normal(N)
+    if name == 'ar1':
+        e = rng.standard_normal(N)
+        x = np.empty(N)
+        x[0] = e[0]
+        for t in range(1, N):
+            x[t] = 0.8*x[t-1] + e[t]
+        return x
+    if name == 'randomwalk':
+        return np.cumsum(rng.standard_normal(N))
+    if name == 'sine':
+        return np.sin(2*np.pi*np.arange(N)/50) + 0.2*rng.standard_normal(N)
+    if name in BUNDLED_SERIES:
+        x = np.loadtxt(os.path.join(_root, f'{name}.txt'))
+        return np.resize(x, N)
+    raise ValueError(f"Unknown benchmark series '{name}'")
+
+def _run_operation(masters, inputs):
+    """
+    Evaluate all master operations of an operation; returns the errors raised.
+    """
+    errors = {}
+    for entry in masters:
+        func = catalogue.get_operation(entry['operation'])
+        try:
+            func(inputs[entry['input']], **entry['params'])
+        except Exception as err:
+            errors[entry['label']] = repr(err)
+    return errors
+
+def benchmark_operation(name, x, repeats = 3):
+    """
+    Time and peak memory of an operation (all of its master operations) on a raw
+    time series, x.
+
+    Returns:
+    --------
+    result : dict
+        'time': the best wall time (s) over the repeats,
+        'peakMemory': the peak memory (bytes) allocated during one run,
+        'errors': {label: error} for master operations that failed.
+    """
+    masters = catalogue.master_operations(operations=[name])
+    inputs = {inputType: catalogue.prepare_input(x, inputType) for inputType in ['raw', 'z']}
+
+    times = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for _ in range(repeats):
+            tic = time.perf_counter()
+            errors = _run_operation(masters, inputs)
+            times.append(time.perf_counter() - tic)
+
+        tracemalloc.start()
+        try:
+            _run_operation(masters, inputs)
+            _, peakMemory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {'time': min(times), 'peakMemory': peakMemory, 'errors': errors}
+
+def scaling_exponent(lengths, times, minTime = 1e-3):
+    """
+    Slope of log(time) against log(length), from the lengths at which the time is
+    at least minTime (where the fixed overheads no longer dominate), or from all
+    lengths if fewer than two qualify. NaN if there are fewer than two lengths.
+    """
+    lengths, times = np.asarray(lengths, dtype=float), np.asarray(times, dtype=float)
+    valid = np.isfinite(times) & (times > 0)
+    lengths, times = lengths[valid], times[valid]
+    if np.sum(times >= minTime) >= 2:
+        lengths, times = lengths[times >= minTime], times[times >= minTime]
+    if len(np.unique(lengths)) < 2:
+        return np.nan
+    return float(np.polyfit(np.log(lengths), np.log(times), 1)[0])
+
+def run_benchmarks(operations = None, series = None, lengths = None, repeats = 3,
+                   timeBudget = 10.0, maxLengthN2 = 10000, verbose = False):
+    """
+    Benchmark operations (all of the catalogue by default) on the given series
+    (synthetic and bundled by default) at the given lengths.
+
+    Parameters:
+    -----------
+    timeBudget : float
+        An operation is not run at larger lengths (of the same series) once a
+        single run has taken longer than this (s).
+    maxLengthN2 : int
+        The largest length at which operations of quadratic cost are run.
+
+    Returns:
+    --------
+    results : dict
+        'meta': the settings and environment (commit, versions, time),
+        'results': one entry per (operation, series, length) that was run,
+        'skipped': the (operation, series, length) entries that were skipped,
+        'scaling': {operation: {series: scaling exponent}} (None if the operation
+                   was measured at fewer than two lengths).
+    """
+    if operations is None:
+        operations = list(catalogue.OPERATIONS)
+    if series is None:
+        series = SYNTHETIC_SERIES + BUNDLED_SERIES
+    lengths = sorted(DEFAULT_LENGTHS if lengths is None else lengths)
+
+    # compile the kernels up front, and run each operation once so that imports and
+    # compilation are not timed
+    from Utils.kernels import warmup
+    warmup()
+    warmupSeries = make_series('noise', lengths[0])
+    for name in operations:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            _run_operation(catalogue.master_operations(operations=[name]),
+                           {inputType: catalogue.prepare_input(warmupSeries, inputType) for inputType in ['raw', 'z']})
+
+    results, skipped = [], []
+    for seriesName in series:
+        overBudget = set()
+        for N in lengths:
+            x = make_series(seriesName, N)
+            for name in operations:
+                isQuadratic = catalogue.OPERATIONS[name]['cost'] == 'N2'
+                if name in overBudget or (isQuadratic and N > maxLengthN2):
+                    skipped.append({'operation': name, 'series': seriesName, 'N': N,
+                                    'reason': 'time budget' if name in overBudget else 'quadratic cost'})
+                    continue
+                result = benchmark_operation(name, x, repeats=repeats)
+                results.append({'operation': name, 'series': seriesName, 'N': N, **result})
+                if verbose:
+                    print(f"{name:<24} {seriesName:<10} N = {N:<8} {result['time']:.4g} s "
+                          f"{result['peakMemory']/2**20:.4g} MiB", file=sys.stderr)
+                if result['time'] > timeBudget:
+                    overBudget.add(name)
+
+    scaling = {}
+    for name in operations:
+        for seriesName in series:
+            measured = [r for r in results if r['operation'] == name and r['series'] == seriesName]
+            exponent = scaling_exponent([r['N'] for r in measured], [r['time'] for r in measured])
+            scaling.setdefault(name, {})[seriesName] = None if np.isnan(exponent) else exponent
+
+    meta = {'commit': _git_commit(), 'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'lengths': lengths, 'series': series, 'repeats': repeats, 'timeBudget': timeBudget,
+            'maxLengthN2': maxLengthN2}
+    return {'meta': meta, 'results': results, 'skipped': skipped, 'scaling': scaling}
+
+def compare(baseline, current, tolerance = 0.2, minTime = 1e-3):
+    """
+    Regressions (and improvements) between two benchmark results (dicts from
+    run_benchmarks, or paths to their JSON files): the (operation, series, length)
+    entries whose time or peak memory changed by more than the tolerance (as a
+    fraction), ignoring times below minTime (s).
+
+    Returns:
+    --------
+    changes : list of dict
+        With 'operation', 'series', 'N', 'measure' ('time' or 'peakMemory'),
+        'baseline', 'current' and 'ratio' (current/baseline), largest ratio first.
+    """
+    baseline, current = [_load(r) for r in (baseline, current)]
+    old = {(r['operation'], r['series'], r['N']): r for r in baseline['results']}
+    changes = []
+    for r in current['results']:
+        key = (r['operation'], r['series'], r['N'])
+        if key not in old:
+            continue
+        for measure in ['time', 'peakMemory']:
+            a, b = old[key][measure], r[measure]
+            if measure == 'time' and max(a, b) < minTime:
+                continue
+            if a > 0 and abs(b/a - 1) > tolerance:
+                changes.append({'operation': key[0], 'series': key[1], 'N': key[2], 'measure': measure,
+                                'baseline': a, 'current': b, 'ratio': b/a})
+    return sorted(changes, key=lambda c: -c['ratio'])
+
+def _load(results):
+    if isinstance(results, str):
+        with open(results) as f:
+            return json.load(f)
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=_root, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def main(argv = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--operations', nargs='+', help='operations to benchmark (default: all)')
+    parser.add_argument('--series', nargs='+', help='benchmark series (default: all)')
+    parser.add_argument('--lengths', nargs='+', type=int, help='time-series lengths')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--time-budget', type=float, default=10.0)
+    parser.add_argument('--max-length-n2', type=int, default=10000)
+    parser.add_argument('--out', help='JSON file for the results (default: stdout)')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='compare two results files instead of running the benchmarks')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        output = compare(*args.compare, tolerance=args.tolerance)
+    else:
+        output = run_benchmarks(args.operations, args.series, args.lengths, args.repeats,
+                                args.time_budget, args.max_length_n2, verbose=True)
+
+    text = json.dumps(output, indent=1, default=_json_default)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == '__main__':
+    main()
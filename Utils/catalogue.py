@@ -0,0 +1,436 @@
+"""
+Catalogue of the operations and their master operations (parameterisations),
+in the style of HCTSA's INP_mops.txt/INP_ops.txt.
+
+Each operation is declared once in OPERATIONS, with:
+    'module', 'function': where the operation is implemented,
+    'input': the time series it is applied to ('z': the z-scored series, as for
+             operations with a y argument; 'raw': the raw series, as for x),
+    'cost': its cost class in the time-series length N (see COST_CLASSES),
+    'intermediates': the shared sub-computations it uses (see INTERMEDIATES).
+
+Each master operation in MASTER_OPERATIONS is a labelled parameterisation,
+(label, operation, params), evaluated as operation(series, **params). Its output
+feature names are 'label' (for a scalar output), or 'label.key' for each key of a
+dict output; the keys are stored in catalogue_outputs.json, which is generated
+from reference time series by update_outputs().
+"""
+import importlib
+import json
+import os
+import warnings
+import numpy as np
+
+COST_CLASSES = {
+    'N': 'linear in the time-series length',
+    'NlogN': 'dominated by sorting or FFTs',
+    'N2': 'quadratic (e.g., pairwise template matching)',
+    'jvm': 'calls the JIDT toolbox through the JVM (fixed overhead on top of its scaling)',
+}
+
+INTERMEDIATES = {
+    'zscore': 'the z-scored time series (BF_zscore)',
+    'sorted': 'the sorted values (quantiles, histograms: BF_SortedValues, BF_Histogram)',
+    'diff': 'successive differences of the time series',
+    'acf': "the full autocorrelation function (CO_AutoCorr(y, [], 'Fourier'))",
+    'firstZeroAC': "the first zero crossing of the ACF (CO_FirstCrossing(y, 'ac', 0, 'discrete'))",
+    'ami': 'automutual information across time lags (CO_HistogramAMI, IN_AutoMutualInfo)',
+    'firstMinAMI': 'the first minimum of the automutual information (CO_FirstMin)',
+    'binarize': 'a binary symbolization of the time series (BF_Binarize)',
+    'runLengths': 'run-length encoding of a symbolization (BF_RunLengths)',
+    'coarseGrain': 'a coarse-grained symbolization of the time series (SB_CoarseGrain)',
+    'embedding': 'a time-delay embedding of the time series (BF_Embed)',
+    'windows': 'non-overlapping or overlapping windows of the time series (BF_Buffer)',
+    'polyTrend': 'polynomial trend fits (BF_PolyTrend)',
+    'sampEn': 'sample entropy template matches (PN_sampenc)',
+}
+
+def _op(name, cost, intermediates=(), input='z', module=None, function=None):
+    return name, {'module': f"Operations.{module or name}", 'function': function or name,
+                  'input': input, 'cost': cost, 'intermediates': tuple(intermediates)}
+
+OPERATIONS = dict([
+    _op('CO_AddNoise', 'N', ('ami',)),
+    _op('CO_AutoCorr', 'NlogN', ('acf',)),
+    _op('CO_AutoCorrShape', 'NlogN', ('acf',)),
+    _op('CO_CompareMinAMI', 'N', ('ami',)),
+    _op('CO_Embed2', 'NlogN', ('firstZeroAC', 'embedding')),
+    _op('CO_Embed2_AngleTau', 'N', ('diff',)),
+    _op('CO_Embed2_Basic', 'N', ('firstZeroAC', 'embedding')),
+    _op('CO_Embed2_Dist', 'NlogN', ('firstZeroAC', 'embedding')),
+    _op('CO_Embed2_Shapes', 'N2', ('firstZeroAC', 'embedding')),
+    _op('CO_FirstCrossing', 'NlogN', ('acf', 'firstZeroAC')),
+    _op('CO_FirstMin', 'jvm', ('acf', 'ami', 'firstMinAMI')),
+    _op('CO_HistogramAMI', 'N', ('firstZeroAC', 'sorted', 'ami')),
+    _op('CO_NonlinearAutoCorr', 'N'),
+    _op('CO_PartialAutoCorr', 'N', ('acf',)),
+    _op('CO_RM_AMInformation', 'N', ('ami',)),
+    _op('CO_StickAngles', 'NlogN', ('firstZeroAC', 'windows')),
+    _op('CO_TranslateShape', 'N2', ('embedding',)),
+    _op('CO_fzcglscf', 'N2'),
+    _op('CO_glscf', 'N', ('firstZeroAC',)),
+    _op('CO_tc3', 'NlogN', ('firstZeroAC',)),
+    _op('CO_trev', 'NlogN', ('firstZeroAC',)),
+    _op('CP_wavelet_varchg', 'NlogN', module='CP_wavelet_varch'),
+    _op('CR_RAD', 'N', input='raw'),
+    _op('DN_Burstiness', 'N'),
+    _op('DN_Cumulants', 'N'),
+    _op('DN_CustomSkewness', 'NlogN', ('sorted',)),
+    _op('DN_Fit_mle', 'N'),
+    _op('DN_HighLowMu', 'N'),
+    _op('DN_HistogramAsymmetry', 'NlogN', ('sorted',)),
+    _op('DN_HistogramMode', 'NlogN', ('sorted',)),
+    _op('DN_Mean', 'NlogN', ('sorted',)),
+    _op('DN_MinMax', 'N'),
+    _op('DN_Moments', 'N'),
+    _op('DN_OutlierTest', 'NlogN', ('sorted',)),
+    _op('DN_ProportionValues', 'N', input='raw'),
+    _op('DN_Quantile', 'NlogN', ('sorted',)),
+    _op('DN_RemovePoints', 'NlogN', ('acf', 'sorted')),
+    _op('DN_Spread', 'NlogN', ('sorted',)),
+    _op('DN_TrimmedMean', 'NlogN', ('sorted',)),
+    _op('DN_Unique', 'NlogN', ('sorted',), input='raw'),
+    _op('DN_Withinp', 'NlogN', ('sorted',), input='raw'),
+    _op('DN_cv', 'N', input='raw'),
+    _op('DN_nlogL_norm', 'N'),
+    _op('DN_pleft', 'NlogN', ('sorted',)),
+    _op('DT_IsSeasonal', 'N'),
+    _op('EN_ApEN', 'N2', module='EN_ApEn'),
+    _op('EN_CID', 'N', ('diff',)),
+    _op('EN_PermEn', 'NlogN', ('embedding',)),
+    _op('EN_SampEn', 'N2', ('sampEn',)),
+    _op('EN_mse', 'N2', ('windows', 'sampEn')),
+    _op('EN_wentropy', 'N'),
+    _op('EX_MovingThreshold', 'N'),
+    _op('FC_Surprise', 'NlogN', ('coarseGrain',)),
+    _op('HT_DistributionTest', 'NlogN', ('sorted',)),
+    _op('IN_AutoMutualInfo', 'jvm', ('firstZeroAC', 'ami')),
+    _op('IN_AutoMutualInfoStats', 'jvm', ('ami',)),
+    _op('MD_hrv_classic', 'NlogN', ('diff',)),
+    _op('MD_pNN', 'NlogN', ('diff', 'sorted'), input='raw'),
+    _op('MD_polvar', 'N', ('diff', 'runLengths'), input='raw'),
+    _op('MD_rawHRVmeas', 'NlogN', ('diff', 'sorted'), input='raw'),
+    _op('PH_ForcePotential', 'N'),
+    _op('SB_BinaryStats', 'N', ('binarize', 'runLengths')),
+    _op('SB_BinaryStretch', 'N', ('runLengths',), input='raw'),
+    _op('SB_CoarseGrain', 'NlogN', ('coarseGrain',)),
+    _op('SB_MotifThree', 'NlogN', ('coarseGrain',)),
+    _op('SB_MotifTwo', 'N', ('binarize',)),
+    _op('SB_TransitionMatrix', 'NlogN', ('firstZeroAC', 'coarseGrain')),
+    _op('SC_FluctAnal', 'N', ('windows',), input='raw'),
+    _op('SC_MMA', 'N', ('windows',), function='SSC_MMA'),
+    _op('SC_fastdfa', 'N', ('windows',), input='raw'),
+    _op('ST_FitPolynomial', 'N', ('polyTrend',)),
+    _op('ST_Length', 'N', input='raw'),
+    _op('ST_LocalExtrema', 'N', ('firstZeroAC', 'windows'), function='ST_LocalExrema'),
+    _op('ST_MomentCorr', 'N', ('windows',), input='raw'),
+    _op('ST_SimpleStats', 'N', ('diff',), input='raw'),
+    _op('SY_DriftingMean', 'N', ('windows',)),
+    _op('SY_DynWin', 'N2', ('acf', 'firstZeroAC', 'windows', 'sampEn')),
+    _op('SY_KPSStest', 'N'),
+    _op('SY_LocalGlobal', 'NlogN', ('sorted',)),
+    _op('SY_PPtest', 'N'),
+    _op('SY_RangeEvolve', 'N2'),
+    _op('SY_SpreadRandomLocal', 'N', ('acf',)),
+    _op('SY_StatAv', 'N', ('windows',)),
+    _op('SY_StdNthDer', 'N', ('diff',)),
+    _op('SY_StdNthDerChange', 'N', ('diff',)),
+    _op('SY_Trend', 'N', ('polyTrend',)),
+])
+
+# (label, operation, params)
+MASTER_OPERATIONS = [
+    # Correlation
+    *[(f'CO_AddNoise_1_{m}', 'CO_AddNoise', {'tau': 1, 'amiMethod': m, 'randomSeed': 0}) for m in ['even', 'quantiles']],
+    *[(f'AC_{tau}', 'CO_AutoCorr', {'tau': tau, 'method': 'Fourier'}) for tau in range(1, 41)],
+    ('CO_AutoCorrShape_posDrown', 'CO_AutoCorrShape', {'stopWhen': 'posDrown'}),
+    ('CO_AutoCorrShape_drown', 'CO_AutoCorrShape', {'stopWhen': 'drown'}),
+    ('CO_AutoCorrShape_50', 'CO_AutoCorrShape', {'stopWhen': 50}),
+    *[(f'CO_CompareMinAMI_{m}', 'CO_CompareMinAMI', {'binMethod': m, 'numBins': list(range(2, 81))})
+      for m in ['even', 'std1', 'std2', 'quantiles']],
+    ('CO_Embed2_tau', 'CO_Embed2', {'tau': 'tau'}),
+    ('CO_Embed2_AngleTau_50', 'CO_Embed2_AngleTau', {'maxTau': 50}),
+    ('CO_Embed2_Basic_1', 'CO_Embed2_Basic', {'tau': 1}),
+    ('CO_Embed2_Basic_tau', 'CO_Embed2_Basic', {'tau': 'tau'}),
+    ('CO_Embed2_Dist_tau', 'CO_Embed2_Dist', {'tau': None}),
+    *[(f'CO_Embed2_Shapes_tau_circle_{str(r).replace(".", "")}', 'CO_Embed2_Shapes',
+       {'tau': 'tau', 'shape': 'circle', 'r': r}) for r in [0.1, 1]],
+    ('CO_FirstCrossing_ac_0', 'CO_FirstCrossing', {'corr_fun': 'ac', 'threshold': 0, 'what_out': 'both'}),
+    ('CO_FirstCrossing_ac_invexp', 'CO_FirstCrossing', {'corr_fun': 'ac', 'threshold': 1/np.e, 'what_out': 'both'}),
+    ('CO_FirstMin_ac', 'CO_FirstMin', {'minWhat': 'ac'}),
+    ('CO_FirstMin_mi_gaussian', 'CO_FirstMin', {'minWhat': 'mi-gaussian'}),
+    ('CO_FirstMin_mi_kraskov1_4', 'CO_FirstMin', {'minWhat': 'mi-kraskov1', 'extraParam': '4'}),
+    *[(f'CO_HistogramAMI_{m}_{b}', 'CO_HistogramAMI', {'tau': [1, 2, 3, 4, 5], 'meth': m, 'numBins': b})
+      for m in ['even', 'std1', 'std2', 'quantiles'] for b in [2, 5, 10]],
+    *[(f'CO_NonlinearAutoCorr_{"".join(map(str, taus))}', 'CO_NonlinearAutoCorr', {'taus': taus})
+      for taus in [[1, 2], [1, 3], [2, 3], [1, 2, 3], [1, 2, 3, 4], [0, 1], [0, 0, 1], [0, 1, 1]]],
+    ('CO_PartialAutoCorr_1_10_ols', 'CO_PartialAutoCorr', {'max_tau': 10, 'what_method': 'ols'}),
+    *[(f'CO_RM_AMInformation_{tau}', 'CO_RM_AMInformation', {'tau': tau}) for tau in range(1, 11)],
+    ('CO_StickAngles', 'CO_StickAngles', {}),
+    *[(f'CO_TranslateShape_circle_{str(d).replace(".", "")}_pts', 'CO_TranslateShape',
+       {'shape': 'circle', 'd': d, 'howToMove': 'pts'}) for d in [1.5, 2.5, 3.5]],
+    *[(f'CO_fzcglscf_{a}_{b}', 'CO_fzcglscf', {'alpha': a, 'beta': b}) for a, b in [(1, 1), (1, 2), (2, 1), (5, 5)]],
+    *[(f'CO_glscf_{a}_{b}_{tau}', 'CO_glscf', {'alpha': a, 'beta': b, 'tau': tau})
+      for a, b in [(1, 1), (1, 2), (2, 2)] for tau in [1, 2, 'tau']],
+    *[(f'CO_tc3_{tau}', 'CO_tc3', {'tau': tau}) for tau in [1, 2, 3, 'ac']],
+    *[(f'CO_trev_{tau}', 'CO_trev', {'tau': tau}) for tau in [1, 2, 3, 'ac']],
+
+    # Change points
+    *[(f'CP_wavelet_varchg_db3_{lvl}', 'CP_wavelet_varchg', {'wName': 'db3', 'level': lvl}) for lvl in [3, 5]],
+
+    # Criticality
+    ('CR_RAD_1', 'CR_RAD', {'centre': True, 'tau': 1}),
+
+    # Distribution
+    ('DN_Burstiness', 'DN_Burstiness', {}),
+    *[(f'DN_Cumulants_{c}', 'DN_Cumulants', {'cumWhatMay': c}) for c in ['skew1', 'skew2', 'kurt1', 'kurt2']],
+    *[(f'DN_CustomSkewness_{s}', 'DN_CustomSkewness', {'whatSkew': s}) for s in ['pearson', 'bowley']],
+    *[(f'DN_Fit_mle_{f}', 'DN_Fit_mle', {'fitWhat': f}) for f in ['gaussian', 'uniform', 'geometric']],
+    ('DN_HighLowMu', 'DN_HighLowMu', {}),
+    *[(f'DN_HistogramAsymmetry_{b}', 'DN_HistogramAsymmetry', {'numBins': b, 'doSimple': True}) for b in [5, 10, 11]],
+    *[(f'DN_HistogramMode_{b}', 'DN_HistogramMode', {'numBins': b, 'doSimple': True}) for b in [5, 10, 12, 21, 52]],
+    *[(f'DN_Mean_{m}', 'DN_Mean', {'mean_type': m}) for m in ['norm', 'median', 'harm', 'rms', 'iqm', 'midhinge']],
+    ('DN_MinMax_max', 'DN_MinMax', {'minOrMax': 'max'}),
+    ('DN_MinMax_min', 'DN_MinMax', {'minOrMax': 'min'}),
+    *[(f'DN_Moments_{k}', 'DN_Moments', {'theMom': k}) for k in range(3, 12)],
+    *[(f'DN_OutlierTest_{p}', 'DN_OutlierTest', {'p': p}) for p in [2, 5, 10]],
+    *[(f'DN_ProportionValues_{w}', 'DN_ProportionValues', {'propWhat': w}) for w in ['zeros', 'positive', 'geq0']],
+    *[(f'DN_Quantile_{str(p).replace(".", "")}', 'DN_Quantile', {'p': p})
+      for p in [0.01, 0.02, 0.03, 0.04, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.96, 0.97, 0.98, 0.99]],
+    *[(f'DN_RemovePoints_{how}_{str(p).replace(".", "")}', 'DN_RemovePoints', {'removeHow': how, 'p': p})
+      for how in ['absclose', 'absfar', 'min', 'max'] for p in [0.1, 0.5, 0.8]],
+    *[(f'DN_Spread_{m}', 'DN_Spread', {'spreadMeasure': m}) for m in ['std', 'iqr', 'mad', 'mead']],
+    *[(f'DN_TrimmedMean_{n}', 'DN_TrimmedMean', {'n': n}) for n in [1, 5, 10, 25, 50]],
+    ('DN_Unique', 'DN_Unique', {}),
+    *[(f'DN_Withinp_{str(p).replace(".", "")}', 'DN_Withinp', {'p': p, 'meanOrMedian': 'mean'}) for p in [0.5, 1, 1.5, 2, 2.5, 3]],
+    *[(f'DN_cv_{k}', 'DN_cv', {'k': k}) for k in [1, 2]],
+    ('DN_nlogL_norm', 'DN_nlogL_norm', {}),
+    *[(f'DN_pleft_{str(th).replace(".", "")}', 'DN_pleft', {'th': th}) for th in [0.05, 0.1, 0.2, 0.3, 0.4, 0.5]],
+
+    # Detrending and seasonality
+    ('DT_IsSeasonal', 'DT_IsSeasonal', {}),
+
+    # Entropy
+    *[(f'EN_ApEn_{m}_{str(r).replace(".", "")}', 'EN_ApEN', {'mnom': m, 'rth': r}) for m, r in [(1, 0.2), (2, 0.2)]],
+    ('EN_CID', 'EN_CID', {}),
+    *[(f'EN_PermEn_{m}_{tau}', 'EN_PermEn', {'m': m, 'tau': tau}) for m in [2, 3, 4] for tau in [1]],
+    ('EN_SampEn_5_01', 'EN_SampEn', {'M': 5, 'r': 0.1}),
+    ('EN_SampEn_5_02', 'EN_SampEn', {'M': 5, 'r': 0.2}),
+    ('EN_SampEn_5_01_diff1', 'EN_SampEn', {'M': 5, 'r': 0.1, 'preProcessHow': 'diff1'}),
+    ('EN_mse_1-10_2_015', 'EN_mse', {'scaleRange': list(range(1, 11)), 'm': 2, 'r': 0.15}),
+    ('EN_mse_1-10_2_015_diff1', 'EN_mse', {'scaleRange': list(range(1, 11)), 'm': 2, 'r': 0.15, 'preProcessHow': 'diff1'}),
+    ('EN_wentropy_shannon', 'EN_wentropy', {'whaten': 'shannon'}),
+    ('EN_wentropy_logenergy', 'EN_wentropy', {'whaten': 'logenergy'}),
+    *[(f'EN_wentropy_threshold_{p}', 'EN_wentropy', {'whaten': 'threshold', 'p': p}) for p in [1]],
+    *[(f'EN_wentropy_sure_{p}', 'EN_wentropy', {'whaten': 'sure', 'p': p}) for p in [1]],
+
+    # Extreme events
+    *[(f'EX_MovingThreshold_{a}_{str(b).replace(".", "")}', 'EX_MovingThreshold', {'a': a, 'b': b})
+      for a, b in [(0.1, 0.002), (0.1, 0.01), (0.1, 0.1), (1, 0.002), (1, 0.01), (1, 0.1)]],
+
+    # Forecasting
+    *[(f'FC_Surprise_{prior}_{memory}_{groups}_quantile', 'FC_Surprise',
+       {'whatPrior': prior, 'memory': memory, 'numGroups': groups, 'coarseGrainMethod': 'quantile', 'randomSeed': 0})
+      for prior in ['dist', 'T1', 'T2'] for memory, groups in [(5, 2), (20, 3), (100, 4)]],
+
+    # Hypothesis tests
+    *[(f'HT_DistributionTest_chi2gof_{d}_10', 'HT_DistributionTest', {'theTest': 'chi2gof', 'theDistn': d, 'numBins': 10})
+      for d in ['norm', 'ev', 'uni']],
+    *[(f'HT_DistributionTest_ks_{d}', 'HT_DistributionTest', {'theTest': 'ks', 'theDistn': d, 'numBins': 10})
+      for d in ['norm', 'ev', 'uni']],
+
+    # Information theory
+    *[(f'IN_AutoMutualInfo_{tau}_gaussian', 'IN_AutoMutualInfo', {'timeDelay': tau, 'estMethod': 'gaussian'})
+      for tau in [1, 2, 3, 4, 5]],
+    ('IN_AutoMutualInfoStats_40_gaussian', 'IN_AutoMutualInfoStats', {'maxTau': 40, 'estMethod': 'gaussian'}),
+    ('IN_AutoMutualInfoStats_40_kraskov1_4', 'IN_AutoMutualInfoStats', {'maxTau': 40, 'estMethod': 'kraskov1', 'extraParam': '4'}),
+
+    # Medical (heart rate variability)
+    ('MD_hrv_classic', 'MD_hrv_classic', {}),
+    ('MD_pNN', 'MD_pNN', {}),
+    *[(f'MD_polvar_{str(d).replace(".", "")}_{D}', 'MD_polvar', {'d': d, 'D': D}) for d, D in [(1, 3), (1, 4), (0.1, 3), (0.1, 4)]],
+    ('MD_rawHRVmeas', 'MD_rawHRVmeas', {}),
+
+    # Physics-based simulations
+    *[(f'PH_ForcePotential_{p}_{"_".join(str(v).replace(".", "") for v in params)}', 'PH_ForcePotential',
+       {'whatPotential': p, 'params': params})
+      for p, params in [('dblwell', [1, 0.2, 0.1]), ('dblwell', [1, 0.5, 0.2]), ('dblwell', [2, 0.05, 0.2]),
+                        ('sine', [1, 1, 1]), ('sine', [3, 0.5, 1]), ('sine', [10, 0.04, 10])]],
+
+    # Symbolic
+    *[(f'SB_BinaryStats_{m}', 'SB_BinaryStats', {'binaryMethod': m}) for m in ['diff', 'mean', 'iqr']],
+    *[(f'SB_BinaryStretch_{w}', 'SB_BinaryStretch', {'stretchWhat': w}) for w in ['lseq0', 'lseq1']],
+    *[(f'SB_MotifThree_{cg}', 'SB_MotifThree', {'cgHow': cg}) for cg in ['quantile', 'diffquant']],
+    *[(f'SB_MotifTwo_{b}', 'SB_MotifTwo', {'binarizeHow': b}) for b in ['diff', 'mean', 'median']],
+    *[(f'SB_TransitionMatrix_{n}ac', 'SB_TransitionMatrix', {'howtocg': 'quantile', 'numGroups': n, 'tau': 'ac'})
+      for n in [2, 3, 4, 5]],
+    *[(f'SB_TransitionMatrix_{n}_{tau}', 'SB_TransitionMatrix', {'howtocg': 'quantile', 'numGroups': n, 'tau': tau})
+      for n in [2, 3] for tau in [1]],
+
+    # Scaling
+    *[(f'SC_FluctAnal_2_{wtf}_50_{k}_logi', 'SC_FluctAnal', {'q': 2, 'wtf': wtf, 'tauStep': 50, 'k': k, 'logInc': True})
+      for wtf, k in [('rsrangefit', 1), ('dfa', 1), ('dfa', 2), ('range', 1), ('std', 1), ('iqr', 1)]],
+    ('SC_MMA', 'SC_MMA', {}),
+    ('SC_fastdfa', 'SC_fastdfa', {}),
+
+    # Stationarity and trend
+    *[(f'ST_FitPolynomial_{k}', 'ST_FitPolynomial', {'k': k}) for k in range(1, 10)],
+    ('ST_Length', 'ST_Length', {}),
+    *[(f'ST_LocalExtrema_{how}{n}', 'ST_LocalExtrema', {'howToWindow': how, 'n': n})
+      for how, n in [('l', 50), ('l', 100), ('n', 25), ('n', 50), ('n', 100)]],
+    *[(f'ST_MomentCorr_wl{w}_{o}_{m1}_{m2}', 'ST_MomentCorr',
+       {'windowLength': w, 'wOverlap': o, 'mom1': m1, 'mom2': m2, 'whatTransform': 'none'})
+      for w, o in [(0.02, 0.2)] for m1, m2 in [('mean', 'std'), ('median', 'iqr')]],
+    *[(f'ST_SimpleStats_{s}', 'ST_SimpleStats', {'whatStat': s}) for s in ['zcross', 'maxima', 'minima', 'pmcross', 'zsczcross']],
+    *[(f'SY_DriftingMean{n}', 'SY_DriftingMean', {'segmentHow': 'num', 'l': n}) for n in [2, 5, 10, 20, 50]],
+    ('SY_DynWin10', 'SY_DynWin', {'maxNumSegments': 10}),
+    *[(f'SY_KPSStest_{lags}', 'SY_KPSStest', {'lags': lags}) for lags in [0, 1, 2]],
+    *[(f'SY_LocalGlobal_{how}{n}', 'SY_LocalGlobal', {'subsetHow': how, 'n': n})
+      for how, n in [('l', 10), ('l', 50), ('l', 100), ('p', 0.1), ('p', 0.5), ('unicg', 10), ('unicg', 100)]],
+    ('SY_PPtest_0_5', 'SY_PPtest', {}),
+    ('SY_RangeEvolve', 'SY_RangeEvolve', {}),
+    *[(f'SY_SpreadRandomLocal_{l}', 'SY_SpreadRandomLocal', {'l': l, 'numSegs': 100}) for l in [50, 100, 200, 'ac2', 'ac5']],
+    *[(f'SY_StatAv{n}', 'SY_StatAv', {'whatType': 'seg', 'n': n}) for n in [2, 4, 6, 8, 10]],
+    *[(f'SY_StdNthDer_{n}', 'SY_StdNthDer', {'n': n}) for n in [1, 2, 3, 4, 5, 10]],
+    ('SY_StdNthDerChange', 'SY_StdNthDerChange', {}),
+    ('SY_Trend', 'SY_Trend', {}),
+]
+
+# Output keys of each master operation (None for a scalar output)
+_outputsFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalogue_outputs.json')
+_outputs = None
+
+def get_operation(name):
+    """
+    The function implementing an operation in the catalogue.
+    """
+    if name not in OPERATIONS:
+        raise ValueError(f"Unknown operation '{name}'")
+    entry = OPERATIONS[name]
+    return getattr(importlib.import_module(entry['module']), entry['function'])
+
+def master_operations(operations = None, labels = None):
+    """
+    Master operations in the catalogue, as a list of dicts with their 'label',
+    'operation', 'params' and the operation's 'input', 'cost' and 'intermediates'.
+    Optionally restricted to the given operation names and/or master labels.
+    """
+    masters = []
+    for label, name, params in MASTER_OPERATIONS:
+        if operations is not None and name not in operations:
+            continue
+        if labels is not None and label not in labels:
+            continue
+        masters.append({'label': label, 'operation': name, 'params': params, **OPERATIONS[name]})
+    return masters
+
+def output_names(label):
+    """
+    Feature names of a master operation: [label] for a scalar output, otherwise
+    'label.key' for each key of its output (from catalogue_outputs.json).
+    """
+    global _outputs
+    if _outputs is None:
+        with open(_outputsFile) as f:
+            _outputs = json.load(f)
+    if label not in _outputs:
+        raise ValueError(f"No output names recorded for master operation '{label}' (see update_outputs)")
+    keys = _outputs[label]
+    if keys is None:
+        return [label]
+    return [f'{label}.{key}' for key in keys]
+
+def feature_names(labels = None):
+    """
+    Feature names of all (or the given) master operations, in catalogue order.
+    """
+    if labels is None:
+        labels = [label for label, _, _ in MASTER_OPERATIONS]
+    return [name for label in labels for name in output_names(label)]
+
+def prepare_input(x, inputType):
+    """
+    The series passed to an operation with the given input type ('z' or 'raw').
+    """
+    x = np.asarray(x, dtype=float)
+    if inputType == 'z':
+        from PeripheryFunctions.BF_zscore import BF_zscore
+        return BF_zscore(x)
+    return x
+
+def evaluate(label, x):
+    """
+    Evaluate a master operation on a raw time series, x (z-scored first if the
+    operation takes a z-scored input). Returns the raw output of the operation.
+    """
+    entry = master_operations(labels=[label])
+    if len(entry) == 0:
+        raise ValueError(f"Unknown master operation '{label}'")
+    entry = entry[0]
+    func = get_operation(entry['operation'])
+    return func(prepare_input(x, entry['input']), **entry['params'])
+
+def flatten_output(label, out):
+    """
+    Feature values of an operation's output, as a float array ordered as
+    output_names(label). Missing keys, and non-numeric values, give NaN.
+    """
+    names = output_names(label)
+    if len(names) == 1 and names[0] == label:
+        return np.array([_as_float(out)])
+    if not isinstance(out, dict):
+        return np.full(len(names), np.nan)
+    return np.array([_as_float(out.get(name[len(label)+1:], np.nan)) for name in names])
+
+def _as_float(value):
+    try:
+        value = np.asarray(value, dtype=float)
+    except (TypeError, ValueError):
+        return np.nan
+    return float(value.ravel()[0]) if value.size == 1 else np.nan
+
+def update_outputs(labels = None, referenceSeries = None):
+    """
+    Record the output keys of master operations in catalogue_outputs.json, from
+    their outputs on reference time series (by default ts1.txt-ts4.txt; the union
+    of keys is kept, in order of first appearance). Master operations that fail on
+    every reference series keep any previously recorded keys.
+    """
+    global _outputs
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if referenceSeries is None:
+        referenceSeries = [np.loadtxt(os.path.join(root, f'ts{i}.txt')) for i in range(1, 5)]
+    outputs = {}
+    if os.path.exists(_outputsFile):
+        with open(_outputsFile) as f:
+            outputs = json.load(f)
+    if labels is None:
+        labels = [label for label, _, _ in MASTER_OPERATIONS]
+
+    for label in labels:
+        keys, isScalar = [], False
+        for x in referenceSeries:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    out = evaluate(label, x)
+            except Exception as err:
+                warnings.warn(f"{label} failed on a reference series: {err!r}")
+                continue
+            if isinstance(out, dict):
+                keys += [str(key) for key in out if str(key) not in keys]
+            else:
+                isScalar = True
+        if keys:
+            outputs[label] = keys
+        elif isScalar:
+            outputs[label] = None
+
+    with open(_outputsFile, 'w') as f:
+        json.dump(outputs, f, indent=1)
+    _outputs = outputs
+    return outputs
+
+if __name__ == '__main__':
+    # regenerate the recorded output names
+    update_outputs()
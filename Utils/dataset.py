@@ -0,0 +1,133 @@
+"""
+Memory-mapped dataset of time series of varying lengths.
+
+A dataset is a directory with:
+    values.bin: the values of all the time series, one after another, as a
+        single contiguous array (little-endian float64 or float32),
+    offsets.npy: the (numSeries + 1) int64 offsets of the series in values
+        (series i is values[offsets[i]:offsets[i+1]]),
+    meta.json: the dtype, the number of series and their ids.
+
+Opening a dataset memory-maps the values, so each series is a (read-only)
+zero-copy view, and only the series that are used are read from disk. Datasets
+are written in a single pass over the series (e.g., from a directory of text
+files, with convert_text_files), and the files are renamed into place once
+complete.
+"""
+import glob
+import json
+import os
+import numpy as np
+
+_dtypes = {'float64': '<f8', 'float32': '<f4'}
+
+def write_dataset(path, series, dtype = 'float64'):
+    """
+    Write time series to a dataset in the directory path.
+
+    Parameters:
+    -----------
+    series : iterable
+        The time series, or (id, time series) pairs (ids are str or int; by
+        default, the position of each series).
+    dtype : str, optional
+        The dtype of the stored values: 'float64' (default) or 'float32'.
+
+    Returns:
+    --------
+    dataset : dict
+        The dataset (see open_dataset).
+    """
+    if dtype not in _dtypes:
+        raise ValueError(f"Unknown dataset dtype '{dtype}' (should be one of {list(_dtypes)})")
+    os.makedirs(path, exist_ok=True)
+    valuesPath = os.path.join(path, 'values.bin')
+
+    offsets, ids = [0], []
+    with open(valuesPath + '.tmp', 'wb') as f:
+        for i, item in enumerate(series):
+            seriesId, x = item if isinstance(item, tuple) else (i, item)
+            x = np.asarray(x, dtype=_dtypes[dtype])
+            if x.ndim != 1:
+                raise ValueError(f"Series {seriesId!r} is not one-dimensional")
+            x.tofile(f)
+            offsets.append(offsets[-1] + len(x))
+            ids.append(seriesId.item() if isinstance(seriesId, np.generic) else seriesId)
+
+    with open(os.path.join(path, 'offsets.npy.tmp'), 'wb') as f:
+        np.save(f, np.array(offsets, dtype=np.int64))
+    with open(os.path.join(path, 'meta.json.tmp'), 'w') as f:
+        json.dump({'dtype': dtype, 'numSeries': len(ids), 'ids': ids}, f)
+    # the metadata last, so that a dataset with metadata is complete
+    for name in ['values.bin', 'offsets.npy', 'meta.json']:
+        os.replace(os.path.join(path, name + '.tmp'), os.path.join(path, name))
+
+    return open_dataset(path)
+
+def convert_text_files(directory, path, pattern = '*.txt', dtype = 'float64'):
+    """
+    Convert a directory of text files (one time series per file, as read by
+    np.loadtxt, e.g., ts1.txt) into a dataset at path. The series are sorted by
+    file name, and their ids are the file names without the extension.
+
+    Returns:
+    --------
+    dataset : dict
+        The dataset (see open_dataset).
+    """
+    files = sorted(glob.glob(os.path.join(directory, pattern)))
+    if len(files) == 0:
+        raise FileNotFoundError(f"No files matching {pattern} in {directory}")
+    series = ((os.path.splitext(os.path.basename(file))[0], np.loadtxt(file, ndmin=1)) for file in files)
+    return write_dataset(path, series, dtype=dtype)
+
+def open_dataset(path):
+    """
+    Open a dataset, with its values memory-mapped.
+
+    Returns:
+    --------
+    dataset : dict
+        'values': all the values (read-only), 'offsets': the offsets of the series,
+        'ids': the series ids, 'dtype': the dtype of the values, 'path': the
+        directory of the dataset.
+    """
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    offsets = np.load(os.path.join(path, 'offsets.npy'))
+    if offsets[-1] > 0:
+        values = np.memmap(os.path.join(path, 'values.bin'), dtype=_dtypes[meta['dtype']], mode='r',
+                           shape=(int(offsets[-1]),)).view(np.ndarray)
+    else:
+        values = np.empty(0, dtype=_dtypes[meta['dtype']])
+    return {'values': values, 'offsets': offsets, 'ids': meta['ids'], 'dtype': meta['dtype'], 'path': path}
+
+def num_series(dataset):
+    """
+    The number of time series in a dataset.
+    """
+    return len(dataset['offsets']) - 1
+
+def series_lengths(dataset):
+    """
+    The length of each time series in a dataset.
+    """
+    return np.diff(dataset['offsets'])
+
+def get_series(dataset, i):
+    """
+    Time series i of a dataset, as a read-only view of the memory-mapped values.
+    """
+    if not -num_series(dataset) <= i < num_series(dataset):
+        raise IndexError(f"Series {i} out of range for a dataset of {num_series(dataset)} series")
+    i = i % num_series(dataset)
+    return dataset['values'][dataset['offsets'][i]:dataset['offsets'][i+1]]
+
+def iter_series(dataset, start = 0, stop = None):
+    """
+    Iterate over (id, time series) pairs of a dataset (as read-only views), e.g.,
+    as the input of featurestore.compute_store.
+    """
+    stop = num_series(dataset) if stop is None else min(stop, num_series(dataset))
+    for i in range(start, stop):
+        yield dataset['ids'][i], get_series(dataset, i)
@@ -0,0 +1,243 @@
+"""
+On-disk store of a feature matrix (time series x features, float64), by columns
+of a fixed schema of feature names (as catalogue.feature_names), written in
+chunks of rows.
+
+A store is a directory with:
+    schema.json: the feature names (and master operations) of the columns,
+    manifest.json: the completed chunks, with their numbers of rows and row ids,
+    chunk_000000.npy, ...: the rows of each chunk, as a (rows, features) array
+        stored by columns (Fortran order), so that each feature is contiguous.
+
+Each chunk, and then the manifest, is written to a temporary file and renamed
+into place, so a store always holds the chunks completed before an interruption:
+compute_store() resumes from the last completed chunk. Chunks are read as
+memory maps, so reading rows or columns only loads what is used.
+"""
+import json
+import os
+import warnings
+import numpy as np
+from Utils import catalogue
+
+_schemaFile = 'schema.json'
+_manifestFile = 'manifest.json'
+
+def create_store(path, featureNames = None, labels = None, overwrite = False):
+    """
+    Create an empty feature store in the directory path.
+
+    Parameters:
+    -----------
+    featureNames : list of str, optional
+        The column names. By default, the feature names of the given master
+        operations (all of the catalogue by default).
+    labels : list of str, optional
+        The master operations the features come from (recorded in the schema).
+    overwrite : bool, optional
+        Whether to replace an existing store at path.
+
+    Returns:
+    --------
+    store : dict
+        The store (see open_store).
+    """
+    if os.path.exists(os.path.join(path, _schemaFile)):
+        if not overwrite:
+            raise FileExistsError(f"A feature store already exists at {path}")
+        for name in os.listdir(path):
+            if name in (_schemaFile, _manifestFile) or name.startswith('chunk_'):
+                os.remove(os.path.join(path, name))
+    os.makedirs(path, exist_ok=True)
+
+    if featureNames is None:
+        if labels is None:
+            labels = [label for label, _, _ in catalogue.MASTER_OPERATIONS]
+        featureNames = catalogue.feature_names(labels)
+    featureNames = list(featureNames)
+    if len(set(featureNames)) != len(featureNames):
+        raise ValueError("Feature names must be unique")
+
+    schema = {'featureNames': featureNames, 'labels': None if labels is None else list(labels), 'dtype': 'float64'}
+    _write_json(os.path.join(path, _schemaFile), schema)
+    _write_json(os.path.join(path, _manifestFile), {'chunks': []})
+    return open_store(path)
+
+def open_store(path):
+    """
+    Open an existing feature store.
+
+    Returns:
+    --------
+    store : dict
+        'path', 'featureNames', 'labels', and 'chunks' (the completed chunks, each
+        a dict with 'file', 'rows' and 'ids').
+    """
+    schemaPath = os.path.join(path, _schemaFile)
+    if not os.path.exists(schemaPath):
+        raise FileNotFoundError(f"No feature store at {path}")
+    with open(schemaPath) as f:
+        schema = json.load(f)
+    with open(os.path.join(path, _manifestFile)) as f:
+        manifest = json.load(f)
+    return {'path': path, 'featureNames': schema['featureNames'], 'labels': schema['labels'],
+            'chunks': manifest['chunks']}
+
+def num_rows(store):
+    """
+    The number of rows in the completed chunks of a store.
+    """
+    return sum(chunk['rows'] for chunk in store['chunks'])
+
+def row_ids(store):
+    """
+    The ids of the rows of a store, in order.
+    """
+    return [rowId for chunk in store['chunks'] for rowId in chunk['ids']]
+
+def append_rows(store, values, ids = None):
+    """
+    Append a chunk of rows to a store.
+
+    Parameters:
+    -----------
+    values : array-like
+        The (rows, features) feature values, with columns in the order of the
+        store's feature names.
+    ids : list, optional
+        An identifier (str or int) for each row (by default, the row numbers).
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim != 2 or values.shape[1] != len(store['featureNames']):
+        raise ValueError(f"Expected a (rows, {len(store['featureNames'])}) array (got {values.shape})")
+    start = num_rows(store)
+    if ids is None:
+        ids = list(range(start, start + len(values)))
+    ids = [rowId.item() if isinstance(rowId, np.generic) else rowId for rowId in ids]
+    if len(ids) != len(values):
+        raise ValueError(f"Got {len(ids)} row ids for {len(values)} rows")
+
+    fileName = f'chunk_{len(store["chunks"]):06d}.npy'
+    chunkPath = os.path.join(store['path'], fileName)
+    with open(chunkPath + '.tmp', 'wb') as f:
+        np.save(f, np.asfortranarray(values))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(chunkPath + '.tmp', chunkPath)
+
+    chunks = store['chunks'] + [{'file': fileName, 'rows': len(values), 'ids': ids}]
+    _write_json(os.path.join(store['path'], _manifestFile), {'chunks': chunks})
+    store['chunks'] = chunks
+
+def iter_chunks(store):
+    """
+    Iterate over the chunks of a store, as read-only memory-mapped arrays.
+    """
+    for chunk in store['chunks']:
+        yield np.load(os.path.join(store['path'], chunk['file']), mmap_mode='r')
+
+def read_rows(store, start = 0, stop = None):
+    """
+    Rows start, ..., stop - 1 of a store (all rows by default), as an array.
+    """
+    stop = num_rows(store) if stop is None else min(stop, num_rows(store))
+    parts, offset = [], 0
+    for chunk, values in zip(store['chunks'], iter_chunks(store)):
+        lo, hi = max(start - offset, 0), min(stop - offset, chunk['rows'])
+        if lo < hi:
+            parts.append(np.array(values[lo:hi]))
+        offset += chunk['rows']
+    if not parts:
+        return np.empty((0, len(store['featureNames'])))
+    return np.concatenate(parts)
+
+def read_columns(store, names):
+    """
+    The given features (columns) of all rows of a store, as a (rows, len(names))
+    array.
+    """
+    index = {name: i for i, name in enumerate(store['featureNames'])}
+    missing = [name for name in names if name not in index]
+    if missing:
+        raise ValueError(f"Unknown features: {missing}")
+    columns = [index[name] for name in names]
+    parts = [np.array(values[:, columns]) for values in iter_chunks(store)]
+    if not parts:
+        return np.empty((0, len(columns)))
+    return np.concatenate(parts)
+
+def compute_store(path, series, labels = None, chunkSize = 100, cache = None, verbose = False):
+    """
+    Compute the features of the given master operations (all of the catalogue by
+    default) for each time series, writing them to the feature store at path in
+    chunks of chunkSize rows. If the store exists (e.g., after an interrupted run),
+    the series already stored are skipped and computing resumes from the end of
+    the last completed chunk.
+
+    Parameters:
+    -----------
+    series : iterable
+        The time series, or (id, time series) pairs, always in the same order.
+    labels : list of str, optional
+        The master operations (must match the store's, when resuming).
+    chunkSize : int, optional
+        The number of rows per chunk.
+    cache : dict, optional
+        A result cache (see resultcache) to look master operations up in, so
+        that only the features not computed before are computed.
+
+    Returns:
+    --------
+    store : dict
+        The completed store.
+    """
+    from Utils import planner
+
+    if os.path.exists(os.path.join(path, _schemaFile)):
+        store = open_store(path)
+        if store['labels'] is None or (labels is not None and list(labels) != store['labels']) \
+                or store['featureNames'] != catalogue.feature_names(store['labels']):
+            raise ValueError(f"The feature store at {path} has a different schema")
+    else:
+        store = create_store(path, labels=labels)
+    labels = store['labels']
+    plan = planner.build_plan(labels)
+    doneIds = row_ids(store)
+
+    rows, ids = [], []
+    # the operations are wrapped for planning once, for all of the series
+    with planner.tracing(plan):
+        for i, item in enumerate(series):
+            rowId, x = item if isinstance(item, tuple) else (i, item)
+            if i < len(doneIds):
+                if doneIds[i] != rowId:
+                    raise ValueError(f"Series {i} has id {rowId!r}, but the store holds {doneIds[i]!r}")
+                continue
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    values, _ = planner.compute_features(x, plan=plan, cache=cache)
+            except Exception as err:
+                if verbose:
+                    print(f"Series {rowId!r} failed: {err!r}")
+                values = np.full(len(store['featureNames']), np.nan)
+            rows.append(values)
+            ids.append(rowId)
+            if len(rows) == chunkSize:
+                append_rows(store, np.vstack(rows), ids)
+                if verbose:
+                    print(f"Stored {num_rows(store)} series")
+                rows, ids = [], []
+    if rows:
+        append_rows(store, np.vstack(rows), ids)
+    return store
+
+def _write_json(path, content):
+    """
+    Write a JSON file atomically (to a temporary file, then renamed).
+    """
+    with open(path + '.tmp', 'w') as f:
+        json.dump(content, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + '.tmp', path)
@@ -0,0 +1,185 @@
+"""
+Opt-in instrumentation of the Operations and PeripheryFunctions calls.
+
+Within profiled(), every call of a public function of these packages (the
+operations, and the functions they call, however deeply nested) is recorded with
+its start and end times, its position in the call stack and, optionally, its peak
+memory allocation (through tracemalloc, which slows execution down noticeably).
+Only the modules imported before entering profiled() are instrumented. Outside
+of profiled() the functions are left untouched, so instrumentation costs nothing
+when it is not used.
+
+    from Utils import instrument
+    with instrument.profiled(memory=True) as profile:
+        CO_Embed2(y)
+    print(instrument.format_summary(profile))
+    instrument.write_folded(profile, 'calls.folded') # for flamegraph.pl or speedscope
+    instrument.write_trace(profile, 'calls.json') # for chrome://tracing or Perfetto
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from Utils.patching import patched_functions
+
+@contextmanager
+def profiled(memory = False):
+    """
+    Context in which all Operations and PeripheryFunctions calls are recorded.
+
+    Parameters:
+    -----------
+    memory : bool, optional
+        Whether to record the peak memory allocated by each call (default False).
+
+    Yields:
+    -------
+    profile : dict
+        'calls': one record per call, in order of completion, with 'name',
+            'stack' (the names of the calling functions, outermost first, then
+            name), 'start' and 'end' (s, from the start of profiling), 'time'
+            (total) and 'selfTime' (excluding the recorded calls it made) (s),
+            'peakMemory' (bytes allocated at the peak of the call, if memory),
+            'error' (whether the call raised an exception),
+        'memory': whether memory was recorded.
+    """
+    profile = {'calls': [], 'memory': memory}
+    state = {'stack': [], 'origin': time.perf_counter()}
+    startedTracing = memory and not tracemalloc.is_tracing()
+    if startedTracing:
+        tracemalloc.start()
+    try:
+        with patched_functions(lambda func: _instrumented(func, profile, state)):
+            yield profile
+    finally:
+        if startedTracing:
+            tracemalloc.stop()
+
+def _instrumented(func, profile, state):
+    """
+    Wrapper of a function that records its calls in profile.
+    """
+    name = func.__name__
+    memory = profile['memory']
+
+    def wrapper(*args, **kwargs):
+        stack = state['stack']
+        frame = {'name': name, 'childTime': 0.0}
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # the peak so far belongs to the caller
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['base'] = frame['peak'] = current
+        stack.append(frame)
+        error = True
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            end = time.perf_counter()
+            stack.pop()
+            elapsed = end - start
+            record = {'name': name, 'stack': [f['name'] for f in stack] + [name],
+                      'start': start - state['origin'], 'end': end - state['origin'],
+                      'time': elapsed, 'selfTime': elapsed - frame['childTime'], 'error': error}
+            if memory:
+                frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                record['peakMemory'] = frame['peak'] - frame['base']
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+            if stack:
+                stack[-1]['childTime'] += elapsed
+            profile['calls'].append(record)
+
+    wrapper.__wrapped__ = func
+    wrapper.__name__ = name
+    wrapper.__module__ = func.__module__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+def summary(profile):
+    """
+    Statistics of each function in a profile, sorted by self time (descending).
+
+    Returns:
+    --------
+    rows : list of dict
+        With 'name', 'calls', 'time' (cumulative; nested calls of a function
+        within itself are only counted once), 'selfTime', 'meanTime' (time per
+        call), 'peakMemory' (the largest peak of its calls, if recorded) and
+        'errors' (the number of calls that raised an exception).
+    """
+    rows = {}
+    for record in profile['calls']:
+        name = record['name']
+        row = rows.setdefault(name, {'name': name, 'calls': 0, 'time': 0.0, 'selfTime': 0.0,
+                                     'peakMemory': 0 if profile['memory'] else None, 'errors': 0})
+        row['calls'] += 1
+        row['selfTime'] += record['selfTime']
+        row['errors'] += record['error']
+        if name not in record['stack'][:-1]:
+            row['time'] += record['time']
+        if profile['memory']:
+            row['peakMemory'] = max(row['peakMemory'], record['peakMemory'])
+
+    rows = sorted(rows.values(), key=lambda row: -row['selfTime'])
+    for row in rows:
+        row['meanTime'] = row['time'] / row['calls']
+    return rows
+
+def format_summary(profile, top = None):
+    """
+    The summary of a profile as a text table (of the top functions by self time).
+    """
+    rows = summary(profile)[:top]
+    header = f"{'function':<28} {'calls':>8} {'cum. time (s)':>14} {'self time (s)':>14} {'per call (s)':>13}"
+    if profile['memory']:
+        header += f" {'peak mem. (MiB)':>16}"
+    lines = [header, '-'*len(header)]
+    for row in rows:
+        line = (f"{row['name']:<28} {row['calls']:>8} {row['time']:>14.4g} "
+                f"{row['selfTime']:>14.4g} {row['meanTime']:>13.4g}")
+        if profile['memory']:
+            line += f" {row['peakMemory']/2**20:>16.4g}"
+        lines.append(line)
+    return '\n'.join(lines)
+
+def folded_stacks(profile):
+    """
+    The profile in the folded-stack format of flame graphs (flamegraph.pl,
+    speedscope, ...): one line per distinct call stack, 'outer;...;inner self',
+    with the self time in microseconds.
+    """
+    totals = {}
+    for record in profile['calls']:
+        key = ';'.join(record['stack'])
+        totals[key] = totals.get(key, 0.0) + record['selfTime']
+    return [f'{stack} {round(t*1e6)}' for stack, t in totals.items()]
+
+def write_folded(profile, path):
+    """
+    Write the folded stacks of a profile (see folded_stacks) to a file.
+    """
+    with open(path, 'w') as f:
+        f.write('\n'.join(folded_stacks(profile)) + '\n')
+
+def write_trace(profile, path):
+    """
+    Write a profile as a Chrome trace (JSON trace events; for chrome://tracing,
+    Perfetto or speedscope), with one complete event per call.
+    """
+    events = []
+    for record in profile['calls']:
+        event = {'name': record['name'], 'ph': 'X', 'pid': 0, 'tid': 0,
+                 'ts': record['start']*1e6, 'dur': record['time']*1e6,
+                 'args': {'selfTime': record['selfTime'], 'error': record['error']}}
+        if profile['memory']:
+            event['args']['peakMemory'] = record['peakMemory']
+        events.append(event)
+    events.sort(key=lambda event: event['ts'])
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,90 @@
+"""
+Compiled (numba) kernels.
+
+Kernels are defined next to the operations that use them, and decorated with
+kernel(*signatures). Each kernel is compiled, for its explicit type signatures
+only, the first time it is called (numba is not imported until then), or up
+front by warmup(). Compiled code is cached on disk (numba's cache=True, in the
+__pycache__ folder next to the kernel's module), so that later processes load
+it rather than compiling it again.
+
+Since a kernel only accepts its declared types, the functions calling it pass
+contiguous arrays of the declared dtypes.
+
+Typical use, in a parent process before forking workers:
+
+    from Utils.kernels import warmup
+    warmup()
+"""
+import functools
+import importlib
+import time
+
+# Modules that define kernels (imported by warmup)
+KERNEL_MODULES = [
+    'PeripheryFunctions.PN_sampenc',
+    'PeripheryFunctions.BF_RunLengths',
+    'Operations.CO_Embed2_Basic',
+    'Operations.EX_MovingThreshold',
+    'Operations.PH_ForcePotential',
+]
+
+# Registered kernels, keyed by 'module.name'
+_kernels = {}
+
+def kernel(*signatures, cache = True, **options):
+    """
+    Decorator declaring a compiled kernel with the given numba type signatures
+    (e.g., 'int64[:, ::1](float64[::1], int64[::1])'), compiled in nopython mode.
+
+    The decorated function keeps the plain Python version as py_func (as numba's
+    dispatchers do), and the numba dispatcher, once compiled, as dispatcher.
+    """
+    if len(signatures) == 0:
+        raise ValueError("A kernel needs at least one type signature")
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args):
+            if wrapper.dispatcher is None:
+                _compile(wrapper)
+            return wrapper.dispatcher(*args)
+
+        wrapper.dispatcher = None
+        wrapper.py_func = func
+        wrapper.signatures = list(signatures)
+        wrapper.options = {'nopython': True, 'cache': cache, **options}
+        _kernels[f'{func.__module__}.{func.__name__}'] = wrapper
+        return wrapper
+
+    return decorator
+
+def _compile(wrapper):
+    """
+    Compile a kernel for all of its signatures (or load it from the cache).
+    """
+    from numba import jit
+    wrapper.dispatcher = jit(wrapper.signatures, **wrapper.options)(wrapper.py_func)
+
+def warmup(modules = None):
+    """
+    Compile all kernels (those in KERNEL_MODULES, or the given modules, and any
+    others already imported) that are not compiled yet.
+
+    Returns:
+    --------
+    times : dict
+        The time (s) taken to compile (or load from the cache) each kernel,
+        keyed by 'module.name'.
+    """
+    for module in (KERNEL_MODULES if modules is None else modules):
+        importlib.import_module(module)
+
+    times = {}
+    for name, wrapper in _kernels.items():
+        if wrapper.dispatcher is not None:
+            continue
+        tic = time.perf_counter()
+        _compile(wrapper)
+        times[name] = time.perf_counter() - tic
+    return times
@@ -0,0 +1,63 @@
+import inspect
+import sys
+from contextlib import contextmanager
+
+@contextmanager
+def patched_functions(wrap, packages = ('Operations', 'PeripheryFunctions'), within = None):
+    """
+    Context in which every public function of the (imported) modules of the given
+    packages is replaced by wrap(function), wherever it is referenced from (any
+    imported module, including the Operations modules that import it from
+    another one), so that nested calls (e.g., CO_FirstCrossing inside CO_Embed2)
+    are wrapped too. The functions are restored on exit.
+
+    Parameters:
+    -----------
+    wrap : callable
+        Returns the wrapper of a function (called once per function).
+    packages : tuple of str
+        The packages whose functions are wrapped.
+    within : tuple of str, optional
+        The packages whose modules have their references replaced (by default,
+        every imported module; scanning only the packages is much faster when
+        many modules are imported).
+    """
+    prefixes = tuple(f'{package}.' for package in packages)
+    if within is None:
+        modules = [m for m in list(sys.modules.values()) if m is not None]
+    else:
+        scope = tuple(f'{package}.' for package in within)
+        modules = [m for name, m in list(sys.modules.items()) if m is not None
+                   and (name in within or name.startswith(scope))]
+    # the functions (each is an attribute of its own module), found before patching
+    functions = {value for name, m in list(sys.modules.items()) if name.startswith(prefixes) and m is not None
+                 for value in list(vars(m).values()) if _is_public_function(value, prefixes)}
+    targets = []
+    for module in modules:
+        try:
+            namespace = list(vars(module).items())
+        except TypeError:
+            continue
+        targets += [(module, name, value) for name, value in namespace
+                    if inspect.isfunction(value) and value in functions]
+    wrappers = {}
+    patched = []
+    try:
+        for module, name, value in targets:
+            if value not in wrappers:
+                wrappers[value] = wrap(value)
+            setattr(module, name, wrappers[value])
+            patched.append((module, name, value))
+        yield
+    finally:
+        for module, name, value in reversed(patched):
+            setattr(module, name, value)
+
+def _is_public_function(value, prefixes):
+    """
+    Whether value is a public function defined in a module with one of the prefixes.
+    """
+    if not inspect.isfunction(value) or value.__name__.startswith('_'):
+        return False
+    module = getattr(value, '__module__', '') or ''
+    return module.startswith(prefixes) and getattr(sys.modules.get(module), value.__name__, None) is value
@@ -0,0 +1,413 @@
+"""
+Execution planner for computing a set of master operations (see catalogue.py)
+on a single time series, evaluating shared sub-computations only once.
+
+The plan is a DAG of (function, arguments) nodes. Its roots are the two inputs
+(the raw and z-scored series), and identical master operations (the same
+operation, input and parameters) are merged when the plan is built. When the
+plan is executed, the calls that operations make to other operations (e.g.,
+CO_StickAngles -> CO_FirstCrossing -> CO_AutoCorr, SY_DynWin -> EN_SampEn), and
+to shared helpers (e.g., the sort of the series, BF_SortedValues), are added to
+the DAG as they are made: each is keyed by its function and its bound arguments
+(arrays by their contents), so a call that matches an existing node reuses that
+node's result rather than being evaluated again. Nodes are
+evaluated depth first, so each is completed after all of its dependencies (in
+topological order).
+
+Calls that are not reproducible (an unseeded random number generator) or that
+return stateful objects (JIDT calculators) are always evaluated. Results are
+shared between calls as read-only arrays (in fresh containers), not copies.
+
+The operations are wrapped for planning within tracing(); computing a batch of
+series within a single tracing() context installs the wrappers once, rather
+than once per series.
+"""
+import copy
+import hashlib
+import inspect
+import time
+import warnings
+from contextlib import contextmanager
+import numpy as np
+from Utils import catalogue
+from Utils.patching import patched_functions
+
+# Operations whose outputs are stateful objects, not results
+_uncacheable = {'IN_Initialize_MI'}
+
+# Functions of PeripheryFunctions shared by several operations, whose calls are
+# added to the plan like the calls between operations
+_sharedFunctions = {'BF_SortedValues'}
+
+# Types of argument values that are their own keys
+_scalarTypes = {bool, int, float, complex, str, bytes, type(None)}
+
+# Whether the wrappers are installed, and the state of the plan being executed
+_tracer = {'active': False, 'state': None}
+
+def build_plan(labels = None):
+    """
+    Plan for computing the given master operations (all of the catalogue by
+    default), with identical master operations merged into a single node.
+
+    Returns:
+    --------
+    plan : dict
+        'labels': the master operations, in catalogue order,
+        'nodes': {nodeKey: {'operation', 'input', 'params', 'labels'}}, one per
+                 distinct master operation (in order of first appearance),
+        'merged': the number of master operations merged into another.
+    """
+    masters = catalogue.master_operations(labels=labels)
+    if labels is not None:
+        unknown = set(labels) - {entry['label'] for entry in masters}
+        if unknown:
+            raise ValueError(f"Unknown master operations: {sorted(unknown)}")
+
+    nodes = {}
+    for entry in masters:
+        key = (entry['operation'], entry['input'], _freeze(entry['params']))
+        if key not in nodes:
+            nodes[key] = {'operation': entry['operation'], 'input': entry['input'],
+                          'params': entry['params'], 'labels': []}
+        nodes[key]['labels'].append(entry['label'])
+
+    return {'labels': [entry['label'] for entry in masters], 'nodes': nodes,
+            'merged': len(masters) - len(nodes)}
+
+def execute_plan(plan, x, cache = None):
+    """
+    Execute a plan (from build_plan) on a raw time series, x. Given a result
+    cache (see resultcache), master operations are looked up in it before being
+    computed, and their outputs stored in it.
+
+    Returns:
+    --------
+    (outputs, report) : tuple
+        outputs (dict): the output of each master operation, keyed by label (the
+            exception raised, for master operations that failed),
+        report (dict): the work done and eliminated:
+            'nodes': the number of distinct calls evaluated,
+            'calls': the number of calls an unplanned evaluation would make,
+            'eliminated': calls - nodes,
+            'mergedMasters': master operations merged when planning,
+            'timeSaved': the estimated time (s) of the eliminated calls,
+            'time': the time (s) taken to execute the plan,
+            'byFunction': {function: number of eliminated calls},
+            'edges': the (caller, callee) pairs of function names in the DAG,
+            'cacheHits': the master operations found in the cache,
+            'overhead': the time (s) spent planning: keying calls, sharing
+                results and (outside tracing()) installing the wrappers,
+            'netTimeSaved': timeSaved - overhead.
+    """
+    state = {'nodes': {}, 'stack': [], 'order': [], 'calls': 0, 'timeSaved': 0.0,
+             'byFunction': {}, 'edges': set(), 'overhead': 0.0}
+    inputs = {inputType: catalogue.prepare_input(x, inputType) for inputType in ['raw', 'z']}
+
+    tic = time.perf_counter()
+    outputs = {}
+    with tracing(plan):
+        _tracer['state'] = state
+        loopStart = time.perf_counter()
+        try:
+            _execute_nodes(plan, inputs, state, outputs, cache)
+        finally:
+            _tracer['state'] = None
+        loopTime = time.perf_counter() - loopStart
+    elapsed = time.perf_counter() - tic
+    # installing and removing the wrappers (unless they are installed for a batch)
+    state['overhead'] += elapsed - loopTime
+
+    numNodes = len(state['order'])
+    report = {'nodes': numNodes, 'calls': state['calls'], 'eliminated': state['calls'] - numNodes,
+              'mergedMasters': plan['merged'], 'timeSaved': state['timeSaved'], 'time': elapsed,
+              'byFunction': state['byFunction'], 'edges': sorted(state['edges']),
+              'cacheHits': state['cacheHits'], 'overhead': state['overhead'],
+              'netTimeSaved': state['timeSaved'] - state['overhead']}
+    return outputs, report
+
+def _execute_nodes(plan, inputs, state, outputs, cache):
+    """
+    Evaluate the nodes of a plan (within tracing()), storing the output of each
+    master operation in outputs.
+    """
+    if cache is not None:
+        from Utils import resultcache
+    state['cacheHits'] = 0
+    for node in plan['nodes'].values():
+        func = catalogue.get_operation(node['operation'])
+        numEvaluated = len(state['order'])
+        key = None
+        if cache is not None:
+            key = resultcache.call_key(func, (inputs[node['input']],), node['params'], cache)
+        found = False
+        if key is not None:
+            found, out = resultcache.get(cache, key)
+            state['cacheHits'] += found
+        if not found:
+            try:
+                out = func(inputs[node['input']], **node['params'])
+            except Exception as err:
+                out = err
+            # a failure to store the output is not a failure of the operation
+            if key is not None and not isinstance(out, Exception):
+                try:
+                    resultcache.put(cache, key, node['operation'], out)
+                except Exception as err:
+                    warnings.warn(f"Could not store the output of {node['operation']} in the result cache: {err!r}")
+        for label in node['labels']:
+            outputs[label] = out
+
+        # merged master operations are eliminated calls too (with their sub-calls)
+        numMerged = len(node['labels']) - 1
+        if numMerged > 0:
+            root = None
+            if len(state['order']) > numEvaluated:
+                root = state['nodes'].get(state['order'][-1])
+            state['calls'] += numMerged*(root['calls'] if root is not None else 1)
+            state['timeSaved'] += numMerged*(root['time'] if root is not None else 0.0)
+            state['byFunction'][node['operation']] = state['byFunction'].get(node['operation'], 0) + numMerged
+
+def compute_features(x, labels = None, plan = None, cache = None):
+    """
+    Feature vector of a raw time series, x, for the given master operations (all
+    of the catalogue by default), ordered as catalogue.feature_names(labels).
+    Features of master operations that fail are NaN. Master operations are looked
+    up in the result cache, if one is given (see execute_plan).
+
+    Returns:
+    --------
+    (features, report) : tuple
+        The feature values (numpy.ndarray) and the report from execute_plan.
+    """
+    if plan is None:
+        plan = build_plan(labels)
+    outputs, report = execute_plan(plan, x, cache=cache)
+    features = [np.full(len(catalogue.output_names(label)), np.nan) if isinstance(outputs[label], Exception)
+                else catalogue.flatten_output(label, outputs[label]) for label in plan['labels']]
+    return np.concatenate(features) if features else np.array([]), report
+
+@contextmanager
+def tracing(*plans):
+    """
+    Context in which the operations (and shared functions) are wrapped for
+    execute_plan. Executing plans on a batch of series within it installs the
+    wrappers once, rather than once per series:
+
+        with planner.tracing(plan):
+            for x in series:
+                features, _ = planner.compute_features(x, plan=plan)
+
+    The operations of the given plans (and those they call) are imported first,
+    so that they are wrapped. Outside of execute_plan, the wrapped functions
+    behave as the originals.
+    """
+    if _tracer['active']:
+        yield
+        return
+    # import the operations (and those they call) before they are traced
+    for plan in plans:
+        for node in plan['nodes'].values():
+            catalogue.get_operation(node['operation'])
+    with patched_functions(lambda func: _traced(func) if _is_traced(func) else func,
+                           packages=('Operations', 'PeripheryFunctions'),
+                           within=('Operations', 'PeripheryFunctions')):
+        _tracer['active'] = True
+        try:
+            yield
+        finally:
+            _tracer['active'] = False
+
+def _is_traced(func):
+    """
+    Whether calls of a function are added to the plan: the operations, and the
+    shared functions of PeripheryFunctions.
+    """
+    return func.__module__.startswith('Operations.') or func.__name__ in _sharedFunctions
+
+def _traced(func):
+    """
+    Wrapper of an operation that evaluates each distinct call once, recording
+    the DAG of calls in the state of the plan being executed.
+    """
+    name = func.__name__
+    parameters = _parameters(inspect.signature(func))
+
+    def wrapper(*args, **kwargs):
+        state = _tracer['state']
+        if state is None:
+            return func(*args, **kwargs)
+        tic = time.perf_counter()
+        key = _call_key(name, parameters, args, kwargs)
+        state['calls'] += 1
+        if state['stack']:
+            state['edges'].add((state['stack'][-1], name))
+
+        node = state['nodes'].get(key) if key is not None else None
+        if node is not None:
+            # the call, and all the calls it made, are eliminated
+            state['timeSaved'] += node['time']
+            state['calls'] += node['calls'] - 1
+            state['byFunction'][name] = state['byFunction'].get(name, 0) + node['calls']
+            if 'error' in node:
+                state['overhead'] += time.perf_counter() - tic
+                raise node['error']
+            result = _shared(node['result'])
+            state['overhead'] += time.perf_counter() - tic
+            return result
+
+        callsBefore = state['calls']
+        state['stack'].append(name)
+        state['overhead'] += time.perf_counter() - tic
+        tic = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            error = None
+        except Exception as err:
+            error = err
+        finally:
+            state['stack'].pop()
+        node = {'function': name, 'calls': state['calls'] - callsBefore + 1,
+                'time': time.perf_counter() - tic}
+        tic = time.perf_counter()
+        if error is not None:
+            node['error'] = error
+        else:
+            # the first caller gets the shared (read-only) result too, so that
+            # every call sees the same result
+            node['result'] = _frozen(result)
+            result = _shared(node['result'])
+        state['order'].append(key)
+        if key is not None:
+            state['nodes'][key] = node
+        state['overhead'] += time.perf_counter() - tic
+        if error is not None:
+            raise error
+        return result
+
+    wrapper.__wrapped__ = func
+    wrapper.__name__ = name
+    wrapper.__module__ = func.__module__
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+def _frozen(value):
+    """
+    A result prepared for sharing between calls: arrays are made read-only
+    (copied first if they are writable views, e.g., of an argument), and the
+    items of dicts, lists and tuples are frozen. Other mutable objects are
+    deep-copied.
+    """
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return copy.deepcopy(value)
+        if value.flags.writeable:
+            if not value.flags.owndata:
+                value = value.copy()
+            value.flags.writeable = False
+        return value
+    if isinstance(value, dict):
+        return {k: _frozen(v) for k, v in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(_frozen(v) for v in value)
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        return value
+    return copy.deepcopy(value)
+
+def _shared(value):
+    """
+    A frozen result (see _frozen) as returned to a caller: the read-only arrays
+    themselves, in fresh dicts and lists (so that callers can modify these).
+    """
+    if isinstance(value, dict):
+        return {k: _shared(v) for k, v in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(_shared(v) for v in value)
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return value
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        return value
+    return copy.deepcopy(value)
+
+def _call_key(name, parameters, args, kwargs):
+    """
+    Key of a call of a function (with the given _parameters; None if the call
+    cannot be reused).
+    """
+    if name in _uncacheable:
+        return None
+    arguments = _bind(parameters, args, kwargs)
+    if arguments is None:
+        return None
+    # unseeded random number generators are not reproducible
+    if 'randomSeed' in arguments and arguments['randomSeed'] is None:
+        return None
+    if name == 'DN_RemovePoints' and arguments.get('removeHow') == 'random':
+        return None
+    try:
+        return (name, _freeze(arguments))
+    except TypeError:
+        return None
+
+def _parameters(signature):
+    """
+    How calls of a function with the given signature are bound by _bind:
+    (signature, whether it has only positional-or-keyword parameters, the
+    parameter names, the defaults).
+    """
+    parameters = signature.parameters
+    isSimple = all(parameter.kind == inspect.Parameter.POSITIONAL_OR_KEYWORD for parameter in parameters.values())
+    defaults = {name: parameter.default for name, parameter in parameters.items()
+                if parameter.default is not parameter.empty}
+    return signature, isSimple, tuple(parameters), defaults
+
+def _bind(parameters, args, kwargs):
+    """
+    The arguments of a call, by parameter name (with defaults applied), or None
+    if the arguments do not match the signature (see _parameters). Signatures
+    with only positional-or-keyword parameters (those of the operations) are
+    bound directly; others by inspect.Signature.bind.
+    """
+    signature, isSimple, names, defaults = parameters
+    if isSimple:
+        if len(args) > len(names) or any(name in kwargs for name in names[:len(args)]):
+            return None
+        arguments = dict(zip(names, args))
+        for name in names[len(args):]:
+            if name in kwargs:
+                arguments[name] = kwargs[name]
+            elif name in defaults:
+                arguments[name] = defaults[name]
+            else:
+                return None
+        # unknown keyword arguments
+        if any(name not in arguments for name in kwargs):
+            return None
+        return arguments
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        return None
+    bound.apply_defaults()
+    return bound.arguments
+
+def _freeze(value):
+    """
+    Hashable version of an argument value (arrays are keyed by their contents).
+    """
+    if type(value) in _scalarTypes:
+        return value
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return ('object-array', _freeze(value.tolist()))
+        digest = hashlib.blake2b(np.ascontiguousarray(value).view(np.uint8), digest_size=16).hexdigest()
+        return ('array', value.dtype.str, value.shape, digest)
+    if isinstance(value, dict):
+        return ('dict', tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return value
+    raise TypeError(f"Cannot key an argument of type {type(value).__name__}")
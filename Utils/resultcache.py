@@ -0,0 +1,213 @@
+"""
+Persistent cache of operation outputs, keyed by content.
+
+Each output is stored under a key computed from the operation, its arguments
+bound to its signature (with defaults filled in, so that equivalent calls share
+a key), the contents of any array arguments (the time series, by the hash of its
+bytes, dtype and shape), and the library version (a hash of the source of the
+Operations and PeripheryFunctions modules and of the versions of the numerical
+libraries they use, so that changing the code or upgrading a dependency
+invalidates the cache). Calls that are not reproducible (see planner) are never cached, nor
+are calls that raise exceptions.
+
+The cache is an SQLite database, capped at maxBytes of stored outputs: once over
+the cap, the least recently used outputs are evicted.
+
+The batch engine (planner.execute_plan, planner.compute_features and
+featurestore.compute_store) consults the cache when given one, so that extending
+a feature set only computes the new master operations. Direct calls consult it
+within enabled(cache):
+
+    cache = resultcache.open_cache('results.sqlite')
+    with resultcache.enabled(cache):
+        out = CO_Embed2(y) # from the cache, if it was computed before
+"""
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import time
+from contextlib import contextmanager
+from importlib import metadata
+from Utils.patching import patched_functions
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_libraryVersion = None
+
+# Libraries whose version changes the outputs of the operations
+_dependencies = ['numpy', 'scipy', 'statsmodels', 'arch']
+
+def library_version():
+    """
+    Hash of the source of the Operations and PeripheryFunctions modules, and of
+    the installed versions of the libraries in _dependencies.
+    """
+    global _libraryVersion
+    if _libraryVersion is None:
+        digest = hashlib.blake2b(digest_size=16)
+        for package in ['Operations', 'PeripheryFunctions']:
+            for path in sorted(glob.glob(os.path.join(_root, package, '*.py'))):
+                digest.update(os.path.basename(path).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        for name in _dependencies:
+            try:
+                version = metadata.version(name)
+            except metadata.PackageNotFoundError:
+                version = None
+            digest.update(f'{name}=={version}'.encode())
+        _libraryVersion = digest.hexdigest()
+    return _libraryVersion
+
+def open_cache(path, maxBytes = 2**30, version = None):
+    """
+    Open (or create) a result cache.
+
+    Parameters:
+    -----------
+    path : str
+        The SQLite database file.
+    maxBytes : int, optional
+        The cap on the total size of the stored outputs (default 1 GiB).
+    version : str, optional
+        The library version the keys are made with (default library_version()).
+
+    Returns:
+    --------
+    cache : dict
+        With the 'connection', 'maxBytes', 'version', and the numbers of 'hits'
+        and 'misses' (of this process).
+    """
+    connection = sqlite3.connect(path, timeout=60)
+    with connection:
+        connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, operation TEXT, '
+                           'value BLOB, size INTEGER, lastAccess REAL)')
+        connection.execute('CREATE INDEX IF NOT EXISTS resultsByAccess ON results (lastAccess)')
+        connection.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER)')
+        connection.execute("INSERT OR IGNORE INTO meta VALUES ('totalBytes', 0)")
+    return {'path': path, 'connection': connection, 'maxBytes': int(maxBytes),
+            'version': library_version() if version is None else version, 'hits': 0, 'misses': 0}
+
+def close_cache(cache):
+    cache['connection'].close()
+
+def call_key(func, args, kwargs, cache):
+    """
+    The key of a call of an operation (None if the call is not cached).
+    """
+    from Utils.planner import _call_key
+    func = inspect.unwrap(func)
+    key = _call_key(func.__name__, _parameters(func), args, kwargs)
+    if key is None:
+        return None
+    return hashlib.sha256(repr((cache['version'], func.__module__, key)).encode()).hexdigest()
+
+def get(cache, key):
+    """
+    Look up a key. Returns (True, output) if it is in the cache, else (False, None).
+    """
+    connection = cache['connection']
+    row = connection.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+    if row is None:
+        cache['misses'] += 1
+        return False, None
+    with connection:
+        connection.execute('UPDATE results SET lastAccess = ? WHERE key = ?', (time.time(), key))
+    cache['hits'] += 1
+    return True, pickle.loads(row[0])
+
+def put(cache, key, operation, output):
+    """
+    Store an output under a key, evicting the least recently used outputs if
+    the cache is over its cap.
+    """
+    value = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+    connection = cache['connection']
+    with connection:
+        old = connection.execute('SELECT size FROM results WHERE key = ?', (key,)).fetchone()
+        connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                           (key, operation, value, len(value), time.time()))
+        connection.execute("UPDATE meta SET value = value + ? WHERE name = 'totalBytes'",
+                           (len(value) - (old[0] if old else 0),))
+        _evict(connection, cache['maxBytes'])
+
+def _evict(connection, maxBytes):
+    """
+    Remove the least recently used outputs until the total size is within maxBytes.
+    """
+    total = connection.execute("SELECT value FROM meta WHERE name = 'totalBytes'").fetchone()[0]
+    while total > maxBytes:
+        rows = connection.execute('SELECT key, size FROM results ORDER BY lastAccess LIMIT 100').fetchall()
+        if not rows:
+            break
+        removed = []
+        for key, size in rows:
+            if total <= maxBytes:
+                break
+            removed.append((key,))
+            total -= size
+        connection.executemany('DELETE FROM results WHERE key = ?', removed)
+    connection.execute("UPDATE meta SET value = ? WHERE name = 'totalBytes'", (max(total, 0),))
+
+def cache_stats(cache):
+    """
+    The number of stored outputs, their total size (bytes), and the hits and
+    misses of this process.
+    """
+    connection = cache['connection']
+    count = connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+    total = connection.execute("SELECT value FROM meta WHERE name = 'totalBytes'").fetchone()[0]
+    return {'entries': count, 'bytes': total, 'maxBytes': cache['maxBytes'],
+            'hits': cache['hits'], 'misses': cache['misses']}
+
+def cached_call(cache, func, *args, **kwargs):
+    """
+    Call an operation through the cache: the stored output if there is one,
+    otherwise the output of the call (which is then stored).
+    """
+    key = call_key(func, args, kwargs, cache)
+    if key is not None:
+        found, output = get(cache, key)
+        if found:
+            return output
+    output = func(*args, **kwargs)
+    if key is not None:
+        put(cache, key, func.__name__, output)
+    return output
+
+@contextmanager
+def enabled(cache):
+    """
+    Context in which direct calls of the operations consult the cache. Only
+    outermost calls are cached (not the calls operations make to each other).
+    """
+    state = {'depth': 0}
+
+    def wrap(func):
+        def wrapper(*args, **kwargs):
+            if state['depth'] > 0:
+                return func(*args, **kwargs)
+            state['depth'] += 1
+            try:
+                return cached_call(cache, func, *args, **kwargs)
+            finally:
+                state['depth'] -= 1
+
+        wrapper.__wrapped__ = func
+        wrapper.__name__ = func.__name__
+        wrapper.__module__ = func.__module__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+
+    with patched_functions(wrap, packages=('Operations',)):
+        yield cache
+
+_signatures = {}
+
+def _parameters(func):
+    from Utils.planner import _parameters
+    if func not in _signatures:
+        _signatures[func] = _parameters(inspect.signature(func))
+    return _signatures[func]
@@ -0,0 +1,340 @@
+"""
+Cost-model scheduling of feature computation across worker processes.
+
+The costs of the operations differ by orders of magnitude (DN_Mean is linear in
+the series length N, EN_ApEN, CO_Embed2_Shapes and SY_RangeEvolve are quadratic,
+the JIDT operations carry the overhead of the JVM), so splitting the series
+evenly across workers leaves them idle behind a straggler. Instead, each
+operation in the catalogue carries a cost model, its time (all of its master
+operations) as a function of N:
+    calibrated from benchmark results (see benchmark.py): the median time over
+        the benchmark series at each measured length, interpolated in log-log
+        space, and extrapolated beyond the longest measured length with the
+        fitted scaling exponent (below the shortest, fixed overheads dominate,
+        so the time is taken as constant),
+    otherwise, a nominal model of the operation's cost class (see
+        catalogue.COST_CLASSES).
+
+The work is split into (series, operation) tasks, whose predicted costs set the
+chunk sizes: expensive tasks are chunks of their own, and cheap tasks of the
+same series are grouped up to a target cost (so that dispatch overhead is
+amortised, and shared sub-computations within a chunk are still evaluated once
+by the planner). Chunks are assigned longest-processing-time first, i.e., in
+decreasing order of predicted cost, each to the first free worker.
+
+    models = scheduler.cost_models('bench.json')
+    features, report = scheduler.compute_parallel('series.dataset', numWorkers=8, models=models)
+"""
+import heapq
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from Utils import catalogue
+
+# Nominal models of the cost classes: (time (s) of all master operations of an
+# operation at N = 1000, scaling exponent)
+_NOMINAL_COSTS = {
+    'N': (1e-3, 1.0),
+    'NlogN': (2e-3, 1.1),
+    'N2': (5e-2, 2.0),
+    'jvm': (5e-2, 1.0),
+}
+
+def fit_cost_model(lengths, times):
+    """
+    Cost model of an operation from its measured times (s) at the given lengths
+    (several measurements per length, e.g., on different series, are summarised
+    by their median).
+
+    Returns:
+    --------
+    model : dict
+        'lengths' and 'times' (the median time at each measured length), and the
+        scaling 'exponent' of the time with the length (see
+        benchmark.scaling_exponent; 1 if it cannot be fitted).
+    """
+    from Utils.benchmark import scaling_exponent
+    lengths, times = np.asarray(lengths, dtype=float), np.asarray(times, dtype=float)
+    valid = np.isfinite(times) & (times > 0)
+    lengths, times = lengths[valid], times[valid]
+    if len(lengths) == 0:
+        raise ValueError("No valid times to fit a cost model to")
+    uniqueLengths = np.unique(lengths)
+    medians = np.array([np.median(times[lengths == N]) for N in uniqueLengths])
+    exponent = scaling_exponent(uniqueLengths, medians)
+    return {'lengths': uniqueLengths.tolist(), 'times': medians.tolist(),
+            'exponent': 1.0 if np.isnan(exponent) else max(exponent, 0.0), 'source': 'benchmark'}
+
+def nominal_cost_model(costClass):
+    """
+    Cost model of a cost class (see catalogue.COST_CLASSES), for operations that
+    have not been benchmarked.
+    """
+    if costClass not in _NOMINAL_COSTS:
+        raise ValueError(f"Unknown cost class '{costClass}'")
+    t, exponent = _NOMINAL_COSTS[costClass]
+    lengths = [100, 10**6]
+    return {'lengths': lengths, 'times': [t*(N/1000)**exponent for N in lengths],
+            'exponent': exponent, 'source': 'nominal'}
+
+def cost_models(benchmarks = None):
+    """
+    Cost model of each operation in the catalogue: calibrated from benchmark
+    results (a dict from benchmark.run_benchmarks, or the path of its JSON file)
+    for the operations that were benchmarked, and nominal otherwise.
+
+    Returns:
+    --------
+    models : dict
+        {operation: model} (see fit_cost_model).
+    """
+    measured = {}
+    if benchmarks is not None:
+        from Utils.benchmark import _load
+        for r in _load(benchmarks)['results']:
+            measured.setdefault(r['operation'], []).append((r['N'], r['time']))
+
+    models = {}
+    for name, entry in catalogue.OPERATIONS.items():
+        if measured.get(name):
+            lengths, times = zip(*measured[name])
+            models[name] = fit_cost_model(lengths, times)
+        else:
+            models[name] = nominal_cost_model(entry['cost'])
+    return models
+
+def predict_time(model, N):
+    """
+    Predicted time (s) of an operation (all of its master operations) on a series
+    of length N.
+    """
+    lengths, times = model['lengths'], model['times']
+    if N <= lengths[0]:
+        return times[0]
+    if N >= lengths[-1]:
+        return times[-1]*(N/lengths[-1])**model['exponent']
+    return float(np.exp(np.interp(np.log(N), np.log(lengths), np.log(times))))
+
+def make_tasks(lengths, labels = None, models = None):
+    """
+    The (series, operation) tasks of computing the given master operations (all
+    of the catalogue by default) on series of the given lengths.
+
+    Returns:
+    --------
+    tasks : list of dict
+        With 'series' (its index), 'operation', 'labels' (its master operations)
+        and 'cost' (the predicted time, s: the operation's time scaled by the
+        fraction of its master operations that are computed).
+    """
+    if models is None:
+        models = cost_models()
+    masters = catalogue.master_operations(labels=labels)
+    byOperation = {}
+    for entry in masters:
+        byOperation.setdefault(entry['operation'], []).append(entry['label'])
+    numMasters = {name: len(catalogue.master_operations(operations=[name])) for name in byOperation}
+
+    tasks = []
+    for i, N in enumerate(lengths):
+        for name, operationLabels in byOperation.items():
+            cost = predict_time(models[name], N)*len(operationLabels)/numMasters[name]
+            tasks.append({'series': i, 'operation': name, 'labels': operationLabels, 'cost': cost})
+    return tasks
+
+def make_chunks(tasks, numWorkers, chunksPerWorker = 4, minChunkTime = 0.05):
+    """
+    Group tasks into chunks of about a target cost: the total cost over
+    numWorkers*chunksPerWorker chunks, but at least minChunkTime (s). Tasks that
+    cost at least the target are chunks of their own; cheaper tasks are grouped
+    with the other tasks of the same series (then of the next series).
+
+    Returns:
+    --------
+    chunks : list of dict
+        With 'tasks' and 'cost' (their total), in decreasing order of cost.
+    """
+    total = sum(task['cost'] for task in tasks)
+    target = max(minChunkTime, total/(numWorkers*chunksPerWorker))
+    chunks = [{'tasks': [task], 'cost': task['cost']} for task in tasks if task['cost'] >= target]
+    current = {'tasks': [], 'cost': 0.0}
+    for task in sorted((task for task in tasks if task['cost'] < target), key=lambda task: task['series']):
+        if current['tasks'] and current['cost'] + task['cost'] > target:
+            chunks.append(current)
+            current = {'tasks': [], 'cost': 0.0}
+        current['tasks'].append(task)
+        current['cost'] += task['cost']
+    if current['tasks']:
+        chunks.append(current)
+    return sorted(chunks, key=lambda chunk: -chunk['cost'])
+
+def lpt_schedule(costs, numWorkers):
+    """
+    Longest-processing-time-first assignment of jobs of the given costs to
+    numWorkers workers: each job, in decreasing order of cost, goes to the worker
+    with the least load so far.
+
+    Returns:
+    --------
+    (assignment, loads) : tuple
+        The indices of the jobs assigned to each worker, and the total cost of
+        each worker (the predicted makespan is max(loads)).
+    """
+    assignment = [[] for _ in range(numWorkers)]
+    loads = [0.0]*numWorkers
+    heap = [(0.0, worker) for worker in range(numWorkers)]
+    for job in sorted(range(len(costs)), key=lambda job: -costs[job]):
+        load, worker = heapq.heappop(heap)
+        assignment[worker].append(job)
+        loads[worker] = load + costs[job]
+        heapq.heappush(heap, (loads[worker], worker))
+    return assignment, loads
+
+def compute_parallel(series, labels = None, numWorkers = None, models = None, chunksPerWorker = 4,
+                     minChunkTime = 0.05):
+    """
+    Feature matrix of a set of time series, computed in numWorkers processes (the
+    number of CPUs by default), with the work chunked and assigned by predicted
+    cost (see make_chunks, lpt_schedule).
+
+    Parameters:
+    -----------
+    series : sequence of array-like, str, dict or tuple
+        The raw time series, or a dataset (see dataset.py): its path, the
+        dataset itself (from open_dataset), or a (dataset or path, indices)
+        pair for some of its series. The series of a dataset are not sent to
+        the workers: each worker opens the dataset and reads the series of its
+        chunks by index from the memory-mapped values.
+    labels : list of str, optional
+        The master operations (all of the catalogue by default).
+    models : dict, optional
+        The cost models (see cost_models; nominal by default).
+
+    Returns:
+    --------
+    (features, report) : tuple
+        The (series, features) matrix (with rows in the order of the series, or
+        of the indices into the dataset), with columns ordered as
+        catalogue.feature_names(labels) (NaN for master operations that fail),
+        and a report with 'numWorkers', 'chunks', the 'predictedTotal' time and
+        'predictedMakespan' (s), and the wall 'time' (s).
+    """
+    from Utils import planner
+    numWorkers = numWorkers or os.cpu_count() or 1
+    labels = planner.build_plan(labels)['labels']
+    columns, start = {}, 0
+    for label in labels:
+        width = len(catalogue.output_names(label))
+        columns[label] = slice(start, start + width)
+        start += width
+
+    tic = time.perf_counter()
+    dataset, indices = _dataset_indices(series)
+    if dataset is None:
+        sources = [np.asarray(x, dtype=float) for x in series]
+        lengths = [len(x) for x in sources]
+    else:
+        from Utils.dataset import series_lengths
+        sources = [(dataset['path'], i) for i in indices]
+        lengths = series_lengths(dataset)[indices].tolist()
+    tasks = make_tasks(lengths, labels, models)
+    chunks = make_chunks(tasks, numWorkers, chunksPerWorker, minChunkTime)
+    _, loads = lpt_schedule([chunk['cost'] for chunk in chunks], numWorkers)
+    jobs = [_chunk_job(chunk, sources) for chunk in chunks]
+
+    features = np.full((len(sources), start), np.nan)
+    if numWorkers == 1:
+        results = map(_run_chunk, jobs)
+    else:
+        # compiled before the workers are forked, so that they inherit the kernels
+        from Utils.kernels import warmup
+        warmup()
+        executor = ProcessPoolExecutor(max_workers=numWorkers)
+        # submitted in decreasing order of cost, so each free worker takes the
+        # longest remaining chunk
+        results = (future.result() for future in as_completed([executor.submit(_run_chunk, job) for job in jobs]))
+    try:
+        for result in results:
+            for i, chunkLabels, values in result:
+                offset = 0
+                for label in chunkLabels:
+                    width = columns[label].stop - columns[label].start
+                    features[i, columns[label]] = values[offset:offset + width]
+                    offset += width
+    finally:
+        if numWorkers > 1:
+            executor.shutdown(cancel_futures=True)
+
+    report = {'numWorkers': numWorkers, 'chunks': len(chunks), 'predictedTotal': sum(loads),
+              'predictedMakespan': max(loads), 'time': time.perf_counter() - tic}
+    return features, report
+
+def _dataset_indices(series):
+    """
+    The dataset (opened) and the indices of its series, if series is a dataset
+    or a (dataset, indices) pair (see compute_parallel), else (None, None).
+    """
+    if isinstance(series, (str, os.PathLike, dict)):
+        dataset, indices = series, None
+    elif isinstance(series, tuple) and len(series) == 2 and isinstance(series[0], (str, os.PathLike, dict)):
+        dataset, indices = series
+    else:
+        return None, None
+    from Utils.dataset import open_dataset, num_series
+    if not isinstance(dataset, dict):
+        dataset = open_dataset(dataset)
+    numSeries = num_series(dataset)
+    if indices is None:
+        return dataset, np.arange(numSeries)
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+    if np.any((indices < -numSeries) | (indices >= numSeries)):
+        raise IndexError(f"Series indices out of range for a dataset of {numSeries} series")
+    return dataset, indices % max(numSeries, 1)
+
+def _chunk_job(chunk, sources):
+    """
+    The work of a chunk: (series index, series or (dataset path, index in the
+    dataset), master operations) for each of its series.
+    """
+    bySeries = {}
+    for task in chunk['tasks']:
+        bySeries.setdefault(task['series'], []).extend(task['labels'])
+    return [(i, sources[i], chunkLabels) for i, chunkLabels in bySeries.items()]
+
+# Datasets opened by a worker process, keyed by path
+_datasets = {}
+
+def _load_series(source):
+    """
+    A series of a job: the series itself, or read from a dataset (opened once
+    per process) by its (path, index).
+    """
+    if not isinstance(source, tuple):
+        return source
+    from Utils.dataset import open_dataset, get_series
+    path, i = source
+    if path not in _datasets:
+        _datasets[path] = open_dataset(path)
+    return get_series(_datasets[path], i)
+
+def _run_chunk(job):
+    """
+    Compute the features of a chunk (in a worker process). Returns (series index,
+    master operations in catalogue order, feature values) for each of its series.
+    """
+    from Utils import planner
+    plans = [planner.build_plan(labels) for _, _, labels in job]
+    results = []
+    # the operations are wrapped for planning once, for the whole chunk
+    with planner.tracing(*plans):
+        for (i, source, _), plan in zip(job, plans):
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    values, _ = planner.compute_features(_load_series(source), plan=plan)
+            except Exception:
+                values = np.full(len(catalogue.feature_names(plan['labels'])), np.nan)
+            results.append((i, plan['labels'], values))
+    return results
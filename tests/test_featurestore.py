@@ -0,0 +1,116 @@
+import os
+import numpy as np
+import pytest
+from Utils import featurestore, planner
+
+LABELS = ['DN_Mean_median', 'DN_Spread_std', 'DN_Burstiness', 'AC_1']
+
+def make_series(numSeries = 7, N = 200):
+    rng = np.random.default_rng(0)
+    return [(f's{i}', np.cumsum(rng.standard_normal(N))) for i in range(numSeries)]
+
+def interrupted(series, stopAt):
+    """
+    The series, with the iteration failing (as a crash would) at series stopAt.
+    """
+    for i, item in enumerate(series):
+        if i == stopAt:
+            raise KeyboardInterrupt
+        yield item
+
+def test_compute_store_matches_planner(tmp_path):
+    series = make_series()
+    store = featurestore.compute_store(str(tmp_path / 'store'), series, labels=LABELS, chunkSize=3)
+    expected = np.array([planner.compute_features(x, LABELS)[0] for _, x in series])
+    assert featurestore.row_ids(store) == [rowId for rowId, _ in series]
+    assert [chunk['rows'] for chunk in store['chunks']] == [3, 3, 1]
+    np.testing.assert_array_equal(featurestore.read_rows(store), expected)
+
+def test_resume_after_crash(tmp_path):
+    series = make_series()
+    path = str(tmp_path / 'store')
+    with pytest.raises(KeyboardInterrupt):
+        featurestore.compute_store(path, interrupted(series, 5), labels=LABELS, chunkSize=2)
+    # only the completed chunks are in the store
+    store = featurestore.open_store(path)
+    assert featurestore.row_ids(store) == ['s0', 's1', 's2', 's3']
+
+    store = featurestore.compute_store(path, series, labels=LABELS, chunkSize=2)
+    reference = featurestore.compute_store(str(tmp_path / 'reference'), series, labels=LABELS, chunkSize=2)
+    assert featurestore.row_ids(store) == featurestore.row_ids(reference)
+    np.testing.assert_array_equal(featurestore.read_rows(store), featurestore.read_rows(reference))
+
+def test_resume_over_orphaned_files(tmp_path):
+    # a crash after a chunk (or its temporary file) was written, but before the
+    # manifest was updated, leaves files that the manifest does not list
+    series = make_series()
+    path = str(tmp_path / 'store')
+    featurestore.compute_store(path, series[:2], labels=LABELS, chunkSize=2)
+    np.save(os.path.join(path, 'chunk_000001.npy'), np.zeros((2, 3)))
+    with open(os.path.join(path, 'chunk_000002.npy.tmp'), 'wb') as f:
+        f.write(b'partial')
+    with open(os.path.join(path, 'manifest.json.tmp'), 'w') as f:
+        f.write('{"chunks": [')
+
+    store = featurestore.compute_store(path, series, labels=LABELS, chunkSize=2)
+    reference = featurestore.compute_store(str(tmp_path / 'reference'), series, labels=LABELS, chunkSize=2)
+    assert featurestore.row_ids(store) == featurestore.row_ids(reference)
+    np.testing.assert_array_equal(featurestore.read_rows(store), featurestore.read_rows(reference))
+    np.testing.assert_array_equal(featurestore.read_rows(featurestore.open_store(path)),
+                                  featurestore.read_rows(reference))
+
+def test_writes_are_atomic(tmp_path, monkeypatch):
+    store = featurestore.create_store(str(tmp_path / 'store'), labels=LABELS)
+    width = len(store['featureNames'])
+    featurestore.append_rows(store, np.ones((2, width)), ['a', 'b'])
+
+    # a failure while renaming the chunk into place leaves the store as it was
+    replace = os.replace
+    def failing_replace(src, dst):
+        if dst.endswith('.npy'):
+            raise OSError('interrupted')
+        replace(src, dst)
+    monkeypatch.setattr(os, 'replace', failing_replace)
+    with pytest.raises(OSError):
+        featurestore.append_rows(store, np.zeros((2, width)), ['c', 'd'])
+    monkeypatch.setattr(os, 'replace', replace)
+    reopened = featurestore.open_store(store['path'])
+    assert featurestore.row_ids(reopened) == ['a', 'b']
+    np.testing.assert_array_equal(featurestore.read_rows(reopened), np.ones((2, width)))
+
+    # and so does a failure while renaming the manifest into place
+    def failing_manifest(src, dst):
+        if dst.endswith('manifest.json'):
+            raise OSError('interrupted')
+        replace(src, dst)
+    monkeypatch.setattr(os, 'replace', failing_manifest)
+    with pytest.raises(OSError):
+        featurestore.append_rows(featurestore.open_store(store['path']), np.zeros((2, width)), ['c', 'd'])
+    monkeypatch.setattr(os, 'replace', replace)
+    reopened = featurestore.open_store(store['path'])
+    assert featurestore.row_ids(reopened) == ['a', 'b']
+    np.testing.assert_array_equal(featurestore.read_rows(reopened), np.ones((2, width)))
+
+def test_mismatched_ids(tmp_path):
+    series = make_series()
+    path = str(tmp_path / 'store')
+    featurestore.compute_store(path, series[:4], labels=LABELS, chunkSize=2)
+    renamed = [('other', series[0][1])] + series[1:]
+    with pytest.raises(ValueError, match='has id'):
+        featurestore.compute_store(path, renamed, labels=LABELS, chunkSize=2)
+
+def test_mismatched_schema(tmp_path):
+    series = make_series()
+    path = str(tmp_path / 'store')
+    featurestore.compute_store(path, series[:2], labels=LABELS, chunkSize=2)
+    with pytest.raises(ValueError, match='different schema'):
+        featurestore.compute_store(path, series, labels=LABELS[:2], chunkSize=2)
+
+def test_create_store_exists(tmp_path):
+    path = str(tmp_path / 'store')
+    featurestore.create_store(path, labels=LABELS)
+    with pytest.raises(FileExistsError):
+        featurestore.create_store(path, labels=LABELS)
+    store = featurestore.create_store(path, labels=LABELS[:1], overwrite=True)
+    assert store['labels'] == LABELS[:1]
+    assert featurestore.num_rows(store) == 0
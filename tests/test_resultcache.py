@@ -0,0 +1,107 @@
+import itertools
+import pickle
+import numpy as np
+import pytest
+from Utils import resultcache
+
+@pytest.fixture
+def clock(monkeypatch):
+    """
+    A clock that advances by a second on every reading, so that access times are
+    strictly ordered.
+    """
+    ticks = itertools.count(1)
+    monkeypatch.setattr(resultcache.time, 'time', lambda: float(next(ticks)))
+
+def entry_size(output):
+    return len(pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL))
+
+def open_cache(tmp_path, numEntries):
+    # room for numEntries outputs of np.zeros(100)
+    return resultcache.open_cache(str(tmp_path / 'cache.sqlite'), maxBytes=numEntries*entry_size(np.zeros(100)),
+                                  version='test')
+
+def keys(cache):
+    return {row[0] for row in cache['connection'].execute('SELECT key FROM results')}
+
+def test_put_get(tmp_path):
+    cache = open_cache(tmp_path, 10)
+    assert resultcache.get(cache, 'a') == (False, None)
+    resultcache.put(cache, 'a', 'DN_Mean', {'x': np.arange(3.0)})
+    found, output = resultcache.get(cache, 'a')
+    assert found
+    np.testing.assert_array_equal(output['x'], np.arange(3.0))
+    stats = resultcache.cache_stats(cache)
+    assert (stats['entries'], stats['hits'], stats['misses']) == (1, 1, 1)
+    assert stats['bytes'] == entry_size({'x': np.arange(3.0)})
+
+def test_replacing_an_entry_keeps_the_total(tmp_path):
+    cache = open_cache(tmp_path, 10)
+    resultcache.put(cache, 'a', 'DN_Mean', np.zeros(100))
+    resultcache.put(cache, 'a', 'DN_Mean', np.zeros(10))
+    assert resultcache.cache_stats(cache)['bytes'] == entry_size(np.zeros(10))
+
+def test_evicts_least_recently_used(tmp_path, clock):
+    cache = open_cache(tmp_path, 3)
+    for key in 'abc':
+        resultcache.put(cache, key, 'DN_Mean', np.zeros(100))
+    # a is used again, so b is now the least recently used
+    assert resultcache.get(cache, 'a')[0]
+    resultcache.put(cache, 'd', 'DN_Mean', np.zeros(100))
+    assert keys(cache) == {'a', 'c', 'd'}
+    resultcache.put(cache, 'e', 'DN_Mean', np.zeros(100))
+    assert keys(cache) == {'a', 'd', 'e'}
+    assert resultcache.cache_stats(cache)['bytes'] <= cache['maxBytes']
+
+def test_evict(tmp_path, clock):
+    cache = open_cache(tmp_path, 1000)
+    for key in 'abcde':
+        resultcache.put(cache, key, 'DN_Mean', np.zeros(100))
+    size = entry_size(np.zeros(100))
+    connection = cache['connection']
+    with connection:
+        resultcache._evict(connection, 2*size + 1)
+    assert keys(cache) == {'d', 'e'}
+    assert resultcache.cache_stats(cache)['bytes'] == 2*size
+    # within the cap, nothing is evicted
+    with connection:
+        resultcache._evict(connection, 2*size)
+    assert keys(cache) == {'d', 'e'}
+    with connection:
+        resultcache._evict(connection, 0)
+    assert keys(cache) == set()
+    assert resultcache.cache_stats(cache)['bytes'] == 0
+
+def test_evict_over_many_batches(tmp_path, clock):
+    # more entries than _evict removes per query
+    cache = open_cache(tmp_path, 1000)
+    for i in range(250):
+        resultcache.put(cache, f'{i:03d}', 'DN_Mean', np.zeros(100))
+    connection = cache['connection']
+    with connection:
+        resultcache._evict(connection, 10*entry_size(np.zeros(100)))
+    assert keys(cache) == {f'{i:03d}' for i in range(240, 250)}
+
+def test_entries_persist(tmp_path):
+    cache = open_cache(tmp_path, 10)
+    resultcache.put(cache, 'a', 'DN_Mean', 1.5)
+    resultcache.close_cache(cache)
+    cache = open_cache(tmp_path, 10)
+    assert resultcache.get(cache, 'a') == (True, 1.5)
+    assert resultcache.cache_stats(cache)['bytes'] == entry_size(1.5)
+
+def test_call_key(tmp_path):
+    from Operations.DN_Mean import DN_Mean
+    cache = open_cache(tmp_path, 10)
+    y = np.arange(10.0)
+    key = resultcache.call_key(DN_Mean, (y,), {}, cache)
+    # equivalent calls share a key
+    assert resultcache.call_key(DN_Mean, (y.copy(),), {'mean_type': 'arithmetic'}, cache) == key
+    assert resultcache.call_key(DN_Mean, (), {'y': y, 'mean_type': 'arithmetic'}, cache) == key
+    assert resultcache.call_key(DN_Mean, (y, 'median'), {}, cache) != key
+    assert resultcache.call_key(DN_Mean, (y + 1,), {}, cache) != key
+    # but not the same calls with another library version
+    other = dict(cache, version='other')
+    assert resultcache.call_key(DN_Mean, (y,), {}, other) != key
+    # calls that do not match the signature are not cached
+    assert resultcache.call_key(DN_Mean, (y,), {'meanType': 'median'}, cache) is None